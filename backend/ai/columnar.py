@@ -0,0 +1,306 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.utils import timezone
+import numpy as np
+from expenses.fx import get_rate_cache
+from expenses.models import Expense
+from expenses.versioning import data_version
+from .insights import InsightsGenerator
+
+CATEGORIES = [choice[0] for choice in Expense.CATEGORY_CHOICES]
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def day_number(day):
+    return day.toordinal() - EPOCH
+
+
+def to_minor_units(amount):
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def from_minor_units(value):
+    return Decimal(int(value)).scaleb(-2)
+
+
+def _reporting_minor_units(snapshot):
+    return to_minor_units(get_rate_cache().convert(snapshot.amount, snapshot.currency, snapshot.date))
+
+
+class UserColumns:
+    """
+    One user's expenses as parallel arrays: id (int64), day (int32 days
+    since 1970-01-01), amount (int64 pesewas, converted to the reporting
+    currency) and category (uint8 code).
+
+    Arrays grow by doubling so appends are amortized O(1); ids stay sorted
+    while expenses are appended in creation order.
+    """
+
+    def __init__(self, ids, days, amounts, categories):
+        self.owner_joined = None
+        # The owner's UserDataVersion these arrays reflect
+        self.version = None
+        self.size = len(ids)
+        capacity = max(self.size, 16)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._days = np.zeros(capacity, dtype=np.int32)
+        self._amounts = np.zeros(capacity, dtype=np.int64)
+        self._categories = np.zeros(capacity, dtype=np.uint8)
+        order = np.argsort(ids, kind='stable')
+        self._ids[:self.size] = np.asarray(ids, dtype=np.int64)[order]
+        self._days[:self.size] = np.asarray(days, dtype=np.int32)[order]
+        self._amounts[:self.size] = np.asarray(amounts, dtype=np.int64)[order]
+        self._categories[:self.size] = np.asarray(categories, dtype=np.uint8)[order]
+
+    @classmethod
+    def load(cls, user_id):
+        rows = Expense.objects.filter(user_id=user_id).order_by().values_list(
+            'id', 'date', 'amount', 'category', 'currency'
+        )
+        ids, days, amounts, categories, currencies = [], [], [], [], []
+        for expense_id, day, amount, category, currency in rows.iterator(chunk_size=5000):
+            ids.append(expense_id)
+            days.append(day.toordinal() - EPOCH)
+            amounts.append(to_minor_units(amount))
+            categories.append(CATEGORY_CODES[category])
+            currencies.append(currency)
+        # One searchsorted per foreign currency rather than a rate lookup per row
+        amounts = get_rate_cache().convert_minor(amounts, currencies, np.asarray(days, dtype=np.int64) + EPOCH)
+        return cls(ids, days, amounts, categories)
+
+    @property
+    def ids(self):
+        return self._ids[:self.size]
+
+    @property
+    def days(self):
+        return self._days[:self.size]
+
+    @property
+    def amounts(self):
+        return self._amounts[:self.size]
+
+    @property
+    def categories(self):
+        return self._categories[:self.size]
+
+    def _index(self, expense_id):
+        index = int(np.searchsorted(self.ids, expense_id))
+        if index < self.size and self._ids[index] == expense_id:
+            return index
+        return None
+
+    def append(self, snapshot):
+        """Add a new expense; returns False if it cannot keep ids sorted"""
+        if self.size and snapshot.id <= self._ids[self.size - 1]:
+            return False
+        if self.size == len(self._ids):
+            for name in ('_ids', '_days', '_amounts', '_categories'):
+                array = getattr(self, name)
+                grown = np.zeros(len(array) * 2, dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+                setattr(self, name, grown)
+        self._ids[self.size] = snapshot.id
+        self._days[self.size] = day_number(snapshot.date)
+        self._amounts[self.size] = _reporting_minor_units(snapshot)
+        self._categories[self.size] = CATEGORY_CODES[snapshot.category]
+        self.size += 1
+        return True
+
+    def update(self, snapshot):
+        index = self._index(snapshot.id)
+        if index is None:
+            return False
+        self._days[index] = day_number(snapshot.date)
+        self._amounts[index] = _reporting_minor_units(snapshot)
+        self._categories[index] = CATEGORY_CODES[snapshot.category]
+        return True
+
+    def remove(self, expense_id):
+        index = self._index(expense_id)
+        if index is None:
+            return False
+        for name in ('_ids', '_days', '_amounts', '_categories'):
+            array = getattr(self, name)
+            array[index:self.size - 1] = array[index + 1:self.size]
+        self.size -= 1
+        return True
+
+
+class ColumnarCache:
+    """Per-user UserColumns, evicted least-recently-used past max_rows in total
+
+    Each user's arrays carry the UserDataVersion they were loaded at, and
+    get() compares it with one primary-key query, so writes from other
+    workers, jobs, queryset updates and new FX rates cause a reload.
+    Writes made in this process arrive through expense_changed and are
+    applied in place when they account for the whole version step.
+    """
+
+    def __init__(self, max_rows: int = 2_000_000):
+        self.max_rows = max_rows
+        self._users = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def get(self, user) -> UserColumns:
+        user_id = user.pk
+        version = data_version(user_id)
+        with self._lock:
+            columns = self._users.get(user_id)
+            # A recreated account can reuse a primary key; date_joined tells them apart
+            if columns is not None and columns.owner_joined == user.date_joined and columns.version == version:
+                self._users.move_to_end(user_id)
+                return columns
+
+        # Versioned before reading rows: a write in between only causes another reload
+        columns = UserColumns.load(user_id)
+        columns.owner_joined = user.date_joined
+        columns.version = version
+        with self._lock:
+            previous = self._users.pop(user_id, None)
+            if previous is not None:
+                self._rows -= previous.size
+            self._users[user_id] = columns
+            self._rows += columns.size
+            # The user just loaded is kept even if alone over the limit
+            while self._rows > self.max_rows and len(self._users) > 1:
+                _, evicted = self._users.popitem(last=False)
+                self._rows -= evicted.size
+        return columns
+
+    def apply(self, user_id, old, new):
+        """
+        Mirror an expense write made in this process (after its data version
+        bump) into a loaded user; unknown changes drop the user.
+        """
+        with self._lock:
+            if user_id not in self._users:
+                return
+        version = data_version(user_id)
+        with self._lock:
+            columns = self._users.get(user_id)
+            if columns is None:
+                return
+            before = columns.size
+            if columns.version is None or version != columns.version + 1:
+                # Other writes happened too; the next get() reloads
+                applied = False
+            elif old is None and new is not None:
+                applied = columns.append(new)
+            elif new is None:
+                applied = columns.remove(old.id)
+            else:
+                applied = columns.update(new)
+            self._rows += columns.size - before
+            if applied:
+                columns.version = version
+            else:
+                self._users.pop(user_id)
+                self._rows -= columns.size
+
+    def invalidate(self, user_id):
+        with self._lock:
+            columns = self._users.pop(user_id, None)
+            if columns is not None:
+                self._rows -= columns.size
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._rows = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_columnar_cache() -> ColumnarCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ColumnarCache(max_rows=settings.AI_COLUMNAR_MAX_ROWS)
+    return _cache
+
+
+class ColumnarInsightsGenerator(InsightsGenerator):
+    """InsightsGenerator computed with NumPy over the cached columnar snapshot"""
+
+    def __init__(self, user, columns=None):
+        super().__init__(user)
+        self.columns = columns if columns is not None else get_columnar_cache().get(user)
+
+    def _breakdown(self, mask):
+        categories = self.columns.categories[mask]
+        totals = np.bincount(categories, weights=self.columns.amounts[mask], minlength=len(CATEGORIES))
+        counts = np.bincount(categories, minlength=len(CATEGORIES))
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(-totals[present], kind='stable')]
+        return [
+            {'category': CATEGORIES[code], 'total': from_minor_units(round(totals[code])), 'count': int(counts[code])}
+            for code in present
+        ]
+
+    def get_monthly_summary(self, year=None, month=None):
+        if not year or not month:
+            now = timezone.now()
+            year, month = now.year, now.month
+
+        start = date(year, month, 1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        days = self.columns.days
+        mask = (days >= day_number(start)) & (days < day_number(end))
+        count = int(np.count_nonzero(mask))
+        total = int(self.columns.amounts[mask].sum())
+
+        return {
+            'total_amount': from_minor_units(total) if count else 0,
+            'total_expenses': count,
+            'average_expense': from_minor_units(total) / count if count else 0,
+            'by_category': self._breakdown(mask),
+        }
+
+    def get_top_categories(self, days=30):
+        start_date = timezone.now().date() - timedelta(days=days)
+        return self._breakdown(self.columns.days >= day_number(start_date))[:5]
+
+    def detect_anomalies(self, days=30):
+        start_date = timezone.now().date() - timedelta(days=days)
+        mask = self.columns.days >= day_number(start_date)
+        if np.count_nonzero(mask) < 3:
+            return []
+
+        amounts = self.columns.amounts[mask] / 100.0
+        mean_amount = float(amounts.mean())
+        std_amount = float(amounts.std())
+        threshold = mean_amount + (1.5 * std_amount) if std_amount > 0 else mean_amount * 2
+
+        ids = self.columns.ids[mask][amounts > threshold]
+        if not ids.size:
+            return []
+        # Only the flagged rows need their description
+        return list(Expense.objects.filter(user=self.user, id__in=ids.tolist()).values('id', 'description', 'amount', 'currency', 'date'))
+
+    def get_spending_trends(self, weeks=4):
+        today = timezone.now().date()
+        days = self.columns.days
+        amounts = self.columns.amounts
+        trends = []
+        for i in range(weeks):
+            start_date = today - timedelta(weeks=i+1)
+            end_date = today - timedelta(weeks=i)
+            mask = (days >= day_number(start_date)) & (days < day_number(end_date))
+            trends.append({
+                'week': f"Week {i+1}",
+                'total': int(amounts[mask].sum()) / 100.0,
+                'start_date': start_date,
+                'end_date': end_date
+            })
+        return trends
\ No newline at end of file
@@ -0,0 +1,160 @@
+import calendar
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+import numpy as np
+from expenses.fx import reporting_amount
+from expenses.models import Expense
+from expenses.versioning import data_version
+
+CATEGORIES = [choice[0] for choice in Expense.CATEGORY_CHOICES]
+CATEGORY_INDEX = {category: index for index, category in enumerate(CATEGORIES)}
+
+# Share of the projected daily rate taken from the same calendar month in earlier years
+SEASONAL_WEIGHT = 0.5
+
+
+def forecast_cache_key(user_id, today, version):
+    # Any write to the user's expenses, in any process, bumps their data
+    # version, so a changed key replaces deleting entries on change
+    return f'ai:forecast:{user_id}:{today.isoformat()}:{version}'
+
+
+def load_daily_series(user, today):
+    """
+    (first_day, matrix) where matrix[c, d] is the spend in category c on
+    first_day + d, up to and including today. One grouped query.
+    """
+    rows = list(
+        Expense.objects.filter(user=user, date__lte=today).order_by()
+        .values_list('date', 'category').annotate(total=Sum(reporting_amount()))
+    )
+    if not rows:
+        return None, np.zeros((len(CATEGORIES), 0))
+
+    first_day = min(row[0] for row in rows)
+    days = np.fromiter(((row[0] - first_day).days for row in rows), dtype=np.int64, count=len(rows))
+    categories = np.fromiter((CATEGORY_INDEX[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+    totals = np.fromiter((float(row[2]) for row in rows), dtype=np.float64, count=len(rows))
+
+    matrix = np.zeros((len(CATEGORIES), (today - first_day).days + 1))
+    np.add.at(matrix, (categories, days), totals)
+    return first_day, matrix
+
+
+def exponential_smoothing(matrix, alpha):
+    """
+    Simple exponential smoothing level of every row at the last column.
+
+    Uses the closed form (weights alpha * (1 - alpha)^k, the first
+    observation taking the remaining mass) so all categories are smoothed
+    with one matrix-vector product instead of a loop over days.
+    """
+    length = matrix.shape[1]
+    if length == 0:
+        return np.zeros(matrix.shape[0])
+    weights = alpha * (1 - alpha) ** np.arange(length - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (length - 1)
+    return matrix @ weights
+
+
+def month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def seasonal_daily_rates(first_day, matrix, today):
+    """
+    Average daily spend per category for each calendar month, from complete
+    months before the current one. Returns (rates, available) with shape
+    (categories, 12) and (12,).
+    """
+    first_month = month_index(first_day)
+    # Column offset where each month begins; the first month starts at column 0
+    starts = [0]
+    for year_month in range(first_month + 1, month_index(today) + 1):
+        year, month = divmod(year_month, 12)
+        starts.append((date(year, month + 1, 1) - first_day).days)
+    monthly = np.add.reduceat(matrix, starts, axis=1)
+
+    # The first month may be partial and the current one is still running
+    complete = np.arange(first_month, month_index(today))
+    if first_day.day != 1:
+        complete = complete[1:]
+
+    rates = np.zeros((matrix.shape[0], 12))
+    available = np.zeros(12, dtype=bool)
+    if complete.size:
+        years, months = np.divmod(complete, 12)
+        lengths = np.array([calendar.monthrange(int(y), int(m) + 1)[1] for y, m in zip(years, months)])
+        daily = monthly[:, complete - first_month] / lengths
+        counts = np.bincount(months, minlength=12)
+        rates = daily @ np.eye(12)[months]
+        available = counts > 0
+        rates[:, available] /= counts[available]
+    return rates, available
+
+
+def build_forecast(user, today=None):
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    next_month_start = month_start + timedelta(days=days_in_month)
+    days_in_next_month = calendar.monthrange(next_month_start.year, next_month_start.month)[1]
+
+    first_day, matrix = load_daily_series(user, today)
+    if first_day is None:
+        spent = level = np.zeros(len(CATEGORIES))
+        this_rate = next_rate = level
+    else:
+        level = exponential_smoothing(matrix, settings.AI_FORECAST_SMOOTHING)
+        rates, available = seasonal_daily_rates(first_day, matrix, today)
+
+        def blend(calendar_month):
+            if not available[calendar_month]:
+                return level
+            return (1 - SEASONAL_WEIGHT) * level + SEASONAL_WEIGHT * rates[:, calendar_month]
+
+        this_rate = blend(today.month - 1)
+        next_rate = blend(next_month_start.month - 1)
+        spent = matrix[:, max((month_start - first_day).days, 0):].sum(axis=1)
+
+    month_end = spent + this_rate * (days_in_month - today.day)
+    next_month = next_rate * days_in_next_month
+
+    by_category = [
+        {
+            'category': CATEGORIES[index],
+            'spent_to_date': round(float(spent[index]), 2),
+            'projected_month_end': round(float(month_end[index]), 2),
+            'projected_next_month': round(float(next_month[index]), 2),
+        }
+        for index in np.argsort(-month_end, kind='stable')
+        if month_end[index] > 0 or next_month[index] > 0
+    ]
+
+    return {
+        'as_of': today.isoformat(),
+        'month': month_start.strftime('%Y-%m'),
+        'next_month': next_month_start.strftime('%Y-%m'),
+        'history_days': int(matrix.shape[1]),
+        'method': 'exponential_smoothing+seasonal',
+        'total': {
+            'spent_to_date': round(float(spent.sum()), 2),
+            'projected_month_end': round(float(month_end.sum()), 2),
+            'projected_next_month': round(float(next_month.sum()), 2),
+        },
+        'by_category': by_category,
+    }
+
+
+def get_forecast(user, today=None):
+    """Cached forecast, keyed by the user's data version so it is rebuilt after any expense change"""
+    today = today or timezone.localdate()
+    key = forecast_cache_key(user.pk, today, data_version(user.pk))
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = build_forecast(user, today)
+        cache.set(key, forecast, settings.AI_FORECAST_CACHE_TIMEOUT)
+    return forecast
\ No newline at end of file
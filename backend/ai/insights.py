@@ -1,6 +1,9 @@
-from django.db.models import Sum, Count, Avg
+from django.db.models import Sum, Count, F, Q, Case, When, Value, Window, FloatField, IntegerField, ExpressionWrapper
+from django.db.models.functions import Cast, Coalesce, ExtractMonth, ExtractYear, Lag, Mod
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from expenses.fx import reporting_amount
 from expenses.models import Expense
 
 try:
@@ -10,6 +13,42 @@ except ImportError:
     NUMPY_AVAILABLE = False
     print("NumPy not available, using basic statistics")
 
+# Amounts may be stored in minor units; expressions over them convert back through the field.
+# Totals are reported in the reporting currency, converted inside the aggregates.
+AMOUNT_FIELD = Expense._meta.get_field('amount')
+
+
+class OverWindow(ExpressionWrapper):
+    """
+    Wraps an expression built on window annotations of a grouped query.
+
+    Django 4.2 would otherwise add the referenced windows to GROUP BY,
+    which databases reject; the value is computed per group anyway.
+    """
+    contains_aggregate = False
+
+    def get_group_by_cols(self):
+        return []
+
+
+def _percent_change(current, previous):
+    """(current - previous) / previous as a percentage, NULL when there is no base"""
+    return Case(
+        When(**{f'{previous}__gt': 0}, then=Cast(F(current) - F(previous), FloatField()) * 100.0 / Cast(previous, FloatField())),
+        default=None,
+        output_field=FloatField(),
+    )
+
+
+def _month_label(bucket):
+    year, month = divmod(bucket, 12)
+    return f'{year:04d}-{month + 1:02d}'
+
+
+def _round_percent(value):
+    return None if value is None else round(value, 1)
+
+
 class InsightsGenerator:
     def __init__(self, user):
         self.user = user
@@ -25,12 +64,15 @@ class InsightsGenerator:
             date__month=month
         )
 
+        # AVG over minor units is not a whole amount, so derive it from the sum
+        totals = expenses.aggregate(total=Sum(reporting_amount()), count=Count('id'))
+
         return {
-            'total_amount': expenses.aggregate(Sum('amount'))['amount__sum'] or 0,
-            'total_expenses': expenses.count(),
-            'average_expense': expenses.aggregate(Avg('amount'))['amount__avg'] or 0,
+            'total_amount': totals['total'] or 0,
+            'total_expenses': totals['count'],
+            'average_expense': totals['total'] / totals['count'] if totals['count'] else 0,
             'by_category': list(expenses.values('category').annotate(
-                total=Sum('amount'),
+                total=Sum(reporting_amount()),
                 count=Count('id')
             ).order_by('-total'))
         }
@@ -43,7 +85,7 @@ class InsightsGenerator:
         )
 
         return list(expenses.values('category').annotate(
-            total=Sum('amount'),
+            total=Sum(reporting_amount()),
             count=Count('id')
         ).order_by('-total')[:5])
 
@@ -52,7 +94,7 @@ class InsightsGenerator:
         expenses = Expense.objects.filter(
             user=self.user,
             date__gte=start_date
-        ).values_list('amount', flat=True)
+        ).annotate(reporting=reporting_amount()).values_list('reporting', flat=True)
 
         if len(expenses) < 3:
             return []
@@ -73,12 +115,144 @@ class InsightsGenerator:
 
         anomalous_expenses = Expense.objects.filter(
             user=self.user,
-            date__gte=start_date,
-            amount__gt=threshold
-        ).values('id', 'description', 'amount', 'date')
+            date__gte=start_date
+        ).annotate(reporting=reporting_amount()).filter(
+            reporting__gt=threshold
+        ).values('id', 'description', 'amount', 'currency', 'date')
 
         return list(anomalous_expenses)
 
+    def compare_months(self, mode='mom', months=12, end=None):
+        """
+        Month-over-month (mode 'mom') or year-over-year ('yoy') comparison
+        for the `months` months ending with the month of `end`, by category.
+
+        One grouped query over year * 12 + month buckets; LAG over each
+        category's buckets fetches the previous total and a CASE on the
+        lagged bucket treats gaps as zero. Changes are computed in SQL.
+        """
+        offset = 1 if mode == 'mom' else 12
+        end = end or timezone.now().date()
+        last = end.year * 12 + end.month - 1
+        first = last - months + 1
+        year, month = divmod(first - offset, 12)
+        fetch_from = date(year, month + 1, 1)
+        year, month = divmod(last + 1, 12)
+        fetch_to = date(year, month + 1, 1)
+
+        bucket = ExpressionWrapper(ExtractYear('date') * 12 + ExtractMonth('date') - 1, output_field=IntegerField())
+        # Year over year orders each category by month of year first, so the
+        # lagged row is the same month a year earlier when that month exists
+        ordering = [F('bucket').asc()]
+        if offset == 12:
+            ordering.insert(0, Mod(F('bucket'), Value(12), output_field=IntegerField()).asc())
+        partition = [F('category')]
+        rows = (
+            Expense.objects.filter(user=self.user, date__gte=fetch_from, date__lt=fetch_to)
+            .order_by()
+            .annotate(bucket=bucket)
+            .values('category', 'bucket')
+            .annotate(total=Sum(reporting_amount()))
+            .annotate(
+                lagged_total=Window(Lag('total'), partition_by=partition, order_by=ordering),
+                lagged_bucket=Window(Lag('bucket'), partition_by=partition, order_by=ordering),
+            )
+            .annotate(previous_total=OverWindow(
+                Case(
+                    When(lagged_bucket=F('bucket') - offset, then=F('lagged_total')),
+                    default=Value(Decimal('0'), output_field=AMOUNT_FIELD),
+                    output_field=AMOUNT_FIELD,
+                ),
+                output_field=AMOUNT_FIELD,
+            ))
+            .annotate(
+                change=OverWindow(F('total') - F('previous_total'), output_field=AMOUNT_FIELD),
+                percent_change=OverWindow(_percent_change('total', 'previous_total'), output_field=FloatField()),
+            )
+        )
+
+        by_bucket = {}
+        for row in rows:
+            by_bucket.setdefault(row['bucket'], {})[row['category']] = row
+
+        periods = []
+        for current in range(first, last + 1):
+            categories = [
+                {
+                    'category': row['category'],
+                    'total': row['total'],
+                    'previous_total': row['previous_total'],
+                    'change': row['change'],
+                    'percent_change': _round_percent(row['percent_change']),
+                }
+                for row in by_bucket.get(current, {}).values()
+            ]
+            # Categories with spending only in the previous period have no row of their own
+            for category, row in by_bucket.get(current - offset, {}).items():
+                if category not in by_bucket.get(current, {}):
+                    categories.append({
+                        'category': category,
+                        'total': Decimal('0'),
+                        'previous_total': row['total'],
+                        'change': -row['total'],
+                        'percent_change': -100.0 if row['total'] > 0 else None,
+                    })
+            categories.sort(key=lambda item: (-item['total'], item['category']))
+
+            total = sum((item['total'] for item in categories), Decimal('0'))
+            previous_total = sum((item['previous_total'] for item in categories), Decimal('0'))
+            periods.append({
+                'period': _month_label(current),
+                'previous_period': _month_label(current - offset),
+                'total': total,
+                'previous_total': previous_total,
+                'change': total - previous_total,
+                'percent_change': round(float((total - previous_total) * 100 / previous_total), 1) if previous_total else None,
+                'by_category': categories,
+            })
+
+        return {'mode': mode, 'periods': periods}
+
+    def compare_range(self, start, end):
+        """
+        Compare start..end (inclusive) with the equally long period just
+        before it, by category, using one query with filtered aggregates.
+        """
+        length = (end - start).days + 1
+        previous_start = start - timedelta(days=length)
+        zero = Value(Decimal('0'), output_field=AMOUNT_FIELD)
+        rows = list(
+            Expense.objects.filter(user=self.user, date__gte=previous_start, date__lte=end)
+            .order_by()
+            .values('category')
+            .annotate(
+                total=Coalesce(Sum(reporting_amount(), filter=Q(date__gte=start)), zero, output_field=AMOUNT_FIELD),
+                previous_total=Coalesce(Sum(reporting_amount(), filter=Q(date__lt=start)), zero, output_field=AMOUNT_FIELD),
+            )
+            .annotate(
+                change=ExpressionWrapper(F('total') - F('previous_total'), output_field=AMOUNT_FIELD),
+                percent_change=_percent_change('total', 'previous_total'),
+            )
+            .order_by('-total', 'category')
+        )
+        for row in rows:
+            row['percent_change'] = _round_percent(row['percent_change'])
+
+        total = sum((row['total'] for row in rows), Decimal('0'))
+        previous_total = sum((row['previous_total'] for row in rows), Decimal('0'))
+        return {
+            'mode': 'custom',
+            'periods': [{
+                'period': f'{start.isoformat()}/{end.isoformat()}',
+                'previous_period': f'{previous_start.isoformat()}/{(start - timedelta(days=1)).isoformat()}',
+                'total': total,
+                'previous_total': previous_total,
+                'change': total - previous_total,
+                'percent_change': round(float((total - previous_total) * 100 / previous_total), 1) if previous_total else None,
+                'by_category': rows,
+            }],
+        }
+
     def get_spending_trends(self, weeks=4):
         trends = []
         for i in range(weeks):
@@ -89,7 +263,7 @@ class InsightsGenerator:
                 user=self.user,
                 date__gte=start_date,
                 date__lt=end_date
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
+            ).aggregate(total=Sum(reporting_amount()))['total'] or 0
             
             trends.append({
                 'week': f"Week {i+1}",
@@ -98,4 +272,13 @@ class InsightsGenerator:
                 'end_date': end_date
             })
         
-        return trends
\ No newline at end of file
+        return trends
+
+
+def get_insights_generator(user):
+    """InsightsGenerator for the configured backend ('columnar' or 'orm')"""
+    from django.conf import settings
+    if NUMPY_AVAILABLE and getattr(settings, 'AI_INSIGHTS_BACKEND', 'orm') == 'columnar':
+        from .columnar import ColumnarInsightsGenerator
+        return ColumnarInsightsGenerator(user)
+    return InsightsGenerator(user)
\ No newline at end of file
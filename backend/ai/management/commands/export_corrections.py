@@ -0,0 +1,34 @@
+import csv
+from django.core.management.base import BaseCommand
+from ai.services.category_overrides import iter_training_corrections
+
+
+class Command(BaseCommand):
+    help = (
+        "Export user category corrections as description,category CSV rows "
+        "(the format of ml_pipeline/data/ghana_expenses.csv) for retraining."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-',
+                            help="CSV file to write, '-' for stdout")
+        parser.add_argument('--since-id', type=int, default=0,
+                            help='Only export corrections with a larger id (incremental export)')
+
+    def handle(self, **options):
+        output = options['output']
+        stream = self.stdout if output == '-' else open(output, 'w', newline='')
+        last_id = options['since_id']
+        count = 0
+        try:
+            writer = csv.writer(stream)
+            writer.writerow(['description', 'category'])
+            for correction_id, description, category in iter_training_corrections(options['since_id']):
+                writer.writerow([description, category])
+                last_id = max(last_id, correction_id)
+                count += 1
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+
+        self.stderr.write(f"Exported {count} corrections; next --since-id {last_id}")
@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Mod
+from expenses.models import CategoryCorrection
+from ai.services.online_learning import (
+    OnlineLearner, ModelRegistry, RegistryLocked, HOLDOUT_MODULUS, try_update,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Incrementally train the online categorizer on new category corrections. "
+        "Corrections are consumed in micro-batches with partial_fit; each batch is "
+        "published as a new model version only if held-out accuracy does not drop; "
+        "refused batches are retried on later runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-dir', default=str(settings.AI_ONLINE_MODEL_DIR),
+                            help='Directory of the versioned online model')
+        parser.add_argument('--seed-data', default=str(settings.AI_ONLINE_SEED_DATA),
+                            help='CSV (description,category) used to bootstrap the first version')
+        parser.add_argument('--batch-size', type=int, default=256,
+                            help='Corrections per partial_fit micro-batch')
+        parser.add_argument('--tolerance', type=float, default=0.0,
+                            help='Allowed drop in held-out accuracy before an update is refused')
+        parser.add_argument('--keep-versions', type=int, default=settings.AI_ONLINE_KEEP_VERSIONS,
+                            help='Published model files kept on disk')
+
+    def handle(self, **options):
+        registry = ModelRegistry(options['model_dir'], keep_versions=options['keep_versions'])
+        try:
+            # One run at a time: progress.json and the version numbers are read-modify-write
+            with registry.lock(blocking=False):
+                self._learn(registry, options)
+        except RegistryLocked:
+            raise CommandError(f"Another learn_from_corrections run is using {options['model_dir']}")
+
+    def _learn(self, registry, options):
+        progress_path = os.path.join(options['model_dir'], 'progress.json')
+        seed_train, seed_holdout = self._read_seed(options['seed_data'])
+        holdout = self._holdout(seed_holdout)
+
+        meta, learner = registry.load_current()
+        if learner is None:
+            learner = OnlineLearner()
+            for start in range(0, len(seed_train[0]), options['batch_size']):
+                end = start + options['batch_size']
+                learner.partial_fit(seed_train[0][start:end], seed_train[1][start:end])
+            accuracy = learner.accuracy(*holdout)
+            meta = registry.publish(learner, accuracy=accuracy)
+            self.stdout.write(f"Bootstrapped online model v{meta['version']} (held-out accuracy {accuracy:.4f})")
+
+        last_id, retry = self._read_progress(progress_path)
+        training = CategoryCorrection.objects.alias(bucket=Mod('id', HOLDOUT_MODULUS)).exclude(
+            bucket=0
+        ).order_by('id').values_list('id', 'expense__description', 'corrected_category')
+
+        published = 0
+        refused = []
+
+        def consume(batch):
+            nonlocal learner, published
+            learner, accepted = self._apply(registry, learner, batch, holdout, options['tolerance'])
+            if accepted:
+                published += 1
+            else:
+                # Kept for the next run, when the held-out set may have grown
+                refused.append([batch[0][0], batch[-1][0]])
+
+        # Batches refused by earlier runs are retried before new corrections
+        for index, (first_id, end_id) in enumerate(retry):
+            batch = list(training.filter(id__gte=first_id, id__lte=end_id))
+            if batch:
+                consume(batch)
+            self._write_progress(progress_path, last_id, refused + retry[index + 1:])
+
+        batch = []
+        for row in training.filter(id__gt=last_id).iterator(chunk_size=options['batch_size']):
+            batch.append(row)
+            if len(batch) >= options['batch_size']:
+                consume(batch)
+                last_id = batch[-1][0]
+                self._write_progress(progress_path, last_id, refused)
+                batch = []
+        if batch:
+            consume(batch)
+            last_id = batch[-1][0]
+            self._write_progress(progress_path, last_id, refused)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Online learning done: {published} version(s) published, {len(refused)} batch(es) refused "
+            f"and kept for retry, consumed corrections up to id {last_id}"
+        ))
+
+    def _apply(self, registry, learner, batch, holdout, tolerance):
+        descriptions = [description for _, description, _ in batch]
+        categories = [category for _, _, category in batch]
+        accepted, learner, old_accuracy, new_accuracy = try_update(
+            learner, descriptions, categories, holdout, tolerance
+        )
+        if accepted:
+            meta = registry.publish(learner, accuracy=new_accuracy, last_correction_id=batch[-1][0])
+            self.stdout.write(f"Published v{meta['version']}: {len(batch)} corrections, "
+                              f"held-out accuracy {old_accuracy:.4f} -> {new_accuracy:.4f}")
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"Refused batch ending at correction {batch[-1][0]}: "
+                f"held-out accuracy would drop {old_accuracy:.4f} -> {new_accuracy:.4f}"
+            ))
+        return learner, accepted
+
+    def _read_seed(self, path):
+        """Split the seed CSV into (train, holdout) description/category lists"""
+        train, holdout = ([], []), ([], [])
+        if not os.path.exists(path):
+            return train, holdout
+        with open(path, newline='') as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                target = holdout if index % HOLDOUT_MODULUS == 0 else train
+                target[0].append(row['description'])
+                target[1].append(row['category'])
+        return train, holdout
+
+    def _holdout(self, seed_holdout):
+        """Seed holdout rows plus every held-out correction"""
+        descriptions, categories = list(seed_holdout[0]), list(seed_holdout[1])
+        held_out = CategoryCorrection.objects.alias(bucket=Mod('id', HOLDOUT_MODULUS)).filter(
+            bucket=0
+        ).values_list('expense__description', 'corrected_category')
+        for description, category in held_out.iterator():
+            descriptions.append(description)
+            categories.append(category)
+        return descriptions, categories
+
+    def _read_progress(self, path):
+        """(last consumed correction id, [[first_id, last_id], ...] refused batches)"""
+        try:
+            with open(path) as f:
+                progress = json.load(f)
+            return progress['last_correction_id'], progress.get('refused', [])
+        except (OSError, ValueError, KeyError):
+            return 0, []
+
+    def _write_progress(self, path, last_id, refused):
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump({'last_correction_id': last_id, 'refused': refused}, f)
+        os.replace(f'{path}.tmp', path)
\ No newline at end of file
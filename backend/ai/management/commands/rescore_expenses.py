@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from expenses.models import Expense
+from ai.services import rescoring
+from jobs.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-apply the trained ML model to Expense.ai_predicted_category. "
+        "Expenses are sharded by id range across a process pool; progress is "
+        "checkpointed per shard so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=str(settings.AI_ML_MODEL_PATH),
+                            help='Path to the trained pipeline (.pkl)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes; 1 runs in-process')
+        parser.add_argument('--shards', type=int, default=None,
+                            help='Number of id-range shards (default: 4 per worker); a resumed run keeps its saved plan')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Expenses predicted and written per batch')
+        parser.add_argument('--checkpoint-dir', default=str(settings.AI_RESCORE_CHECKPOINT_DIR),
+                            help='Directory holding per-shard checkpoints')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore existing checkpoints and rescore everything')
+        parser.add_argument('--enqueue', action='store_true',
+                            help='Queue one background job per shard for run_workers instead of running now')
+
+    def handle(self, **options):
+        model_path = options['model']
+        if not os.path.exists(model_path):
+            raise CommandError(f"Model not found: {model_path}")
+
+        workers = max(1, options['workers'])
+        num_shards = options['shards'] or workers * 4
+        checkpoint_dir = options['checkpoint_dir']
+        # Reuses the plan saved by an interrupted run so its checkpoints still apply
+        shards = rescoring.resume_plan(checkpoint_dir, model_path, num_shards, options['restart'])
+        if not shards:
+            self.stdout.write("No expenses to rescore")
+            return
+
+        if options['enqueue']:
+            self._enqueue(shards, checkpoint_dir, model_path, options['batch_size'])
+            return
+
+        total = Expense.objects.count()
+        tasks = [(start, end, checkpoint_dir, options['batch_size']) for start, end in shards]
+        self.stdout.write(f"Rescoring {total} expenses in {len(shards)} shards with {workers} worker(s)")
+
+        started = time.perf_counter()
+        if workers == 1:
+            pipeline = rescoring.load_pipeline(model_path)
+            results = (rescoring.rescore_shard(*task, pipeline=pipeline) for task in tasks)
+            self._report(results, len(shards), total, started)
+        else:
+            # Children must open their own connections
+            connections.close_all()
+            with multiprocessing.Pool(workers, initializer=rescoring.init_worker, initargs=(model_path,)) as pool:
+                self._report(pool.imap_unordered(rescoring.rescore_shard_task, tasks), len(shards), total, started)
+
+    def _enqueue(self, shards, checkpoint_dir, model_path, batch_size):
+        for start, end in shards:
+            enqueue('ai.rescore_shard', {
+                'start': start, 'end': end, 'checkpoint_dir': checkpoint_dir,
+                'batch_size': batch_size, 'model': os.path.abspath(model_path),
+            }, dedup_key=f'ai.rescore_shard:{start}-{end}')
+        self.stdout.write(self.style.SUCCESS(f"Queued {len(shards)} rescoring jobs for run_workers"))
+
+    def _report(self, results, num_shards, total, started):
+        scanned_total = updated_total = 0
+        for done, (start, end, scanned, updated) in enumerate(results, 1):
+            scanned_total += scanned
+            updated_total += updated
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"[{done}/{num_shards}] ids {start}-{end - 1}: {scanned} scanned, {updated} updated "
+                f"({scanned_total}/{total} total, {elapsed:.1f}s)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescoring complete: {scanned_total} scanned, {updated_total} updated"
+        ))
@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from ..interfaces.categorizer import CategorizerInterface
+
+class CascadeStage:
+    """One categorizer in a cascade, with the confidence needed to stop there"""
+
+    def __init__(self, name: str, categorizer: CategorizerInterface, min_confidence: float = 0.0,
+                 expected_ms: float = 0.0):
+        self.name = name
+        self.categorizer = categorizer
+        self.min_confidence = min_confidence
+        # Moving average of observed latency, used to check the request budget
+        self.expected_ms = expected_ms
+        self.baseline_ms = expected_ms
+
+    def observe(self, elapsed_ms: float, weight: float = 0.2):
+        if self.expected_ms:
+            self.expected_ms = (1 - weight) * self.expected_ms + weight * elapsed_ms
+        else:
+            self.expected_ms = elapsed_ms
+
+    def skipped(self, weight: float = 0.05):
+        """Drift back toward the configured latency while the stage does not run
+
+        A skipped stage is never measured, so one slow call (a cold start)
+        would otherwise keep it over budget for good. Drifting lets a request
+        through again after a few skips to re-measure it.
+        """
+        self.expected_ms = (1 - weight) * self.expected_ms + weight * self.baseline_ms
+
+class CascadingCategorizer(CategorizerInterface):
+    """Confidence-gated cascade: cheap stages first, expensive ones only when needed
+
+    A prediction cache is consulted before any stage. Each stage answers if
+    its confidence reaches the stage's min_confidence; otherwise the request
+    escalates to the next stage, provided the stage's expected latency still
+    fits in the per-request budget. The result records which stage answered
+    (cascade_stage), why (cascade_reason) and what each stage did (cascade_trace).
+    """
+
+    def __init__(self, stages: List[CascadeStage], budget_ms: float = 50.0, cache_size: int = 10000):
+        self.stages = stages
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(description: str) -> str:
+        return ' '.join(description.lower().split())
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key, result):
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def predict(self, description: str, budget_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Run the cascade for one description within budget_ms milliseconds"""
+        key = self._cache_key(description)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached, cascade_stage='cache', cascade_reason='cache_hit', cascade_trace=[])
+
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        started = time.perf_counter()
+        trace = []
+        best = None
+        best_stage = None
+
+        for index, stage in enumerate(self.stages):
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # The first stage always runs so every request gets an answer
+            if index > 0 and elapsed_ms + stage.expected_ms > budget_ms:
+                stage.skipped()
+                trace.append({'stage': stage.name, 'outcome': 'skipped_budget'})
+                continue
+
+            stage_started = time.perf_counter()
+            try:
+                result = stage.categorizer.predict(description)
+            except Exception as e:
+                print(f"Cascade stage {stage.name} failed: {e}")
+                trace.append({'stage': stage.name, 'outcome': 'error'})
+                continue
+            stage_ms = (time.perf_counter() - stage_started) * 1000
+            if result.get('degradation_reason') == 'lm_busy':
+                # Shed by admission control: no answer from this stage, and
+                # its near-zero latency must not skew the stage's estimate
+                trace.append({'stage': stage.name, 'outcome': 'shed'})
+                continue
+            stage.observe(stage_ms)
+
+            confidence = result.get('confidence', 0.0)
+            accepted = confidence >= stage.min_confidence
+            trace.append({
+                'stage': stage.name,
+                'outcome': 'accepted' if accepted else 'low_confidence',
+                'confidence': confidence,
+                'latency_ms': round(stage_ms, 3),
+            })
+
+            if accepted:
+                self._cache_put(key, result)
+                return dict(result, cascade_stage=stage.name, cascade_reason='confident', cascade_trace=trace)
+
+            if best is None or confidence > best.get('confidence', 0.0):
+                best, best_stage = result, stage.name
+
+        if best is None:
+            return {
+                'predicted_category': 'other',
+                'confidence': 0.0,
+                'method': 'cascade_exhausted',
+                'cascade_stage': None,
+                'cascade_reason': 'all_stages_failed',
+                'cascade_trace': trace,
+            }
+
+        skipped = any(step['outcome'] == 'skipped_budget' for step in trace)
+        shed = any(step['outcome'] == 'shed' for step in trace)
+        reason = 'budget_exhausted' if skipped else 'best_effort'
+        if shed:
+            return dict(best, cascade_stage=best_stage, cascade_reason='shed', cascade_trace=trace,
+                        degraded=True, degradation_reason='lm_busy')
+        if not skipped:
+            # Every stage had its say, so this answer will not improve on retry
+            self._cache_put(key, best)
+        return dict(best, cascade_stage=best_stage, cascade_reason=reason, cascade_trace=trace)
+
+    def get_supported_categories(self) -> list:
+        """Return the union of the stages' categories"""
+        categories = []
+        for stage in self.stages:
+            for category in stage.categorizer.get_supported_categories():
+                if category not in categories:
+                    categories.append(category)
+        return categories
+
+_default_cascade = None
+_default_cascade_lock = threading.Lock()
+
+def build_default_cascade() -> CascadingCategorizer:
+    """Rules, then the linear (batch or online) model, then the language model if it can be loaded"""
+    from django.conf import settings
+    from .rule_based_categorizer import RuleBasedCategorizer
+    from .linear_categorizer import LinearModelCategorizer
+
+    if settings.AI_ONLINE_MODEL_ENABLED:
+        from .online_categorizer import OnlineCategorizer
+        linear = CascadeStage('ml_online', OnlineCategorizer(settings.AI_ONLINE_MODEL_DIR, settings.AI_ONLINE_RELOAD_INTERVAL),
+                              min_confidence=settings.AI_CASCADE_ML_THRESHOLD)
+    else:
+        linear = CascadeStage('ml_linear', LinearModelCategorizer(settings.AI_ML_MODEL_PATH),
+                              min_confidence=settings.AI_CASCADE_ML_THRESHOLD)
+
+    stages = [
+        CascadeStage('rule_based', RuleBasedCategorizer(), min_confidence=0.8),
+        linear,
+    ]
+    try:
+        from .smol_vlm_categorizer import SmolVLMCategorizer
+        stages.append(CascadeStage('language_model', SmolVLMCategorizer(), expected_ms=settings.AI_CASCADE_LM_EXPECTED_MS))
+    except ImportError:
+        print("Language model dependencies not installed, cascade stops at the linear model")
+
+    return CascadingCategorizer(
+        stages,
+        budget_ms=settings.AI_CASCADE_BUDGET_MS,
+        cache_size=settings.AI_CASCADE_CACHE_SIZE,
+    )
+
+def get_default_cascade() -> CascadingCategorizer:
+    """Process-wide cascade, built on first use (models are loaded once)"""
+    global _default_cascade
+    if _default_cascade is None:
+        with _default_cascade_lock:
+            if _default_cascade is None:
+                _default_cascade = build_default_cascade()
+    return _default_cascade
@@ -0,0 +1,83 @@
+import os
+import sys
+from typing import Dict, Any, List
+import joblib
+from ..interfaces.categorizer import CategorizerInterface
+
+# Add ML pipeline to path
+ml_pipeline_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'ml_pipeline')
+sys.path.insert(0, ml_pipeline_path)
+
+try:
+    from fast_predictor import FastLinearPredictor
+except ImportError:
+    FastLinearPredictor = None
+
+class LinearModelCategorizer(CategorizerInterface):
+    """Trained TF-IDF + LogisticRegression model without any fallback chain
+
+    Returns the model's own confidence so a caller (e.g. the cascade) can
+    decide whether to escalate. Uses FastLinearPredictor when available.
+    """
+
+    def __init__(self, model_path: str = None):
+        self.model_path = model_path or os.path.join(ml_pipeline_path, 'models', 'ghana_expense_categorizer.pkl')
+        self.pipeline = None
+        self.fast = None
+        self.categories = ['food', 'transport', 'shopping', 'entertainment', 'bills', 'healthcare', 'education', 'travel', 'other']
+        self._load_model()
+
+    def _load_model(self):
+        """Load the trained pipeline"""
+        try:
+            self.pipeline = joblib.load(self.model_path)
+            if FastLinearPredictor is not None and FastLinearPredictor.supports(self.pipeline):
+                self.fast = FastLinearPredictor(self.pipeline)
+        except Exception as e:
+            print(f"Failed to load linear model {self.model_path}: {e}")
+            self.pipeline = None
+
+    def predict(self, description: str) -> Dict[str, Any]:
+        """Predict with the linear model only"""
+        if self.pipeline is None:
+            return {
+                'predicted_category': 'other',
+                'confidence': 0.0,
+                'method': 'ml_unavailable',
+                'model_type': 'logistic_regression'
+            }
+
+        if self.fast:
+            category, confidence, _ = self.fast.predict_one(description)
+        else:
+            proba = self.pipeline.predict_proba([description])[0]
+            category, confidence = self.pipeline.classes_[proba.argmax()], proba.max()
+
+        return {
+            'predicted_category': str(category),
+            'confidence': float(confidence),
+            'method': 'ml_linear',
+            'model_type': 'logistic_regression'
+        }
+
+    def predict_batch(self, descriptions: List[str]) -> List[Dict[str, Any]]:
+        """Predict many descriptions with a single model call"""
+        if self.pipeline is None:
+            return [self.predict(description) for description in descriptions]
+
+        if self.fast:
+            pairs = self.fast.predict_batch(descriptions)
+        else:
+            proba = self.pipeline.predict_proba(descriptions)
+            pairs = [(self.pipeline.classes_[row.argmax()], row.max()) for row in proba]
+
+        return [{
+            'predicted_category': str(category),
+            'confidence': float(confidence),
+            'method': 'ml_linear',
+            'model_type': 'logistic_regression'
+        } for category, confidence in pairs]
+
+    def get_supported_categories(self) -> list:
+        """Return supported categories"""
+        return self.categories
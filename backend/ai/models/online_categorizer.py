@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Dict, Any
+from ..interfaces.categorizer import CategorizerInterface
+from ..services.online_learning import ModelRegistry, CATEGORIES
+
+class OnlineCategorizer(CategorizerInterface):
+    """Serves the latest model published by learn_from_corrections
+
+    The registry pointer is checked at most every reload_interval seconds;
+    a new version is loaded and swapped in without restarting the worker.
+    """
+
+    def __init__(self, model_dir: str, reload_interval: float = 30.0):
+        self.registry = ModelRegistry(model_dir)
+        self.reload_interval = reload_interval
+        self._state = (None, None)  # (version, learner), replaced as a unit
+        self._pointer_mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh()
+
+    @property
+    def version(self):
+        return self._state[0]
+
+    def _refresh(self):
+        """Load the published version if the pointer changed"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            mtime = self.registry.pointer_mtime()
+            if mtime is None or mtime == self._pointer_mtime:
+                return
+            try:
+                meta, learner = self.registry.load_current()
+            except Exception as e:
+                print(f"Failed to load online model: {e}")
+                return
+            self._pointer_mtime = mtime
+            if meta is not None:
+                self._state = (meta['version'], learner)
+
+    def predict(self, description: str) -> Dict[str, Any]:
+        """Predict with the current online model"""
+        if time.monotonic() - self._checked_at > self.reload_interval:
+            self._refresh()
+
+        version, learner = self._state
+        if learner is None:
+            return {
+                'predicted_category': 'other',
+                'confidence': 0.0,
+                'method': 'online_unavailable',
+                'model_type': 'online_sgd'
+            }
+
+        proba = learner.predict_proba([description])[0]
+        best = proba.argmax()
+        return {
+            'predicted_category': str(learner.classifier.classes_[best]),
+            'confidence': float(proba[best]),
+            'method': 'online_model',
+            'model_type': 'online_sgd',
+            'model_version': f'online-v{version}'
+        }
+
+    def get_supported_categories(self) -> list:
+        """Return supported categories"""
+        return list(CATEGORIES)
\ No newline at end of file
@@ -3,6 +3,7 @@ from transformers import AutoTokenizer, AutoModelForCausalLM
 import json
 import re
 from ai.interfaces.categorizer import CategorizerInterface
+from ai.services.admission import get_admission_controller
 
 class SmolVLMCategorizer(CategorizerInterface):
     """AI-powered categorizer using DialoGPT-small with enhanced keyword fallback
@@ -58,6 +59,26 @@ class SmolVLMCategorizer(CategorizerInterface):
         if not self.model or not self.tokenizer:
             return self._fallback_prediction(description)
         
+        # A strong keyword match overrides the model, so check it before
+        # paying for the forward passes
+        fallback_result = self._enhanced_fallback(description)
+        if fallback_result['confidence'] > 0.7:
+            return {
+                'predicted_category': fallback_result['predicted_category'],
+                'confidence': 0.8,
+                'method': 'enhanced_model_fallback',
+                'raw_response': f'model_enhanced_{fallback_result["predicted_category"]}'
+            }
+        
+        # Inference is capped per process; when every slot is busy answer
+        # from keywords rather than queue behind the running passes
+        with get_admission_controller().lm_slot() as acquired:
+            if not acquired:
+                return dict(fallback_result, degraded=True, degradation_reason='lm_busy')
+            return self._model_predict(description)
+
+    def _model_predict(self, description):
+        """Score the category prompts with the language model"""
         # Try multiple prompts to get better results
         prompts = [
             f"Expense: {description}\nCategory: bills",
@@ -86,16 +107,6 @@ class SmolVLMCategorizer(CategorizerInterface):
                         best_score = score
                         best_category = category
             
-            # Use enhanced fallback for better accuracy
-            fallback_result = self._enhanced_fallback(description)
-            if fallback_result['confidence'] > 0.7:
-                return {
-                    'predicted_category': fallback_result['predicted_category'],
-                    'confidence': 0.8,
-                    'method': 'enhanced_model_fallback',
-                    'raw_response': f'model_enhanced_{fallback_result["predicted_category"]}'
-                }
-            
             return {
                 'predicted_category': best_category,
                 'confidence': 0.7,
@@ -0,0 +1,283 @@
+import calendar
+import threading
+from collections import OrderedDict
+from itertools import chain
+from datetime import date, timedelta
+from django.conf import settings
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from django.db.models.sql.constants import MULTI
+import numpy as np
+from expenses.models import Expense
+from expenses.text import normalize_description
+from expenses.versioning import data_version
+
+# name, expected interval in days, allowed deviation in days, occurrences per month
+FREQUENCIES = [
+    ('weekly', 7, 1, 52 / 12),
+    ('biweekly', 14, 2, 26 / 12),
+    ('monthly', 30.4, 3, 1),
+    ('quarterly', 91.3, 7, 1 / 3),
+    ('yearly', 365.25, 15, 1 / 12),
+]
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+MIN_OCCURRENCES = 3
+# Share of intervals that must fall within tolerance of the period
+MIN_REGULARITY = 0.75
+
+
+class DescriptionGroup:
+    """All expenses of one user sharing a normalized description"""
+
+    __slots__ = ('description', 'category', 'dates', 'amounts', 'last_id')
+
+    def __init__(self):
+        self.description = ''
+        self.category = 'other'
+        self.dates = []
+        self.amounts = []
+        self.last_id = 0
+
+    def add(self, expense_id, description, category, day, amount):
+        # Unordered; detect_pattern sorts the dates
+        self.dates.append(day.toordinal())
+        self.amounts.append(float(amount))
+        if expense_id >= self.last_id:
+            # Latest entry names the series
+            self.last_id = expense_id
+            self.description = description
+            self.category = category
+
+
+def next_occurrence(last, frequency, median_gap):
+    """Monthly and yearly series keep their day of month; others step by the median gap"""
+    months = {'monthly': 1, 'quarterly': 3, 'yearly': 12}.get(frequency)
+    if months is None:
+        return last + timedelta(days=round(median_gap))
+    year, month = divmod(last.month - 1 + months, 12)
+    year += last.year
+    return date(year, month + 1, min(last.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def detect_pattern(dates, amounts):
+    """
+    Periodicity of one group's date ordinals (any order), or None.
+
+    The median gap picks the candidate frequency; the series counts as
+    recurring when most gaps sit within that frequency's tolerance.
+    """
+    return detect_patterns(np.zeros(len(dates), dtype=np.int64), dates, amounts, 1)[0]
+
+
+def detect_patterns(groups, dates, amounts, count):
+    """
+    detect_pattern for `count` groups at once, where row i of dates and
+    amounts belongs to group groups[i]; returns a pattern or None per group.
+    Gaps, medians and regularity come from one sort of all rows, so only
+    the recurring groups cost Python work.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    dates = np.asarray(dates, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    patterns = [None] * count
+    if not groups.size:
+        return patterns
+
+    # Distinct days of each group, ascending
+    order = np.lexsort((dates, groups))
+    series, days = groups[order], dates[order]
+    distinct = np.ones(series.size, dtype=bool)
+    distinct[1:] = (series[1:] != series[:-1]) | (days[1:] != days[:-1])
+    series, days = series[distinct], days[distinct]
+    occurrences = np.bincount(series, minlength=count)
+    starts = np.cumsum(occurrences) - occurrences
+
+    same = series[1:] == series[:-1]
+    gaps, gap_series = np.diff(days)[same], series[1:][same]
+    gap_counts = np.maximum(occurrences - 1, 0)
+    gap_starts = np.cumsum(gap_counts) - gap_counts
+    candidates = np.flatnonzero(occurrences >= MIN_OCCURRENCES)
+    if not candidates.size:
+        return patterns
+    sorted_gaps = gaps[np.lexsort((gaps, gap_series))]
+    lower = gap_starts[candidates] + (gap_counts[candidates] - 1) // 2
+    upper = gap_starts[candidates] + gap_counts[candidates] // 2
+    medians = (sorted_gaps[lower] + sorted_gaps[upper]) / 2.0
+
+    rows = np.bincount(groups, minlength=count)
+    averages = np.bincount(groups, weights=amounts, minlength=count) / np.maximum(rows, 1)
+    deviations = np.sqrt(
+        np.bincount(groups, weights=(amounts - averages[groups]) ** 2, minlength=count) / np.maximum(rows, 1)
+    )
+
+    undecided = np.ones(candidates.size, dtype=bool)
+    for name, period, tolerance, per_month in FREQUENCIES:
+        matched = undecided & (np.abs(medians - period) <= tolerance)
+        if not matched.any():
+            continue
+        # The nearest frequency decides, recurring or not
+        undecided &= ~matched
+        within = (np.abs(gaps - period) <= tolerance).astype(np.float64)
+        regularities = np.bincount(gap_series, weights=within, minlength=count) / np.maximum(gap_counts, 1)
+        for position in np.flatnonzero(matched):
+            group = candidates[position]
+            regularity = float(regularities[group])
+            if regularity < MIN_REGULARITY:
+                continue
+            first, last = int(days[starts[group]]), int(days[starts[group] + occurrences[group] - 1])
+            average = float(averages[group])
+            patterns[group] = {
+                'frequency': name,
+                'interval_days': round((last - first) / float(gap_counts[group]), 1),
+                'regularity': round(regularity, 2),
+                'occurrences': int(occurrences[group]),
+                'average_amount': round(average, 2),
+                'amount_varies': bool(deviations[group] > 0.1 * average) if average else False,
+                'first_date': date.fromordinal(first),
+                'last_date': date.fromordinal(last),
+                'next_expected': next_occurrence(date.fromordinal(last), name, float(medians[position])),
+                'monthly_cost': round(average * per_month, 2),
+            }
+    return patterns
+
+
+class RecurringDetector:
+    """Per-user description groups and their detected patterns
+
+    A user's history is grouped and scanned in one vectorized pass on first
+    request. Each state carries the UserDataVersion it was built at and is
+    rebuilt when the version moves, so writes from other workers and jobs
+    are picked up; expenses created in this process update just the
+    affected group when they account for the whole version step. Users are
+    evicted least-recently-used.
+    """
+
+    def __init__(self, max_users: int = 200):
+        self.max_users = max_users
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, user_id):
+        # Raw column values, with dates as ISO text: converting each row in
+        # Python would cost more than the query, so dates, amounts and the
+        # naming categories are converted in bulk below
+        queryset = Expense.objects.filter(user_id=user_id).order_by().annotate(
+            day=Cast('date', CharField())
+        ).values_list('id', 'description', 'category', 'amount', 'day')
+        compiler = queryset.query.get_compiler(queryset.db)
+        rows = list(chain.from_iterable(compiler.execute_sql(MULTI, chunk_size=5000)))
+        if not rows:
+            return {'groups': {}, 'patterns': {}, 'max_id': 0}
+        ids, descriptions, categories, amounts, days = zip(*rows)
+        ids = np.asarray(ids, dtype=np.int64)
+        days = np.asarray(days, dtype='datetime64[D]').astype(np.int64) + EPOCH
+        amounts = np.asarray(amounts, dtype=np.float64) / Expense._meta.get_field('amount').stored_units()
+
+        # Descriptions repeat, so normalize each distinct one once
+        numbers, series_of = {}, {}
+        for description in dict.fromkeys(descriptions):
+            series_of[description] = numbers.setdefault(normalize_description(description), len(numbers))
+        series = np.fromiter(map(series_of.__getitem__, descriptions), dtype=np.int64, count=len(descriptions))
+
+        # Rows by group, latest id last: that entry names the series
+        order = np.lexsort((ids, series))
+        ends = np.cumsum(np.bincount(series, minlength=len(numbers)))
+        latest = order[ends - 1]
+        to_category = Expense._meta.get_field('category').to_python
+        dates, values = days[order].tolist(), amounts[order].tolist()
+        groups, start = {}, 0
+        for key, end, row, last_id in zip(numbers, ends.tolist(), latest.tolist(), ids[latest].tolist()):
+            group = groups[key] = DescriptionGroup()
+            group.dates, group.amounts = dates[start:end], values[start:end]
+            group.last_id = last_id
+            group.description, group.category = descriptions[row], to_category(categories[row])
+            start = end
+
+        patterns = {
+            key: pattern
+            for key, pattern in zip(numbers, detect_patterns(series, days, amounts, len(numbers)))
+            if pattern
+        }
+        return {'groups': groups, 'patterns': patterns, 'max_id': int(ids.max())}
+
+    def _state(self, user_id):
+        version = data_version(user_id)
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is not None and state['version'] == version:
+                self._users.move_to_end(user_id)
+                return state
+
+        # Versioned before reading rows: a write in between only causes another build
+        state = self._build(user_id)
+        state['version'] = version
+        with self._lock:
+            self._users[user_id] = state
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return state
+
+    def add_expense(self, user_id, expense):
+        """
+        Fold an expense created in this process (an ExpenseSnapshot, after
+        its data version bump) into a loaded user; otherwise drop the user.
+        """
+        with self._lock:
+            if user_id not in self._users:
+                return
+        version = data_version(user_id)
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                return
+            # Other writes happened too, or the build may already have read this row
+            if version != state['version'] + 1 or expense.id <= state['max_id']:
+                self._users.pop(user_id)
+                return
+            key = normalize_description(expense.description)
+            group = state['groups'].get(key)
+            if group is None:
+                group = state['groups'][key] = DescriptionGroup()
+            group.add(expense.id, expense.description, expense.category, expense.date, expense.amount)
+            pattern = detect_pattern(group.dates, group.amounts)
+            if pattern:
+                state['patterns'][key] = pattern
+            else:
+                state['patterns'].pop(key, None)
+            state['version'], state['max_id'] = version, expense.id
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+    def recurring(self, user_id):
+        """Detected recurring payments, soonest expected first"""
+        state = self._state(user_id)
+        with self._lock:
+            items = [
+                dict(pattern, description=state['groups'][key].description,
+                     category=state['groups'][key].category, key=key)
+                for key, pattern in state['patterns'].items()
+            ]
+        items.sort(key=lambda item: (item['next_expected'], item['key']))
+        return items
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> RecurringDetector:
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = RecurringDetector(max_users=settings.AI_RECURRING_MAX_USERS)
+    return _detector
\ No newline at end of file
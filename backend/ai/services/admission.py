@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+from django.conf import settings
+from .metrics import metrics
+
+
+class TokenBucket:
+    """Allows `rate` events per second on average with bursts up to `capacity`"""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class AdmissionController:
+    """
+    Decides whether an expensive categorization may run or must degrade.
+
+    Requests pass a per-client token bucket and a global one; buckets live
+    in this process, clients evicted least-recently-used past max_clients.
+    Language-model inference also needs one of max_lm_concurrency slots,
+    taken without waiting: a request that finds them all busy degrades
+    instead of queueing behind them.
+    """
+
+    def __init__(self, client_rate: float = 2.0, client_burst: float = 10, global_rate: float = 20.0,
+                 global_burst: float = 50, max_lm_concurrency: int = 2, max_clients: int = 10000,
+                 clock=time.monotonic):
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_clients = max_clients
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock())
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self._lm_slots = threading.BoundedSemaphore(max_lm_concurrency)
+
+    def admit(self, client_key: Optional[str] = None) -> Optional[str]:
+        """None if the request may run, otherwise the reason it is shed"""
+        now = self._clock()
+        with self._lock:
+            if client_key is not None:
+                bucket = self._clients.get(client_key)
+                if bucket is None:
+                    bucket = self._clients[client_key] = TokenBucket(self.client_rate, self.client_burst, now)
+                    while len(self._clients) > self.max_clients:
+                        self._clients.popitem(last=False)
+                else:
+                    self._clients.move_to_end(client_key)
+                if not bucket.take(now):
+                    reason = 'client_rate_limited'
+                elif not self._global.take(now):
+                    # The client's token is spent anyway; it did make a request
+                    reason = 'global_rate_limited'
+                else:
+                    reason = None
+            else:
+                reason = None if self._global.take(now) else 'global_rate_limited'
+
+        if reason:
+            metrics.increment('ai.admission.shed', reason=reason)
+        else:
+            metrics.increment('ai.admission.admitted')
+        return reason
+
+    @contextmanager
+    def lm_slot(self):
+        """Yields True while holding a language-model slot, False if none was free"""
+        acquired = self._lm_slots.acquire(blocking=False)
+        if not acquired:
+            metrics.increment('ai.admission.shed', reason='lm_busy')
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._lm_slots.release()
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(
+                    client_rate=settings.AI_ADMISSION_CLIENT_RATE,
+                    client_burst=settings.AI_ADMISSION_CLIENT_BURST,
+                    global_rate=settings.AI_ADMISSION_GLOBAL_RATE,
+                    global_burst=settings.AI_ADMISSION_GLOBAL_BURST,
+                    max_lm_concurrency=settings.AI_LM_MAX_CONCURRENCY,
+                    max_clients=settings.AI_ADMISSION_MAX_CLIENTS,
+                )
+    return _controller
+
+
+def reset_admission_controller():
+    """Drop the shared controller so the next use rebuilds it from settings"""
+    global _controller
+    with _controller_lock:
+        _controller = None
+
+
+def client_key_for(request, user=None) -> str:
+    """Rate-limit key: the given user when authenticated, otherwise the client address"""
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Categories for expenses created without one"""
+from django.conf import settings
+from jobs.queue import enqueue_batch
+from ..models.rule_based_categorizer import RuleBasedCategorizer
+from .categorization_service import CategorizationService
+
+# Memory and keywords only: cheap enough for the create request itself
+_service = CategorizationService(RuleBasedCategorizer())
+
+
+def rule_category(user, description: str) -> str:
+    """The user's own history for this description, otherwise keyword rules"""
+    return _service.categorize(description, user=user)['predicted_category']
+
+
+def queue_model_predictions(expense_ids):
+    """
+    Have a worker refine ai_predicted_category with the trained model.
+
+    Creates within AI_AUTO_CATEGORIZE_BATCH_DELAY seconds of the first
+    join one pending job, up to AI_AUTO_CATEGORIZE_BATCH_SIZE expenses,
+    which makes a single predict call for all of them. Returns the jobs.
+    """
+    return enqueue_batch(
+        'ai.categorize_expenses', 'ai.categorize_expenses', 'expense_ids', expense_ids,
+        delay=settings.AI_AUTO_CATEGORIZE_BATCH_DELAY, max_size=settings.AI_AUTO_CATEGORIZE_BATCH_SIZE,
+    )
\ No newline at end of file
@@ -1,16 +1,69 @@
+import time
 from typing import Dict, Any
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from ..interfaces.categorizer import CategorizerInterface
 from ..models.rule_based_categorizer import RuleBasedCategorizer
+from . import inference_executor
+from .admission import get_admission_controller
+from .shadow import get_shadow_evaluator
+from .user_memory import recall
 
 class CategorizationService:
     """Service layer for expense categorization with swappable models"""
     
     def __init__(self, categorizer: CategorizerInterface = None):
-        self.categorizer = categorizer or RuleBasedCategorizer()
+        self.categorizer = categorizer or self._default_categorizer()
     
-    def categorize(self, description: str) -> Dict[str, Any]:
-        """Categorize expense description"""
-        return self.categorizer.predict(description)
+    @staticmethod
+    def _default_categorizer() -> CategorizerInterface:
+        if getattr(settings, 'AI_CASCADE_ENABLED', False):
+            from ..models.cascading_categorizer import get_default_cascade
+            return get_default_cascade()
+        return RuleBasedCategorizer()
+    
+    def _shed_reason(self, user, client_key):
+        """Why a model prediction may not run now, or None; keyword matching is never shed"""
+        if not getattr(settings, 'AI_ADMISSION_ENABLED', True) or isinstance(self.categorizer, RuleBasedCategorizer):
+            return None
+        if client_key is None and user is not None:
+            client_key = f'user:{user.pk}'
+        return get_admission_controller().admit(client_key)
+
+    @staticmethod
+    def _shadow(description, result, started):
+        """Offer a primary model answer to the shadow candidates; returns at once"""
+        evaluator = get_shadow_evaluator()
+        if evaluator is not None and not result.get('degraded'):
+            evaluator.submit(description, result, (time.perf_counter() - started) * 1000)
+
+    def categorize(self, description: str, user=None, client_key: str = None) -> Dict[str, Any]:
+        """Categorize expense description, preferring the user's own history"""
+        remembered = recall(user, description)
+        if remembered:
+            return remembered
+        shed = self._shed_reason(user, client_key)
+        if shed:
+            return inference_executor.keyword_fallback(description, shed)
+        started = time.perf_counter()
+        result = self.categorizer.predict(description)
+        self._shadow(description, result, started)
+        return result
+    
+    async def acategorize(self, description: str, timeout: float = None, user=None,
+                          client_key: str = None) -> Dict[str, Any]:
+        """Categorize on the inference pool, degrading to keywords on timeout or overload"""
+        if user is not None:
+            remembered = await sync_to_async(recall)(user, description)
+            if remembered:
+                return remembered
+        shed = self._shed_reason(user, client_key)
+        if shed:
+            return inference_executor.keyword_fallback(description, shed)
+        started = time.perf_counter()
+        result = await inference_executor.acategorize(self.categorizer.predict, description, timeout)
+        self._shadow(description, result, started)
+        return result
     
     def get_categories(self) -> list:
         """Get supported categories"""
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from expenses.models import Expense, CategoryCorrection, ExpenseSnapshot
+from expenses.signals import expense_changed
+
+
+def _model_version():
+    return getattr(settings, 'AI_MODEL_VERSION', '')
+
+
+def _notify(user, row, new_category):
+    """Tell derived-data listeners about a category change made with update()"""
+    old = ExpenseSnapshot(row['id'], user.id, row['description'], row['category'], row['amount'], row['date'],
+                          row['currency'], row['auto_categorized'])
+    new = old._replace(category=new_category, auto_categorized=False)
+    expense_changed.send(sender=Expense, user_id=user.id, old=old, new=new, created=False)
+
+
+def override_category(user, expense_id, new_category) -> Optional[Dict[str, Any]]:
+    """
+    Set an expense's category with a targeted UPDATE and log the correction.
+
+    Reads a few columns as a dict (no model instance), then issues one
+    UPDATE guarded on the category it read, so a concurrent change is
+    never silently overwritten. Returns None if the expense does not exist
+    for the user, and a result with conflict=True (nothing written) if
+    concurrent writes won every attempt.
+    """
+    for _ in range(3):
+        row = Expense.objects.filter(id=expense_id, user=user).values(
+            'id', 'category', 'ai_predicted_category', 'description', 'amount', 'date', 'currency', 'auto_categorized'
+        ).first()
+        if row is None:
+            return None
+
+        old_category = row['category']
+        if old_category == new_category:
+            if row['auto_categorized'] and Expense.objects.filter(
+                id=expense_id, user=user, category=old_category, auto_categorized=True
+            ).update(auto_categorized=False):
+                # Confirms the server's category: remembered, but not a correction
+                _notify(user, row, new_category)
+            break
+
+        with transaction.atomic():
+            updated = Expense.objects.filter(
+                id=expense_id, user=user, category=old_category
+            ).update(category=new_category, auto_categorized=False, updated_at=timezone.now())
+            if updated:
+                CategoryCorrection.objects.create(
+                    expense_id=expense_id,
+                    user=user,
+                    predicted_category=row['ai_predicted_category'],
+                    corrected_category=new_category,
+                    model_version=_model_version(),
+                )
+        if updated:
+            _notify(user, row, new_category)
+            break
+        # Lost a race with another write; re-read and try again
+    else:
+        return {
+            'expense_id': int(expense_id),
+            'conflict': True,
+            'current_category': old_category,
+            'new_category': new_category,
+        }
+
+    return {
+        'expense_id': int(expense_id),
+        'old_category': old_category,
+        'new_category': new_category,
+        'ai_predicted_category': row['ai_predicted_category'],
+    }
+
+
+def bulk_override_categories(user, overrides: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply many {expense_id, category} overrides for one user.
+
+    Costs one locking SELECT, an UPDATE per distinct target category and
+    one bulk INSERT into the correction log, regardless of the number of
+    expenses. The old values logged and sent to listeners are the ones
+    read under the lock, so a concurrent write cannot make them stale.
+    """
+    targets = {int(item['expense_id']): item['category'] for item in overrides}
+    now = timezone.now()
+    version = _model_version()
+    corrections = []
+    with transaction.atomic():
+        rows = {
+            row['id']: row for row in Expense.objects.select_for_update().filter(
+                user=user, id__in=targets.keys()
+            ).values(
+                'id', 'category', 'ai_predicted_category', 'description', 'amount', 'date', 'currency', 'auto_categorized'
+            )
+        }
+        by_category = defaultdict(list)
+        for expense_id, row in rows.items():
+            if row['category'] != targets[expense_id]:
+                by_category[targets[expense_id]].append(expense_id)
+
+        for new_category, ids in by_category.items():
+            Expense.objects.filter(id__in=ids).update(category=new_category, auto_categorized=False, updated_at=now)
+            corrections.extend(
+                CategoryCorrection(
+                    expense_id=expense_id,
+                    user=user,
+                    predicted_category=rows[expense_id]['ai_predicted_category'],
+                    corrected_category=new_category,
+                    model_version=version,
+                ) for expense_id in ids
+            )
+        CategoryCorrection.objects.bulk_create(corrections)
+
+    for correction in corrections:
+        _notify(user, rows[correction.expense_id], correction.corrected_category)
+
+    return {
+        'updated': len(corrections),
+        'not_found': sorted(set(targets) - set(rows)),
+        'results': [{
+            'expense_id': expense_id,
+            'old_category': rows[expense_id]['category'],
+            'new_category': targets[expense_id],
+            'ai_predicted_category': rows[expense_id]['ai_predicted_category'],
+        } for expense_id in targets if expense_id in rows],
+    }
+
+
+def iter_training_corrections(since_id=0):
+    """
+    Yield (correction_id, description, corrected_category) for export.
+
+    Streams the log in id order through a single join on the expense
+    primary key. When an expense was corrected more than once, only its
+    latest correction is emitted; earlier ones are filtered out in SQL.
+    """
+    later = CategoryCorrection.objects.filter(expense_id=OuterRef('expense_id'), id__gt=OuterRef('id'))
+    corrections = CategoryCorrection.objects.filter(id__gt=since_id).exclude(Exists(later)).order_by('id').values_list(
+        'id', 'expense__description', 'corrected_category'
+    )
+    yield from corrections.iterator(chunk_size=2000)
\ No newline at end of file
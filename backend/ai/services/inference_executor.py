@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Any
+from django.conf import settings
+from ..models.rule_based_categorizer import RuleBasedCategorizer
+from .metrics import metrics
+
+_executor = None
+_executor_lock = threading.Lock()
+# Bounds work queued on the pool; a full queue degrades instead of growing
+_pending = None
+_keyword_categorizer = RuleBasedCategorizer()
+
+
+def get_executor():
+    """Return the shared, bounded pool used for categorizer inference"""
+    global _executor, _pending
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'AI_INFERENCE_WORKERS', 4)
+                _pending = threading.BoundedSemaphore(getattr(settings, 'AI_INFERENCE_MAX_PENDING', workers * 4))
+                if getattr(settings, 'AI_INFERENCE_EXECUTOR', 'thread') == 'process':
+                    _executor = ProcessPoolExecutor(max_workers=workers)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-inference')
+    return _executor
+
+
+def shutdown_executor(wait=True):
+    """Tear down the shared pool (used by tests and on settings changes)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+
+
+def keyword_fallback(description: str, reason: str) -> Dict[str, Any]:
+    """Cheap keyword prediction returned when model inference is unavailable"""
+    result = _keyword_categorizer.predict(description)
+    result['degraded'] = True
+    result['degradation_reason'] = reason
+    return result
+
+
+def _submit(predict, description):
+    """Submit to the pool, or None when max pending jobs are already queued or running"""
+    executor = get_executor()
+    pending = _pending
+    if not pending.acquire(blocking=False):
+        metrics.increment('ai.admission.shed', reason='queue_full')
+        return None
+    future = executor.submit(predict, description)
+    future.add_done_callback(lambda _: pending.release())
+    return future
+
+
+def _resolve_timeout(timeout):
+    if timeout is None:
+        return getattr(settings, 'AI_INFERENCE_TIMEOUT', 2.0)
+    return timeout
+
+
+def categorize(predict: Callable[[str], Dict[str, Any]], description: str, timeout: float = None) -> Dict[str, Any]:
+    """
+    Run predict(description) on the inference pool, blocking the caller.
+
+    Falls back to keyword matching if the prediction does not finish within
+    the timeout or raises. With a process pool, predict must be picklable.
+    """
+    future = _submit(predict, description)
+    if future is None:
+        return keyword_fallback(description, 'overloaded')
+    try:
+        return future.result(timeout=_resolve_timeout(timeout))
+    except FutureTimeoutError:
+        future.cancel()
+        return keyword_fallback(description, 'timeout')
+    except Exception as e:
+        print(f"Offloaded prediction failed: {e}")
+        return keyword_fallback(description, 'error')
+
+
+async def acategorize(predict: Callable[[str], Dict[str, Any]], description: str, timeout: float = None) -> Dict[str, Any]:
+    """Async variant of categorize() that never blocks the event loop"""
+    future = _submit(predict, description)
+    if future is None:
+        return keyword_fallback(description, 'overloaded')
+    future = asyncio.wrap_future(future)
+    try:
+        return await asyncio.wait_for(future, timeout=_resolve_timeout(timeout))
+    except asyncio.TimeoutError:
+        # The worker keeps running a started job; the slot frees when it ends
+        return keyword_fallback(description, 'timeout')
+    except Exception as e:
+        print(f"Offloaded prediction failed: {e}")
+        return keyword_fallback(description, 'error')
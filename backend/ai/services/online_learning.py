@@ -0,0 +1,170 @@
+import copy
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+CATEGORIES = ['food', 'transport', 'shopping', 'entertainment', 'bills', 'healthcare', 'education', 'travel', 'other']
+
+# Examples whose id (or seed row number) is divisible by this are held out
+HOLDOUT_MODULUS = 10
+
+
+class OnlineLearner:
+    """Hashing-feature linear model that learns from micro-batches via partial_fit
+
+    The hashing vectorizer is stateless, so new vocabulary from user
+    descriptions is picked up without refitting a vocabulary.
+    """
+
+    def __init__(self, n_features=2 ** 16, random_state=42):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm='l2'
+        )
+        self.classifier = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=random_state)
+        self.examples_seen = 0
+
+    def partial_fit(self, descriptions, categories):
+        X = self.vectorizer.transform(descriptions)
+        self.classifier.partial_fit(X, categories, classes=CATEGORIES)
+        self.examples_seen += len(descriptions)
+        return self
+
+    def predict_proba(self, descriptions):
+        return self.classifier.predict_proba(self.vectorizer.transform(descriptions))
+
+    def predict(self, descriptions):
+        return self.classifier.predict(self.vectorizer.transform(descriptions))
+
+    def accuracy(self, descriptions, categories):
+        if not descriptions or not self.examples_seen:
+            return None
+        return float(np.mean(self.predict(descriptions) == np.asarray(categories)))
+
+
+class RegistryLocked(Exception):
+    """Another process holds the registry lock"""
+
+
+class ModelRegistry:
+    """Versioned model files plus a CURRENT pointer that is swapped atomically
+
+    Writers save model-vNNNNNN.joblib first, then replace CURRENT with
+    os.replace, so readers only ever see a fully written version. Writers
+    serialize on an flock()ed LOCK file, and publishing prunes all but the
+    newest keep_versions model files.
+    """
+
+    POINTER = 'CURRENT'
+    LOCK = 'LOCK'
+
+    def __init__(self, directory, keep_versions=5):
+        self.directory = str(directory)
+        # At least the previous version stays, for readers that just read the old pointer
+        self.keep_versions = max(2, keep_versions)
+        self._lock_depth = 0
+
+    @contextmanager
+    def lock(self, blocking=True):
+        """Exclusive writer lock across processes; re-entrant within this registry"""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, self.LOCK), 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RegistryLocked(self.directory)
+            self._lock_depth = 1
+            try:
+                yield
+            finally:
+                self._lock_depth = 0
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _pointer_path(self):
+        return os.path.join(self.directory, self.POINTER)
+
+    def _model_path(self, version):
+        return os.path.join(self.directory, f'model-v{version:06d}.joblib')
+
+    def current(self):
+        """Metadata of the published version, or None"""
+        try:
+            with open(self._pointer_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def pointer_mtime(self):
+        try:
+            return os.stat(self._pointer_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self, version):
+        return joblib.load(self._model_path(version))
+
+    def load_current(self):
+        """(metadata, learner) for the published version, or (None, None)"""
+        meta = self.current()
+        if meta is None:
+            return None, None
+        return meta, self.load(meta['version'])
+
+    def versions(self):
+        """Version numbers with a model file, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(
+            int(name[len('model-v'):-len('.joblib')]) for name in names
+            if name.startswith('model-v') and name.endswith('.joblib')
+        )
+
+    def publish(self, learner, **metadata):
+        with self.lock():
+            current = self.current()
+            version = (current['version'] + 1) if current else 1
+
+            model_path = self._model_path(version)
+            joblib.dump(learner, f'{model_path}.tmp')
+            os.replace(f'{model_path}.tmp', model_path)
+
+            meta = dict(metadata, version=version, examples_seen=learner.examples_seen)
+            tmp_pointer = f'{self._pointer_path()}.tmp'
+            with open(tmp_pointer, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_pointer, self._pointer_path())
+
+            for old in self.versions()[:-self.keep_versions]:
+                os.remove(self._model_path(old))
+        return meta
+
+
+def try_update(learner, descriptions, categories, holdout, tolerance=0.0):
+    """
+    Fit a copy of learner on one micro-batch and keep it only if held-out
+    accuracy does not drop by more than tolerance.
+
+    Returns (accepted, candidate, old_accuracy, new_accuracy).
+    """
+    holdout_descriptions, holdout_categories = holdout
+    old_accuracy = learner.accuracy(holdout_descriptions, holdout_categories)
+    candidate = copy.deepcopy(learner).partial_fit(descriptions, categories)
+    new_accuracy = candidate.accuracy(holdout_descriptions, holdout_categories)
+
+    if old_accuracy is not None and new_accuracy < old_accuracy - tolerance:
+        return False, learner, old_accuracy, new_accuracy
+    return True, candidate, old_accuracy, new_accuracy
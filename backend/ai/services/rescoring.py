@@ -0,0 +1,166 @@
+import json
+import os
+import shutil
+import joblib
+from django.db.models import Min, Max
+from expenses.models import Expense
+from expenses.versioning import bump_data_versions
+
+# Loaded once per worker process by init_worker()
+_pipeline = None
+
+
+def load_pipeline(model_path):
+    """Load the trained scikit-learn pipeline written by ml_pipeline/run_pipeline.py"""
+    return joblib.load(model_path)
+
+
+def init_worker(model_path):
+    """Pool initializer: set up Django (spawn start method) and load the model once"""
+    global _pipeline
+    import django
+    from django.apps import apps
+    from django.db import connections
+    if not apps.ready:
+        django.setup()
+    # Never reuse a connection inherited from the parent process
+    connections.close_all()
+    _pipeline = load_pipeline(model_path)
+
+
+def model_signature(model_path):
+    """Identify a model artifact so checkpoints from another model are discarded"""
+    stat = os.stat(model_path)
+    return {'path': os.path.abspath(model_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def plan_shards(num_shards, after=None):
+    """Split the expense id space (ids >= after, if given) into contiguous [start, end) ranges"""
+    expenses = Expense.objects.all() if after is None else Expense.objects.filter(id__gte=after)
+    bounds = expenses.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    low, high = bounds['low'], bounds['high'] + 1
+    step = max(1, -(-(high - low) // num_shards))
+    return [(start, min(start + step, high)) for start in range(low, high, step)]
+
+
+def _write_json(path, data):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _manifest_path(checkpoint_dir):
+    return os.path.join(checkpoint_dir, 'manifest.json')
+
+
+def read_manifest(checkpoint_dir):
+    try:
+        with open(_manifest_path(checkpoint_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(checkpoint_dir, model, shards):
+    _write_json(_manifest_path(checkpoint_dir), {'model': model, 'shards': [list(shard) for shard in shards]})
+
+
+def resume_plan(checkpoint_dir, model_path, num_shards, restart=False):
+    """
+    The shard plan for a run: the one saved in checkpoint_dir's manifest when
+    it was made for the same model, else a fresh plan over an emptied
+    directory. Checkpoints are keyed by shard range, so a resumed run must
+    keep the saved ranges even if --shards, --workers or Max(id) changed;
+    expenses added since the plan get extra shards after the last range.
+    """
+    signature = model_signature(model_path)
+    manifest = read_manifest(checkpoint_dir)
+    if restart or manifest.get('model') != signature or 'shards' not in manifest:
+        if os.path.isdir(checkpoint_dir):
+            shutil.rmtree(checkpoint_dir)
+        shards = []
+    else:
+        shards = [tuple(shard) for shard in manifest['shards']]
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    shards += plan_shards(num_shards, after=shards[-1][1] if shards else None)
+    write_manifest(checkpoint_dir, signature, shards)
+    return shards
+
+
+def _checkpoint_path(checkpoint_dir, start, end):
+    return os.path.join(checkpoint_dir, f'shard-{start}-{end}.json')
+
+
+def read_checkpoint(checkpoint_dir, start, end):
+    try:
+        with open(_checkpoint_path(checkpoint_dir, start, end)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_checkpoint(checkpoint_dir, start, end, state):
+    _write_json(_checkpoint_path(checkpoint_dir, start, end), state)
+
+
+def apply_predictions(expenses, pipeline, batch_size=1000):
+    """Predict ai_predicted_category for expenses and write the ones that changed"""
+    predictions = pipeline.predict([expense.description for expense in expenses])
+    changed = []
+    for expense, prediction in zip(expenses, predictions):
+        if expense.ai_predicted_category != prediction:
+            expense.ai_predicted_category = prediction
+            changed.append(expense)
+    if changed:
+        Expense.objects.bulk_update(changed, ['ai_predicted_category'], batch_size=batch_size)
+        # bulk_update sends no signals; cached list responses must still revalidate
+        bump_data_versions(expense.user_id for expense in changed)
+    return len(changed)
+
+
+def rescore_shard(start, end, checkpoint_dir, batch_size=1000, pipeline=None):
+    """
+    Re-predict ai_predicted_category for expenses with start <= id < end.
+
+    Resumes after the last id recorded in the shard's checkpoint and writes a
+    new checkpoint after every batch. Returns (start, end, scanned, updated).
+    """
+    pipeline = pipeline or _pipeline
+    state = read_checkpoint(checkpoint_dir, start, end)
+    if state.get('done'):
+        return start, end, 0, 0
+
+    scanned = updated = 0
+    last_id = state.get('last_id', start - 1)
+    expenses = Expense.objects.filter(id__gt=last_id, id__lt=end).only(
+        'id', 'user_id', 'description', 'ai_predicted_category'
+    ).order_by('id')
+
+    batch = []
+
+    def flush():
+        nonlocal scanned, updated, last_id
+        scanned += len(batch)
+        updated += apply_predictions(batch, pipeline, batch_size)
+        last_id = batch[-1].id
+        write_checkpoint(checkpoint_dir, start, end, {'last_id': last_id, 'done': False})
+        batch.clear()
+
+    for expense in expenses.iterator(chunk_size=batch_size):
+        batch.append(expense)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    write_checkpoint(checkpoint_dir, start, end, {'last_id': last_id, 'done': True})
+    return start, end, scanned, updated
+
+
+def rescore_shard_task(args):
+    """Picklable entry point for Pool.imap_unordered"""
+    return rescore_shard(*args)
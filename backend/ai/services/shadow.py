@@ -0,0 +1,165 @@
+"""
+Shadow evaluation of candidate categorizers against live traffic.
+
+The primary categorizer answers every request. A sample of its answers
+is handed to a small background pool, where each candidate predicts the
+same description. Agreement with the primary, the candidate's latency
+and confidence are aggregated in ai.services.metrics (ai.shadow.*), so
+GET /api/ai/metrics/ compares a retrained model before it is promoted.
+
+The request only pays for a random draw and a non-blocking submit: when
+the pool's queue is full the sample is dropped. Candidates are built on
+the pool's thread the first time they are needed.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from django.conf import settings
+from django.utils.module_loading import import_string
+from .metrics import metrics
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+CONFIDENCE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def build_candidate(spec: str):
+    """A categorizer from a spec: a trained pipeline (.pkl/.joblib) or a dotted categorizer class"""
+    if spec.endswith(('.pkl', '.joblib')):
+        from ..models.linear_categorizer import LinearModelCategorizer
+        return LinearModelCategorizer(spec)
+    return import_string(spec)()
+
+
+def parse_candidates(entries):
+    """{name: spec} from 'name=spec' entries; a bare spec is named after itself"""
+    candidates = {}
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, spec = entry.rpartition('=')
+        candidates[name or spec] = spec
+    return candidates
+
+
+class ShadowEvaluator:
+    """Runs candidate categorizers on a sample of primary predictions, off the request path"""
+
+    def __init__(self, candidates: Dict[str, Any], sample_rate: float = 0.05, max_workers: int = 1,
+                 max_pending: int = 64, rng: Callable[[], float] = random.random):
+        # name -> categorizer instance, or a zero-argument factory / spec built on first use
+        self._candidates = dict(candidates)
+        self.sample_rate = sample_rate
+        self._rng = rng
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ai-shadow')
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._build_lock = threading.Lock()
+
+    @property
+    def candidate_names(self):
+        return list(self._candidates)
+
+    def _candidate(self, name):
+        candidate = self._candidates[name]
+        if hasattr(candidate, 'predict'):
+            return candidate
+        with self._build_lock:
+            candidate = self._candidates[name]
+            if not hasattr(candidate, 'predict'):
+                candidate = build_candidate(candidate) if isinstance(candidate, str) else candidate()
+                self._candidates[name] = candidate
+        return candidate
+
+    def submit(self, description: str, primary: Dict[str, Any], primary_ms: Optional[float] = None):
+        """Maybe queue description for the candidates; never blocks or raises. Returns the future or None"""
+        if not self._candidates or self._rng() >= self.sample_rate:
+            return None
+        if not self._pending.acquire(blocking=False):
+            metrics.increment('ai.shadow.dropped', reason='queue_full')
+            return None
+        try:
+            future = self._executor.submit(self._evaluate, description, primary, primary_ms)
+        except RuntimeError:
+            # Shut down
+            self._pending.release()
+            return None
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def _evaluate(self, description, primary, primary_ms):
+        primary_category = primary.get('predicted_category')
+        metrics.increment('ai.shadow.sampled')
+        if primary.get('confidence') is not None:
+            metrics.observe('ai.shadow.primary_confidence', primary['confidence'], buckets=CONFIDENCE_BUCKETS)
+        if primary_ms is not None:
+            metrics.observe('ai.shadow.primary_latency_ms', primary_ms, buckets=LATENCY_BUCKETS)
+
+        for name in self._candidates:
+            try:
+                candidate = self._candidate(name)
+                started = time.perf_counter()
+                result = candidate.predict(description)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            except Exception as e:
+                metrics.increment('ai.shadow.errors', candidate=name)
+                print(f"Shadow candidate {name} failed: {e}")
+                continue
+
+            category = result.get('predicted_category')
+            metrics.increment('ai.shadow.compared', candidate=name)
+            metrics.observe('ai.shadow.latency_ms', elapsed_ms, buckets=LATENCY_BUCKETS, candidate=name)
+            if result.get('confidence') is not None:
+                metrics.observe('ai.shadow.confidence', result['confidence'], buckets=CONFIDENCE_BUCKETS,
+                                candidate=name)
+            if category == primary_category:
+                metrics.increment('ai.shadow.agree', candidate=name)
+            else:
+                metrics.increment('ai.shadow.disagree', candidate=name, primary=primary_category, shadow=category)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per candidate: predictions compared and the share that agreed with the primary"""
+        report = {}
+        for name in self._candidates:
+            compared = metrics.counter('ai.shadow.compared', candidate=name)
+            agreed = metrics.counter('ai.shadow.agree', candidate=name)
+            report[name] = {
+                'compared': int(compared),
+                'agreement': round(agreed / compared, 4) if compared else None,
+                'errors': int(metrics.counter('ai.shadow.errors', candidate=name)),
+            }
+        return report
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+
+def get_shadow_evaluator() -> Optional[ShadowEvaluator]:
+    """The process-wide evaluator, or None when no candidates are configured"""
+    global _evaluator
+    if not getattr(settings, 'AI_SHADOW_CANDIDATES', None):
+        return None
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = ShadowEvaluator(
+                    parse_candidates(settings.AI_SHADOW_CANDIDATES),
+                    sample_rate=settings.AI_SHADOW_SAMPLE_RATE,
+                    max_workers=settings.AI_SHADOW_WORKERS,
+                    max_pending=settings.AI_SHADOW_MAX_PENDING,
+                )
+    return _evaluator
+
+
+def reset_shadow_evaluator():
+    """Stop the shared evaluator so the next use rebuilds it from settings"""
+    global _evaluator
+    with _evaluator_lock:
+        if _evaluator is not None:
+            _evaluator.shutdown(wait=False)
+        _evaluator = None
\ No newline at end of file
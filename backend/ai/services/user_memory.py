@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from django.conf import settings
+from expenses.models import Expense
+from expenses.text import normalize_description
+from expenses.versioning import data_version
+
+CATEGORIES = [choice[0] for choice in Expense.CATEGORY_CHOICES]
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+
+def description_key(description: str) -> int:
+    """64-bit hash of the normalized description"""
+    normalized = normalize_description(description)
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class UserDescriptionMemory:
+    """Per-user map of normalized description -> last confirmed category
+
+    Each user's map is built from the expenses whose category the user
+    chose or corrected (not auto_categorized ones, which would feed the
+    memory its own guesses) and is stamped with the user's data version.
+    A lookup checks that version with one primary-key query and reloads
+    after writes made by other processes; writes seen here are applied in
+    place. Keys are 64-bit hashes and values small category codes, so a
+    user's memory is a compact int -> int dict. Users are evicted
+    least-recently-used.
+    """
+
+    def __init__(self, max_users: int = 1000, max_entries: int = 5000):
+        self.max_users = max_users
+        self.max_entries = max_entries
+        self._users = OrderedDict()  # user_id -> (data version, entries)
+        self._lock = threading.Lock()
+
+    def _load(self, user_id) -> Dict[int, int]:
+        entries = {}
+        rows = Expense.objects.filter(user_id=user_id, auto_categorized=False).order_by('id').values_list(
+            'description', 'category'
+        )
+        for description, category in rows.iterator():
+            self._put(entries, description_key(description), CATEGORY_CODES[category])
+        return entries
+
+    def _put(self, entries, key, code):
+        # Re-inserting moves the key to the end, so the dict stays in recency order
+        entries.pop(key, None)
+        entries[key] = code
+        if len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+    def _entries(self, user_id) -> Dict[int, int]:
+        version = data_version(user_id)
+        with self._lock:
+            cached = self._users.get(user_id)
+            if cached is not None and cached[0] == version:
+                self._users.move_to_end(user_id)
+                return cached[1]
+
+        # Versioned before reading rows: a write in between only causes another reload
+        entries = self._load(user_id)
+        with self._lock:
+            self._users[user_id] = (version, entries)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return entries
+
+    def lookup(self, user_id, description: str) -> Optional[str]:
+        """Last category the user gave this (normalized) description, if any"""
+        code = self._entries(user_id).get(description_key(description))
+        return None if code is None else CATEGORIES[code]
+
+    def remember(self, user_id, description: str, category: Optional[str]):
+        """
+        Apply one expense write made in this process, after its data version
+        bump; category None records nothing (the category was not confirmed).
+        A no-op for users not currently loaded.
+        """
+        with self._lock:
+            if user_id not in self._users:
+                return
+        version = data_version(user_id)
+        with self._lock:
+            cached = self._users.get(user_id)
+            if cached is None:
+                return
+            loaded_version, entries = cached
+            if version != loaded_version + 1:
+                # Someone else wrote too; reload on the next lookup
+                del self._users[user_id]
+                return
+            if category in CATEGORY_CODES:
+                self._put(entries, description_key(description), CATEGORY_CODES[category])
+            self._users[user_id] = (version, entries)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_user_memory() -> UserDescriptionMemory:
+    """Process-wide memory sized from settings"""
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = UserDescriptionMemory(
+                    max_users=settings.AI_USER_MEMORY_MAX_USERS,
+                    max_entries=settings.AI_USER_MEMORY_MAX_ENTRIES,
+                )
+    return _memory
+
+
+def recall(user, description: str) -> Optional[Dict[str, Any]]:
+    """Prediction from the user's own history, or None"""
+    if not getattr(settings, 'AI_USER_MEMORY_ENABLED', True) or user is None or not user.is_authenticated:
+        return None
+    category = get_user_memory().lookup(user.pk, description)
+    if category is None:
+        return None
+    return {
+        'predicted_category': category,
+        'confidence': 0.95,
+        'method': 'user_history'
+    }
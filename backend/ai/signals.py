@@ -0,0 +1,28 @@
+from django.dispatch import receiver
+from expenses.signals import expense_changed
+from .columnar import get_columnar_cache
+from .recurring import get_detector
+from .services.user_memory import get_user_memory
+
+
+@receiver(expense_changed)
+def update_user_memory(sender, user_id, old, new, **kwargs):
+    memory = get_user_memory()
+    if new is None or (old is not None and old.description != new.description):
+        # Another expense may still carry the old description; rebuild lazily
+        memory.invalidate(user_id)
+    else:
+        memory.remember(user_id, new.description, None if new.auto_categorized else new.category)
+
+
+@receiver(expense_changed)
+def update_recurring(sender, user_id, old, new, created=False, **kwargs):
+    if created:
+        get_detector().add_expense(user_id, new)
+    else:
+        get_detector().invalidate(user_id)
+
+
+@receiver(expense_changed)
+def update_columnar_cache(sender, user_id, old, new, **kwargs):
+    get_columnar_cache().apply(user_id, old, new)
\ No newline at end of file
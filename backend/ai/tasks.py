@@ -0,0 +1,42 @@
+"""Background job handlers for model work (see jobs.registry)"""
+import threading
+from django.conf import settings
+from expenses.models import Expense
+from jobs.registry import register
+from .services import rescoring
+
+# (path, size, mtime) -> pipeline, so a retrained model is picked up by running workers
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def _pipeline(model_path=None):
+    model_path = model_path or str(settings.AI_ML_MODEL_PATH)
+    key = tuple(rescoring.model_signature(model_path).values())
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is None:
+            _pipelines.clear()
+            pipeline = _pipelines[key] = rescoring.load_pipeline(model_path)
+    return pipeline
+
+
+@register('ai.rescore_shard')
+def rescore_shard(job):
+    """One id-range shard of `rescore_expenses --enqueue`; resumes from its checkpoint"""
+    payload = job.payload
+    start, end, scanned, updated = rescoring.rescore_shard(
+        payload['start'], payload['end'], payload['checkpoint_dir'], payload.get('batch_size', 1000),
+        pipeline=_pipeline(payload.get('model')),
+    )
+    return {'start': start, 'end': end, 'scanned': scanned, 'updated': updated}
+
+
+@register('ai.categorize_expenses')
+def categorize_expenses(job):
+    """Set ai_predicted_category on the given expenses with the trained model, in one predict call"""
+    expenses = list(Expense.objects.filter(id__in=job.payload['expense_ids']).only(
+        'id', 'user_id', 'description', 'ai_predicted_category'
+    ).order_by('id'))
+    updated = rescoring.apply_predictions(expenses, _pipeline(job.payload.get('model'))) if expenses else 0
+    return {'scanned': len(expenses), 'updated': updated}
\ No newline at end of file
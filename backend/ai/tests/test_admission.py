@@ -0,0 +1,175 @@
+import threading
+import time
+from unittest import mock
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ai.interfaces.categorizer import CategorizerInterface
+from ai.models.cascading_categorizer import CascadingCategorizer, CascadeStage
+from ai.models.rule_based_categorizer import RuleBasedCategorizer
+from ai.services import inference_executor
+from ai.services.admission import AdmissionController, get_admission_controller, reset_admission_controller
+from ai.services.categorization_service import CategorizationService
+from ai.services.metrics import metrics
+
+User = get_user_model()
+
+class ModelStub(CategorizerInterface):
+    def predict(self, description):
+        return {'predicted_category': 'travel', 'confidence': 0.95, 'method': 'stub_model'}
+
+    def get_supported_categories(self):
+        return ['travel']
+
+class BusyLanguageModel(CategorizerInterface):
+    """Answers like SmolVLMCategorizer when all inference slots are taken"""
+    def predict(self, description):
+        return {'predicted_category': 'other', 'confidence': 0.4, 'method': 'default_enhanced',
+                'degraded': True, 'degradation_reason': 'lm_busy'}
+
+    def get_supported_categories(self):
+        return ['other']
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class AdmissionControllerTestCase(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_client_bucket_limits_and_refills(self):
+        clock = FakeClock()
+        controller = AdmissionController(client_rate=1.0, client_burst=2, global_rate=100, global_burst=100, clock=clock)
+        self.assertIsNone(controller.admit('user:1'))
+        self.assertIsNone(controller.admit('user:1'))
+        self.assertEqual(controller.admit('user:1'), 'client_rate_limited')
+        # Other clients have their own bucket
+        self.assertIsNone(controller.admit('user:2'))
+        clock.now += 1.0
+        self.assertIsNone(controller.admit('user:1'))
+        self.assertEqual(metrics.counter('ai.admission.shed', reason='client_rate_limited'), 1)
+        self.assertEqual(metrics.counter('ai.admission.admitted'), 4)
+
+    def test_global_bucket(self):
+        controller = AdmissionController(client_rate=100, client_burst=100, global_rate=0.1, global_burst=2,
+                                         clock=FakeClock())
+        self.assertIsNone(controller.admit('user:1'))
+        self.assertIsNone(controller.admit('user:2'))
+        self.assertEqual(controller.admit('user:3'), 'global_rate_limited')
+        self.assertEqual(controller.admit(None), 'global_rate_limited')
+
+    def test_clients_evicted(self):
+        controller = AdmissionController(client_rate=0, client_burst=1, global_rate=100, global_burst=100,
+                                         max_clients=2, clock=FakeClock())
+        for key in ('a', 'b', 'c'):
+            self.assertIsNone(controller.admit(key))
+        self.assertEqual(list(controller._clients), ['b', 'c'])
+
+    def test_lm_slots_do_not_wait(self):
+        controller = AdmissionController(max_lm_concurrency=1)
+        with controller.lm_slot() as first:
+            with controller.lm_slot() as second:
+                self.assertTrue(first)
+                self.assertFalse(second)
+        with controller.lm_slot() as again:
+            self.assertTrue(again)
+        self.assertEqual(metrics.counter('ai.admission.shed', reason='lm_busy'), 1)
+
+    def test_cascade_reports_shed_language_model(self):
+        cascade = CascadingCategorizer([
+            CascadeStage('rule_based', RuleBasedCategorizer(), min_confidence=0.8),
+            CascadeStage('language_model', BusyLanguageModel()),
+        ], budget_ms=10000)
+        result = cascade.predict('Something unusual')
+        self.assertTrue(result['degraded'])
+        self.assertEqual(result['degradation_reason'], 'lm_busy')
+        self.assertEqual(result['cascade_stage'], 'rule_based')
+        self.assertEqual(result['cascade_trace'][-1]['outcome'], 'shed')
+        # Not cached, so the next request can still reach the model
+        self.assertNotEqual(cascade.predict('Something unusual')['cascade_stage'], 'cache')
+
+@override_settings(AI_ADMISSION_CLIENT_RATE=0.0, AI_ADMISSION_CLIENT_BURST=1)
+class ServiceDegradationTestCase(TestCase):
+    def setUp(self):
+        reset_admission_controller()
+        metrics.reset()
+        self.user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+
+    def tearDown(self):
+        reset_admission_controller()
+
+    def _model_service(self):
+        return mock.patch.object(CategorizationService, '_default_categorizer', staticmethod(lambda: ModelStub()))
+
+    def test_sheds_to_keywords(self):
+        service = CategorizationService(ModelStub())
+        self.assertEqual(service.categorize('Trotro fare', user=self.user)['method'], 'stub_model')
+        result = service.categorize('Trotro fare', user=self.user)
+        self.assertEqual(result['predicted_category'], 'transport')
+        self.assertEqual(result['method'], 'rule_based')
+        self.assertTrue(result['degraded'])
+        self.assertEqual(result['degradation_reason'], 'client_rate_limited')
+
+    def test_keyword_categorizer_never_shed(self):
+        service = CategorizationService(RuleBasedCategorizer())
+        for _ in range(3):
+            self.assertNotIn('degraded', service.categorize('Trotro fare', user=self.user))
+        self.assertEqual(metrics.counter('ai.admission.admitted'), 0)
+
+    def test_endpoint_reports_degradation(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        get_admission_controller().admit(f'user:{self.user.pk}')
+        with self._model_service():
+            response = client.post(reverse('categorize-expense'), {'description': 'ECG bill'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['predicted_category'], 'bills')
+        self.assertEqual(response.data['degradation_reason'], 'client_rate_limited')
+
+    def test_metrics_endpoint_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        self.assertEqual(client.get(reverse('ai-metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        metrics.increment('ai.admission.shed', reason='client_rate_limited')
+        response = client.get(reverse('ai-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['counters']['ai.admission.shed{reason=client_rate_limited}'], 1)
+
+@override_settings(AI_INFERENCE_WORKERS=1, AI_INFERENCE_MAX_PENDING=1)
+class InferenceQueueTestCase(SimpleTestCase):
+    def setUp(self):
+        inference_executor.shutdown_executor()
+
+    def tearDown(self):
+        inference_executor.shutdown_executor()
+
+    def test_full_queue_degrades(self):
+        release = threading.Event()
+
+        def blocking_predict(description):
+            release.wait(5)
+            return {'predicted_category': 'travel', 'confidence': 0.9, 'method': 'slow_model'}
+
+        worker = threading.Thread(target=inference_executor.categorize, args=(blocking_predict, 'Flight', 5))
+        worker.start()
+        time.sleep(0.05)
+        result = inference_executor.categorize(blocking_predict, 'Taxi to the airport', timeout=5)
+        self.assertEqual(result['degradation_reason'], 'overloaded')
+        self.assertEqual(result['predicted_category'], 'transport')
+        release.set()
+        worker.join()
+        # The slot is released by the job's done callback, just after its result
+        for _ in range(50):
+            result = inference_executor.categorize(lambda d: {'predicted_category': 'food', 'method': 'stub'}, 'Waakye')
+            if not result.get('degraded'):
+                break
+            time.sleep(0.01)
+        self.assertEqual(result['method'], 'stub')
\ No newline at end of file
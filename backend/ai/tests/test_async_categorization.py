@@ -0,0 +1,92 @@
+import time
+from django.test import TestCase, AsyncClient, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from ai.services import inference_executor
+
+User = get_user_model()
+
+def slow_predict(description):
+    time.sleep(0.5)
+    return {'predicted_category': 'travel', 'confidence': 0.99, 'method': 'slow_model'}
+
+def failing_predict(description):
+    raise RuntimeError('model crashed')
+
+class InferenceExecutorTestCase(TestCase):
+    """Offloaded inference must degrade to keywords instead of hanging"""
+
+    def test_fast_prediction_passes_through(self):
+        result = inference_executor.categorize(lambda d: {'predicted_category': 'food', 'confidence': 0.9, 'method': 'stub'}, 'waakye')
+        self.assertEqual(result['method'], 'stub')
+        self.assertNotIn('degraded', result)
+
+    def test_timeout_degrades_to_keyword_fallback(self):
+        result = inference_executor.categorize(slow_predict, 'Waakye at chop bar', timeout=0.05)
+        self.assertEqual(result['predicted_category'], 'food')
+        self.assertEqual(result['method'], 'rule_based')
+        self.assertTrue(result['degraded'])
+        self.assertEqual(result['degradation_reason'], 'timeout')
+
+    def test_error_degrades_to_keyword_fallback(self):
+        result = inference_executor.categorize(failing_predict, 'Trotro fare')
+        self.assertEqual(result['predicted_category'], 'transport')
+        self.assertEqual(result['degradation_reason'], 'error')
+
+    async def test_async_timeout_degrades(self):
+        result = await inference_executor.acategorize(slow_predict, 'ECG bill', timeout=0.05)
+        self.assertEqual(result['predicted_category'], 'bills')
+        self.assertTrue(result['degraded'])
+
+class AsyncCategorizeViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    async def test_categorize_async_endpoint(self):
+        response = await AsyncClient().post(
+            reverse('categorize-expense-async'),
+            {'description': 'Waakye at chop bar'},
+            content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['predicted_category'], 'food')
+
+    async def test_categorize_async_requires_description(self):
+        response = await AsyncClient().post(
+            reverse('categorize-expense-async'), {}, content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_categorize_async_requires_authentication(self):
+        response = await AsyncClient().post(
+            reverse('categorize-expense-async'),
+            {'description': 'Waakye'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_demo_categorize_async(self):
+        response = await AsyncClient().post(
+            reverse('demo_categorize_async'),
+            {'description': 'Trotro to Kotoka', 'model': 'smol_vlm'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['method'], 'smol_vlm')
+
+    @override_settings(AI_INFERENCE_TIMEOUT=0.0)
+    async def test_demo_categorize_async_degrades_on_timeout(self):
+        response = await AsyncClient().post(
+            reverse('demo_categorize_async'),
+            {'description': 'Trotro to Kotoka'},
+            content_type='application/json'
+        )
+        self.assertTrue(response.json()['degraded'])
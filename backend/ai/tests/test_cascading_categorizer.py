@@ -0,0 +1,116 @@
+import time
+from django.test import SimpleTestCase, override_settings
+from ai.interfaces.categorizer import CategorizerInterface
+from ai.models.cascading_categorizer import CascadingCategorizer, CascadeStage, build_default_cascade
+from ai.models.rule_based_categorizer import RuleBasedCategorizer
+from ai.services.categorization_service import CategorizationService
+
+class StubCategorizer(CategorizerInterface):
+    def __init__(self, category, confidence, delay=0.0):
+        self.category = category
+        self.confidence = confidence
+        self.delay = delay
+        self.calls = 0
+
+    def predict(self, description):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return {'predicted_category': self.category, 'confidence': self.confidence, 'method': f'stub_{self.category}'}
+
+    def get_supported_categories(self):
+        return [self.category]
+
+class CascadingCategorizerTestCase(SimpleTestCase):
+    def test_confident_first_stage_answers(self):
+        expensive = StubCategorizer('travel', 0.9)
+        cascade = CascadingCategorizer([
+            CascadeStage('rule_based', RuleBasedCategorizer(), min_confidence=0.8),
+            CascadeStage('language_model', expensive),
+        ])
+        result = cascade.predict('Waakye at chop bar')
+        self.assertEqual(result['predicted_category'], 'food')
+        self.assertEqual(result['cascade_stage'], 'rule_based')
+        self.assertEqual(result['cascade_reason'], 'confident')
+        self.assertEqual(expensive.calls, 0)
+
+    def test_low_confidence_escalates(self):
+        cascade = CascadingCategorizer([
+            CascadeStage('rule_based', RuleBasedCategorizer(), min_confidence=0.8),
+            CascadeStage('ml_linear', StubCategorizer('shopping', 0.4), min_confidence=0.6),
+            CascadeStage('language_model', StubCategorizer('education', 0.7)),
+        ])
+        result = cascade.predict('Unknown vendor xyz')
+        self.assertEqual(result['predicted_category'], 'education')
+        self.assertEqual(result['cascade_stage'], 'language_model')
+        self.assertEqual([step['outcome'] for step in result['cascade_trace']],
+                         ['low_confidence', 'low_confidence', 'accepted'])
+
+    def test_budget_skips_expensive_stage(self):
+        expensive = StubCategorizer('education', 0.9)
+        cascade = CascadingCategorizer([
+            CascadeStage('ml_linear', StubCategorizer('shopping', 0.4), min_confidence=0.6),
+            CascadeStage('language_model', expensive, expected_ms=1000),
+        ], budget_ms=50)
+        result = cascade.predict('Unknown vendor xyz')
+        self.assertEqual(result['predicted_category'], 'shopping')
+        self.assertEqual(result['cascade_reason'], 'budget_exhausted')
+        self.assertEqual(expensive.calls, 0)
+
+        # A larger per-request budget lets the same request escalate
+        result = cascade.predict('Unknown vendor xyz', budget_ms=5000)
+        self.assertEqual(result['cascade_stage'], 'language_model')
+
+    def test_stage_recovers_after_one_slow_call(self):
+        language_model = StubCategorizer('education', 0.9)
+        stage = CascadeStage('language_model', language_model, expected_ms=250)
+        cascade = CascadingCategorizer([
+            CascadeStage('ml_linear', StubCategorizer('shopping', 0.4), min_confidence=0.6),
+            stage,
+        ], budget_ms=500, cache_size=0)
+
+        # A 2s cold start pushes the estimate past the budget
+        stage.observe(2000)
+        self.assertGreater(stage.expected_ms, 500)
+        self.assertEqual(cascade.predict('Unknown vendor xyz')['cascade_reason'], 'budget_exhausted')
+
+        for _ in range(20):
+            if cascade.predict('Unknown vendor xyz')['cascade_stage'] == 'language_model':
+                break
+        self.assertEqual(language_model.calls, 1)
+        # Measured fast again, so it keeps running
+        self.assertEqual(cascade.predict('Unknown vendor xyz')['cascade_stage'], 'language_model')
+
+    def test_cache_serves_repeated_descriptions(self):
+        stage = StubCategorizer('food', 0.9)
+        cascade = CascadingCategorizer([CascadeStage('ml_linear', stage, min_confidence=0.6)])
+        cascade.predict('Waakye  at chop bar')
+        result = cascade.predict('waakye at CHOP bar')
+        self.assertEqual(result['cascade_stage'], 'cache')
+        self.assertEqual(result['predicted_category'], 'food')
+        self.assertEqual(stage.calls, 1)
+
+    def test_failing_stage_is_skipped(self):
+        class Broken(StubCategorizer):
+            def predict(self, description):
+                raise RuntimeError('boom')
+
+        cascade = CascadingCategorizer([
+            CascadeStage('broken', Broken('food', 1.0)),
+            CascadeStage('rule_based', RuleBasedCategorizer()),
+        ])
+        result = cascade.predict('Trotro fare')
+        self.assertEqual(result['cascade_stage'], 'rule_based')
+        self.assertEqual(result['cascade_trace'][0]['outcome'], 'error')
+
+    def test_default_cascade_uses_linear_model(self):
+        cascade = build_default_cascade()
+        result = cascade.predict('kaneshie market')
+        self.assertIn(result['cascade_stage'], ['rule_based', 'ml_linear'])
+        self.assertIn('food', cascade.get_supported_categories())
+
+    @override_settings(AI_CASCADE_ENABLED=True)
+    def test_service_uses_cascade_when_enabled(self):
+        result = CategorizationService().categorize('Banku and tilapia')
+        self.assertEqual(result['predicted_category'], 'food')
+        self.assertIn('cascade_stage', result)
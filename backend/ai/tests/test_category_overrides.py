@@ -0,0 +1,131 @@
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense, CategoryCorrection
+from expenses.signals import expense_changed
+from datetime import date
+
+User = get_user_model()
+
+class CategoryOverrideTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.expense = Expense.objects.create(
+            user=self.user,
+            amount=25.50,
+            description='Silverbird movie night',
+            category='shopping',
+            ai_predicted_category='shopping',
+            date=date.today()
+        )
+
+    def test_override_issues_targeted_update_and_logs_correction(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('override-ai-category'), {
+                'expense_id': self.expense.id, 'category': 'entertainment'
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['old_category'], 'shopping')
+
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "expenses_expense"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"description"', updates[0])
+
+        correction = CategoryCorrection.objects.get()
+        self.assertEqual(correction.expense_id, self.expense.id)
+        self.assertEqual(correction.predicted_category, 'shopping')
+        self.assertEqual(correction.corrected_category, 'entertainment')
+        self.assertEqual(correction.model_version, 'rule_based-1')
+
+    def test_override_to_same_category_is_not_logged(self):
+        response = self.client.post(reverse('override-ai-category'), {
+            'expense_id': self.expense.id, 'category': 'shopping'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(CategoryCorrection.objects.exists())
+
+    def test_override_that_keeps_losing_races_is_a_conflict(self):
+        # Every guarded UPDATE matches no row, as if another write always got there first
+        with patch('django.db.models.query.QuerySet.update', return_value=0):
+            response = self.client.post(reverse('override-ai-category'), {
+                'expense_id': self.expense.id, 'category': 'entertainment'
+            })
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['current_category'], 'shopping')
+        self.assertFalse(CategoryCorrection.objects.exists())
+
+    def test_override_other_users_expense_not_found(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(reverse('override-ai-category'), {
+            'expense_id': self.expense.id, 'category': 'food'
+        })
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_override(self):
+        second = Expense.objects.create(
+            user=self.user, amount=10, description='Waakye', category='other',
+            ai_predicted_category='food', date=date.today()
+        )
+        response = self.client.post(reverse('bulk-override-ai-category'), {'overrides': [
+            {'expense_id': self.expense.id, 'category': 'entertainment'},
+            {'expense_id': second.id, 'category': 'food'},
+            {'expense_id': 99999, 'category': 'food'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(response.data['not_found'], [99999])
+        self.assertEqual(Expense.objects.get(id=second.id).category, 'food')
+        self.assertEqual(CategoryCorrection.objects.count(), 2)
+
+    def test_bulk_override_notifies_with_values_read_under_the_lock(self):
+        received = []
+        def listener(sender, old, new, **kwargs):
+            received.append((old.category, new.category))
+        expense_changed.connect(listener)
+        self.addCleanup(expense_changed.disconnect, listener)
+        # The old category must come from the locking read, not an earlier unlocked one
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('bulk-override-ai-category'), {'overrides': [
+                {'expense_id': self.expense.id, 'category': 'entertainment'},
+            ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reads = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and '"expenses_expense"."category"' in q['sql']]
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(received, [('shopping', 'entertainment')])
+        self.assertEqual(CategoryCorrection.objects.get().predicted_category, 'shopping')
+
+    def test_bulk_override_rejects_invalid_category(self):
+        response = self.client.post(reverse('bulk-override-ai-category'), {'overrides': [
+            {'expense_id': self.expense.id, 'category': 'gadgets'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_corrections_keeps_latest_label(self):
+        self.client.post(reverse('override-ai-category'), {'expense_id': self.expense.id, 'category': 'food'})
+        self.client.post(reverse('override-ai-category'), {'expense_id': self.expense.id, 'category': 'entertainment'})
+
+        out, err = StringIO(), StringIO()
+        call_command('export_corrections', stdout=out, stderr=err)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines, ['description,category', 'Silverbird movie night,entertainment'])
+
+        last_id = CategoryCorrection.objects.order_by('-id').first().id
+        self.assertIn(f'next --since-id {last_id}', err.getvalue())
+
+        out = StringIO()
+        call_command('export_corrections', since_id=last_id, stdout=out, stderr=StringIO())
+        self.assertEqual(out.getvalue().splitlines(), ['description,category'])
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from expenses.versioning import bump_data_versions
+from ai.insights import InsightsGenerator
+from ai.columnar import ColumnarInsightsGenerator, ColumnarCache, get_columnar_cache
+
+User = get_user_model()
+
+class ColumnarInsightsTestCase(TestCase):
+    def setUp(self):
+        get_columnar_cache().clear()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        today = date.today()
+        for offset, amount, category in [
+            (0, '25.50', 'food'), (0, '500.00', 'shopping'), (1, '12.75', 'food'), (2, '18.50', 'transport'),
+            (5, '16.75', 'transport'), (9, '40.00', 'bills'), (20, '22.10', 'food'), (40, '30.00', 'food'),
+        ]:
+            Expense.objects.create(user=self.user, amount=Decimal(amount), description=f'{category} spend',
+                                   category=category, date=today - timedelta(days=offset))
+
+    maxDiff = None
+
+    def _assert_backends_agree(self):
+        orm = InsightsGenerator(self.user)
+        columnar = ColumnarInsightsGenerator(self.user)
+        expected, actual = orm.get_monthly_summary(), columnar.get_monthly_summary()
+        # Database AVG goes through a float, so compare it approximately
+        self.assertAlmostEqual(float(actual.pop('average_expense')), float(expected.pop('average_expense')))
+        self.assertEqual(actual, expected)
+        self.assertEqual(columnar.get_top_categories(days=60), orm.get_top_categories(days=60))
+        self.assertEqual(columnar.detect_anomalies(), orm.detect_anomalies())
+        self.assertEqual(columnar.get_spending_trends(), orm.get_spending_trends())
+
+    def test_matches_orm_backend(self):
+        self._assert_backends_agree()
+
+    def test_writes_are_applied_without_reloading(self):
+        ColumnarInsightsGenerator(self.user)
+        expense = Expense.objects.create(user=self.user, amount=Decimal('7.25'), description='Kelewele',
+                                         category='food', date=date.today())
+        expense.amount = Decimal('9.00')
+        expense.save()
+        Expense.objects.filter(category='bills').get().delete()
+
+        # Only the data version check
+        with self.assertNumQueries(1):
+            summary = ColumnarInsightsGenerator(self.user).get_monthly_summary(2000, 1)
+        self.assertEqual(summary['total_expenses'], 0)
+        self._assert_backends_agree()
+
+    def test_cache_evicts_by_rows(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        Expense.objects.create(user=other, amount=1, description='x', category='other', date=date.today())
+        cache = ColumnarCache(max_rows=8)
+        cache.get(self.user)
+        cache.get(other)
+        with self.assertNumQueries(2):
+            cache.get(self.user)
+
+    def test_writes_from_other_processes_are_reloaded(self):
+        ColumnarInsightsGenerator(self.user)
+        # A queryset update, or a write in another worker: no expense_changed here
+        Expense.objects.filter(category='shopping').update(category='travel')
+        bump_data_versions([self.user.pk])
+        self._assert_backends_agree()
+        top = ColumnarInsightsGenerator(self.user).get_top_categories(days=60)
+        self.assertEqual(top[0]['category'], 'travel')
\ No newline at end of file
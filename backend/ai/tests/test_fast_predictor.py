@@ -0,0 +1,57 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.test import SimpleTestCase
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from ai.services.rescoring import load_pipeline
+
+ml_pipeline_path = os.path.join(settings.BASE_DIR.parent, 'ml_pipeline')
+sys.path.insert(0, ml_pipeline_path)
+
+from fast_predictor import FastLinearPredictor
+
+class FastLinearPredictorTestCase(SimpleTestCase):
+    """The fast path must reproduce Pipeline.predict / predict_proba exactly"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pipeline = load_pipeline(settings.AI_ML_MODEL_PATH)
+        data = pd.read_csv(os.path.join(ml_pipeline_path, 'data', 'ghana_expenses.csv'))
+        cls.descriptions = list(data['description'][:500]) + [
+            '', 'zzz qqq unknown', 'WAAKYE!! waakye waakye', 'Trotro fare to Kotoka Airport',
+        ]
+
+    def _assert_matches(self, pipeline, descriptions):
+        fast = FastLinearPredictor(pipeline)
+        expected_labels = pipeline.predict(descriptions)
+        expected_proba = pipeline.predict_proba(descriptions)
+
+        np.testing.assert_allclose(fast.predict_proba(descriptions), expected_proba, rtol=0, atol=1e-12)
+        batch = fast.predict_batch(descriptions)
+        self.assertEqual([label for label, _ in batch], list(expected_labels))
+
+        for description, label, proba in zip(descriptions, expected_labels, expected_proba):
+            category, confidence, _ = fast.predict_one(description)
+            self.assertEqual(category, label)
+            self.assertAlmostEqual(confidence, proba.max(), places=12)
+
+    def test_matches_trained_pipeline(self):
+        self.assertTrue(FastLinearPredictor.supports(self.pipeline))
+        self._assert_matches(self.pipeline, self.descriptions)
+
+    def test_matches_sublinear_binary_problem(self):
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(sublinear_tf=True, norm='l1')),
+            ('classifier', LogisticRegression(random_state=42))
+        ])
+        pipeline.fit(['waakye lunch', 'kenkey dinner', 'trotro fare', 'taxi fare bolt'],
+                     ['food', 'food', 'transport', 'transport'])
+        self._assert_matches(pipeline, ['waakye', 'taxi taxi fare', 'nothing known', 'kenkey trotro'])
+
+    def test_empty_batch(self):
+        self.assertEqual(FastLinearPredictor(self.pipeline).predict_batch([]), [])
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from expenses.versioning import bump_data_versions
+from ai.forecasting import exponential_smoothing, get_forecast, build_forecast
+
+User = get_user_model()
+
+class ForecastTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _spend_daily(self, start, end, category, amount):
+        day = start
+        expenses = []
+        while day <= end:
+            expenses.append(Expense(user=self.user, amount=amount, description='spend', category=category, date=day))
+            day += timedelta(days=1)
+        Expense.objects.bulk_create(expenses)
+
+    def test_exponential_smoothing_matches_recursive_definition(self):
+        series = np.random.default_rng(0).random((3, 50))
+        level = series[:, 0].copy()
+        for column in range(1, series.shape[1]):
+            level = 0.2 * series[:, column] + 0.8 * level
+        np.testing.assert_allclose(exponential_smoothing(series, 0.2), level)
+
+    def test_steady_spending_projects_linearly(self):
+        today = date(2024, 3, 10)
+        self._spend_daily(date(2023, 1, 1), today, 'food', 10)
+
+        forecast = build_forecast(self.user, today)
+        self.assertEqual(forecast['month'], '2024-03')
+        self.assertEqual(forecast['next_month'], '2024-04')
+        food = forecast['by_category'][0]
+        self.assertEqual(food['category'], 'food')
+        self.assertEqual(food['spent_to_date'], 100.0)
+        self.assertAlmostEqual(food['projected_month_end'], 310.0, places=2)
+        self.assertAlmostEqual(food['projected_next_month'], 300.0, places=2)
+        self.assertEqual(len(forecast['by_category']), 1)
+
+    def test_seasonal_months_raise_projection(self):
+        today = date(2024, 11, 30)
+        self._spend_daily(date(2022, 1, 1), today, 'bills', 5)
+        # Spending doubles every December
+        self._spend_daily(date(2022, 12, 1), date(2022, 12, 31), 'bills', 5)
+        self._spend_daily(date(2023, 12, 1), date(2023, 12, 31), 'bills', 5)
+
+        bills = build_forecast(self.user, today)['by_category'][0]
+        self.assertGreater(bills['projected_next_month'], 31 * 5 * 1.4)
+
+    def test_endpoint_is_cached_until_expenses_change(self):
+        today = date.today()
+        Expense.objects.create(user=self.user, amount=30, description='Waakye', category='food', date=today)
+
+        response = self.client.get(reverse('get-forecast'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total']['spent_to_date'], 30.0)
+
+        # Only the data version lookup
+        with self.assertNumQueries(1):
+            get_forecast(self.user)
+
+        Expense.objects.create(user=self.user, amount=20, description='Trotro', category='transport', date=today)
+        response = self.client.get(reverse('get-forecast'))
+        self.assertEqual(response.data['total']['spent_to_date'], 50.0)
+
+    def test_writes_without_signals_are_seen(self):
+        today = date.today()
+        expense = Expense.objects.create(user=self.user, amount=30, description='Waakye', category='food', date=today)
+        self.assertEqual(get_forecast(self.user)['total']['spent_to_date'], 30.0)
+
+        # As a job or another worker would: the row changes and the version moves, no signal here
+        Expense.objects.filter(id=expense.id).update(amount=45)
+        bump_data_versions([self.user.pk])
+        self.assertEqual(get_forecast(self.user)['total']['spent_to_date'], 45.0)
+
+    def test_user_without_expenses(self):
+        response = self.client.get(reverse('get-forecast'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['by_category'], [])
+        self.assertEqual(response.data['total']['projected_month_end'], 0.0)
\ No newline at end of file
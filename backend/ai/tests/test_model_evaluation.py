@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import tempfile
+import pandas as pd
+from django.conf import settings
+from django.test import SimpleTestCase
+
+ml_pipeline_path = os.path.join(settings.BASE_DIR.parent, 'ml_pipeline')
+sys.path.insert(0, ml_pipeline_path)
+
+from model_evaluation import DEFAULT_PARAMS, build_pipeline, cross_validate, evaluate, report_path, save_report
+
+GRID = {'tfidf__max_features': [200, None], 'classifier__C': [1.0]}
+
+class ModelEvaluationTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        data = pd.read_csv(os.path.join(ml_pipeline_path, 'data', 'ghana_expenses.csv'))[:600]
+        cls.X, cls.y = data['description'], data['category']
+
+    def test_default_pipeline_matches_the_trained_settings(self):
+        params = build_pipeline().get_params()
+        for name, value in DEFAULT_PARAMS.items():
+            self.assertEqual(params[name], value)
+        self.assertEqual(params['classifier__random_state'], 42)
+
+    def test_search_report_is_reproducible(self):
+        pipeline, report = evaluate(self.X, self.y, param_grid=GRID, folds=3, n_jobs=1, latency_rows=20)
+        _, again = evaluate(self.X, self.y, param_grid=GRID, folds=3, n_jobs=1, latency_rows=20)
+        # Everything but the timings
+        scores = lambda search: [(c['params'], c['mean_score'], c['std_score']) for c in search['top']]
+        self.assertEqual(scores(report['search']), scores(again['search']))
+        self.assertEqual(report['search']['best_params'], again['search']['best_params'])
+        self.assertEqual(report['cross_validation'], again['cross_validation'])
+
+        self.assertEqual(report['search']['candidates'], 2)
+        self.assertIn(report['params']['tfidf__max_features'], (200, None))
+        cv = report['cross_validation']
+        self.assertEqual(len(cv['fold_accuracy']), 3)
+        self.assertEqual(set(cv['per_category']), set(self.y))
+        self.assertEqual(sum(scores['support'] for scores in cv['per_category'].values()), len(self.y))
+        # Nested: every fold searched again on its own training rows
+        self.assertEqual(len(cv['fold_params']), 3)
+        self.assertTrue(all(params['tfidf__max_features'] in (200, None) for params in cv['fold_params']))
+        self.assertGreater(report['size']['bytes'], 0)
+        self.assertEqual(report['latency']['rows'], 20)
+        self.assertIn('fast_predictor', report['latency'])
+        # The refitted model is the one measured
+        self.assertEqual(len(pipeline.named_steps['tfidf'].vocabulary_), report['size']['vocabulary'])
+
+    def test_scores_are_out_of_fold(self):
+        # Labels unrelated to the text are memorised in training but not predictable
+        shuffled = self.y.sample(frac=1, random_state=0).reset_index(drop=True)
+        pipeline = build_pipeline({'classifier__C': 100.0})
+        self.assertGreater(pipeline.fit(self.X, shuffled).score(self.X, shuffled), 0.5)
+        self.assertLess(cross_validate(pipeline, self.X, shuffled, folds=3, n_jobs=1)['accuracy'], 0.3)
+
+    def test_report_is_saved_next_to_the_model(self):
+        _, report = evaluate(self.X, self.y, search=False, folds=3, n_jobs=1, latency_rows=10)
+        self.assertNotIn('search', report)
+        self.assertNotIn('fold_params', report['cross_validation'])
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = os.path.join(directory, 'ghana_expense_categorizer.pkl')
+            path = save_report(report, model_path)
+            self.assertEqual(path, os.path.join(directory, 'ghana_expense_categorizer.eval.json'))
+            self.assertEqual(path, report_path(model_path))
+            with open(path) as f:
+                self.assertEqual(json.load(f)['cross_validation'], report['cross_validation'])
\ No newline at end of file
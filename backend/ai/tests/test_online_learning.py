@@ -0,0 +1,124 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from expenses.models import Expense, CategoryCorrection
+from ai.models.online_categorizer import OnlineCategorizer
+from ai.services.online_learning import OnlineLearner, ModelRegistry, try_update
+from datetime import date
+
+User = get_user_model()
+
+SEED_ROWS = [
+    ('waakye at chop bar', 'food'), ('kenkey and fish', 'food'), ('jollof rice lunch', 'food'),
+    ('trotro fare', 'transport'), ('bolt ride', 'transport'), ('goil fuel', 'transport'),
+    ('ecg bill', 'bills'), ('mtn airtime', 'bills'), ('rent payment', 'bills'),
+] * 10
+
+class OnlineLearningTestCase(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.model_dir = tmp.name
+        self.seed_path = os.path.join(self.model_dir, 'seed.csv')
+        with open(self.seed_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['description', 'category'])
+            writer.writerows(SEED_ROWS)
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+
+    def _learn(self, **options):
+        out = StringIO()
+        call_command('learn_from_corrections', model_dir=self.model_dir, seed_data=self.seed_path,
+                     stdout=out, **options)
+        return out.getvalue()
+
+    def _correct(self, description, category, count):
+        for _ in range(count):
+            expense = Expense.objects.create(
+                user=self.user, amount=10, description=description, category=category, date=date.today()
+            )
+            CategoryCorrection.objects.create(
+                expense=expense, user=self.user, predicted_category='other', corrected_category=category
+            )
+
+    def test_bootstrap_then_learn_new_vocabulary(self):
+        output = self._learn()
+        self.assertIn('Bootstrapped online model v1', output)
+
+        categorizer = OnlineCategorizer(self.model_dir, reload_interval=0)
+        self.assertEqual(categorizer.version, 1)
+        self.assertEqual(categorizer.predict('waakye')['predicted_category'], 'food')
+
+        self._correct('azonto fest ticket', 'entertainment', 30)
+        output = self._learn(batch_size=16)
+        self.assertIn('Published v2', output)
+
+        # The running categorizer picks up the new version without a restart
+        result = categorizer.predict('azonto fest ticket')
+        self.assertGreater(categorizer.version, 1)
+        self.assertEqual(result['predicted_category'], 'entertainment')
+        self.assertTrue(result['model_version'].startswith('online-v'))
+
+        # Consumed corrections are not learned twice
+        self.assertIn('0 version(s) published', self._learn())
+
+    def test_refused_batches_are_retried(self):
+        self._learn()
+        for description, _ in SEED_ROWS[:9]:
+            self._correct(description, 'travel', 4)
+        output = self._learn(batch_size=64)
+        self.assertIn('Refused batch', output)
+        self.assertIn('1 batch(es) refused', output)
+
+        # The refused corrections were not consumed for good: a later run
+        # (here with a looser guard) learns from them
+        output = self._learn(batch_size=64, tolerance=1.0)
+        self.assertIn('1 version(s) published, 0 batch(es) refused', output)
+        self.assertIn('0 version(s) published, 0 batch(es) refused', self._learn())
+
+    def test_concurrent_run_is_refused(self):
+        self._learn()
+        with ModelRegistry(self.model_dir).lock():
+            with self.assertRaises(CommandError):
+                self._learn()
+
+    def test_update_refused_when_holdout_accuracy_drops(self):
+        learner = OnlineLearner().partial_fit([d for d, _ in SEED_ROWS], [c for _, c in SEED_ROWS])
+        holdout = ([d for d, _ in SEED_ROWS[:9]], [c for _, c in SEED_ROWS[:9]])
+        poisoned = ([d for d, _ in SEED_ROWS] * 5, ['travel'] * len(SEED_ROWS) * 5)
+
+        accepted, kept, old_accuracy, new_accuracy = try_update(learner, *poisoned, holdout)
+        self.assertFalse(accepted)
+        self.assertIs(kept, learner)
+        self.assertLess(new_accuracy, old_accuracy)
+
+    def test_registry_publish_is_versioned(self):
+        registry = ModelRegistry(self.model_dir)
+        self.assertIsNone(registry.current())
+        learner = OnlineLearner().partial_fit(['waakye'], ['food'])
+        self.assertEqual(registry.publish(learner)['version'], 1)
+        self.assertEqual(registry.publish(learner, accuracy=0.5)['version'], 2)
+        meta, loaded = registry.load_current()
+        self.assertEqual(meta['accuracy'], 0.5)
+        self.assertEqual(loaded.examples_seen, 1)
+
+    def test_registry_prunes_old_versions(self):
+        registry = ModelRegistry(self.model_dir, keep_versions=2)
+        learner = OnlineLearner().partial_fit(['waakye'], ['food'])
+        for _ in range(4):
+            registry.publish(learner)
+        self.assertEqual(registry.versions(), [3, 4])
+        self.assertEqual(registry.load_current()[0]['version'], 4)
+
+    def test_categorizer_without_published_model(self):
+        result = OnlineCategorizer(os.path.join(self.model_dir, 'missing')).predict('waakye')
+        self.assertEqual(result['method'], 'online_unavailable')
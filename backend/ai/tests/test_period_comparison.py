@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from ai.insights import InsightsGenerator
+
+User = get_user_model()
+
+class PeriodComparisonTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        for day, category, amount in [
+            (date(2023, 3, 10), 'food', '80.00'),
+            (date(2024, 1, 5), 'food', '100.00'),
+            (date(2024, 1, 20), 'transport', '40.00'),
+            (date(2024, 2, 3), 'food', '150.00'),
+            # No transport in February; March follows a gap for bills
+            (date(2024, 3, 8), 'food', '120.00'),
+            (date(2024, 3, 9), 'transport', '10.00'),
+            (date(2023, 12, 1), 'bills', '60.00'),
+            (date(2024, 3, 1), 'bills', '90.00'),
+        ]:
+            Expense.objects.create(user=self.user, amount=Decimal(amount), description='x', category=category, date=day)
+        self.generator = InsightsGenerator(self.user)
+
+    def _categories(self, period):
+        return {item['category']: item for item in period['by_category']}
+
+    def test_month_over_month(self):
+        with self.assertNumQueries(1):
+            result = self.generator.compare_months('mom', months=3, end=date(2024, 3, 31))
+        self.assertEqual([p['period'] for p in result['periods']], ['2024-01', '2024-02', '2024-03'])
+
+        february = result['periods'][1]
+        self.assertEqual(february['total'], Decimal('150.00'))
+        self.assertEqual(february['previous_total'], Decimal('140.00'))
+        categories = self._categories(february)
+        self.assertEqual(categories['food']['change'], Decimal('50.00'))
+        self.assertEqual(categories['food']['percent_change'], 50.0)
+        self.assertEqual(categories['transport']['total'], Decimal('0'))
+        self.assertEqual(categories['transport']['percent_change'], -100.0)
+
+        march = self._categories(result['periods'][2])
+        # Bills skipped February, so March is compared against zero
+        self.assertEqual(march['bills']['previous_total'], Decimal('0'))
+        self.assertIsNone(march['bills']['percent_change'])
+        self.assertEqual(march['transport']['previous_total'], Decimal('0'))
+
+    def test_year_over_year(self):
+        result = self.generator.compare_months('yoy', months=1, end=date(2024, 3, 1))
+        march = self._categories(result['periods'][0])
+        self.assertEqual(march['food']['previous_total'], Decimal('80.00'))
+        self.assertEqual(march['food']['percent_change'], 50.0)
+        self.assertEqual(result['periods'][0]['previous_period'], '2023-03')
+
+    def test_custom_range(self):
+        response = self.client.get(reverse('compare-periods'), {
+            'mode': 'custom', 'start': '2024-02-01', 'end': '2024-03-31'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        period = response.data['periods'][0]
+        self.assertEqual(period['previous_period'], '2023-12-03/2024-01-31')
+        categories = self._categories(period)
+        self.assertEqual(categories['food']['total'], Decimal('270.00'))
+        self.assertEqual(categories['food']['previous_total'], Decimal('100.00'))
+        self.assertEqual(categories['food']['percent_change'], 170.0)
+
+    def test_endpoint_validation(self):
+        url = reverse('compare-periods')
+        self.assertEqual(self.client.get(url, {'mode': 'weekly'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'months': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'mode': 'custom', 'start': '2024-02-30', 'end': '2024-03-01'}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['periods']), 12)
\ No newline at end of file
@@ -0,0 +1,140 @@
+import time
+from datetime import date, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense, snapshot
+from expenses.versioning import bump_data_versions
+from ai.recurring import RecurringDetector, detect_pattern, get_detector
+
+User = get_user_model()
+
+class RecurringDetectionTestCase(TestCase):
+    def setUp(self):
+        get_detector().clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _series(self, description, category, amount, start, step_days, count):
+        Expense.objects.bulk_create([
+            Expense(user=self.user, amount=amount, description=description, category=category,
+                    date=start + timedelta(days=step_days * i))
+            for i in range(count)
+        ])
+
+    def test_detect_pattern_frequencies(self):
+        start = date(2024, 1, 1).toordinal()
+        weekly = [start + 7 * i for i in range(6)]
+        self.assertEqual(detect_pattern(weekly, [20] * 6)['frequency'], 'weekly')
+        monthly = [date(2024, month, 5).toordinal() for month in range(1, 7)]
+        pattern = detect_pattern(monthly, [150] * 6)
+        self.assertEqual(pattern['frequency'], 'monthly')
+        self.assertEqual(pattern['next_expected'], date(2024, 7, 5))
+        self.assertIsNone(detect_pattern([start, start + 3, start + 40, start + 41], [10] * 4))
+        self.assertIsNone(detect_pattern(weekly[:2], [20] * 2))
+
+    def test_endpoint_lists_subscriptions(self):
+        for month in range(1, 7):
+            Expense.objects.create(user=self.user, amount=120, description=f'DSTV subscription renewal {month}',
+                                   category='bills', date=date(2024, month, 3))
+        self._series('Trotro to work', 'transport', 5, date(2024, 1, 1), 7, 10)
+        Expense.objects.create(user=self.user, amount=300, description='Wedding gift', category='other',
+                               date=date(2024, 2, 14))
+
+        response = self.client.get(reverse('get-recurring'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_key = {item['key']: item for item in response.data['recurring']}
+        self.assertEqual(set(by_key), {'dstv subscription renewal', 'trotro to work'})
+        self.assertEqual(by_key['dstv subscription renewal']['frequency'], 'monthly')
+        self.assertEqual(by_key['dstv subscription renewal']['category'], 'bills')
+        self.assertEqual(by_key['trotro to work']['frequency'], 'weekly')
+        self.assertAlmostEqual(response.data['monthly_commitment'], 120 + 5 * 52 / 12, places=1)
+
+    def test_new_expenses_update_loaded_state(self):
+        self._series('Rent payment', 'bills', 800, date(2024, 1, 1), 30, 2)
+        detector = get_detector()
+        self.assertEqual(detector.recurring(self.user.pk), [])
+
+        Expense.objects.create(user=self.user, amount=800, description='Rent payment', category='bills',
+                               date=date(2024, 3, 1))
+        # Only the data version is checked
+        with self.assertNumQueries(1):
+            recurring = detector.recurring(self.user.pk)
+        self.assertEqual([item['frequency'] for item in recurring], ['monthly'])
+
+    def test_writes_from_other_processes_are_picked_up(self):
+        self._series('Rent payment', 'bills', 800, date(2024, 1, 1), 30, 2)
+        detector = get_detector()
+        self.assertEqual(detector.recurring(self.user.pk), [])
+
+        # Rows written elsewhere arrive without a signal, only a version bump
+        self._series('Rent payment', 'bills', 800, date(2024, 3, 1), 30, 1)
+        self.assertEqual(detector.recurring(self.user.pk), [])
+        bump_data_versions([self.user.pk])
+        self.assertEqual([item['occurrences'] for item in detector.recurring(self.user.pk)], [3])
+
+    def test_row_already_read_by_the_build_is_not_added_twice(self):
+        self._series('Rent payment', 'bills', 800, date(2024, 1, 1), 30, 3)
+        detector = get_detector()
+        # The build reads the newest row before its write bumps the version
+        expense = Expense.objects.latest('id')
+        detector.recurring(self.user.pk)
+        bump_data_versions([self.user.pk])
+        detector.add_expense(self.user.pk, snapshot(expense))
+        self.assertEqual(len(detector._state(self.user.pk)['groups']['rent payment'].dates), 3)
+
+    def test_many_distinct_series(self):
+        def name(i):
+            # Letters only: digits are stripped by normalization and would merge the groups
+            return 'vendor ' + ''.join(chr(ord('a') + int(d)) for d in f'{i:03d}')
+
+        irregular_gaps = [2, 45, 9, 70, 5, 150, 21]
+        expenses = []
+        for i in range(100):
+            expenses += [Expense(user=self.user, amount=50, description=f'{name(i)} subscription', category='bills',
+                                 date=date(2022 + m // 12, m % 12 + 1, i % 28 + 1)) for m in range(24)]
+            start = date(2022, 1, 1) + timedelta(days=i)
+            expenses += [Expense(user=self.user, amount=5, description=f'{name(i)} lunch', category='food',
+                                 date=start + timedelta(days=7 * w)) for w in range(50)]
+            day = date(2022, 1, 1) + timedelta(days=i)
+            for gap in irregular_gaps * 2:
+                day += timedelta(days=gap)
+                expenses.append(Expense(user=self.user, amount=30, description=f'{name(i)} market', category='shopping',
+                                        date=day))
+        Expense.objects.bulk_create(expenses, batch_size=5000)
+
+        detector = RecurringDetector()
+        recurring = detector.recurring(self.user.pk)
+        self.assertEqual(len(detector._state(self.user.pk)['groups']), 300)
+        frequencies = {item['key']: item['frequency'] for item in recurring}
+        self.assertEqual(frequencies, {
+            **{f'{name(i)} subscription': 'monthly' for i in range(100)},
+            **{f'{name(i)} lunch': 'weekly' for i in range(100)},
+        })
+
+    def test_large_history_is_fast(self):
+        def name(i):
+            return 'vendor ' + ''.join(chr(ord('a') + int(d)) for d in f'{i:04d}')
+
+        # 100k rows in 5000 distinct monthly series
+        start = date(2000, 1, 1)
+        Expense.objects.bulk_create([
+            Expense(user=self.user, amount=10 + i % 7, description=f'{name(i % 5000)} purchase', category='shopping',
+                    date=start + timedelta(days=(i // 5000) * 30 + i % 5))
+            for i in range(100000)
+        ], batch_size=5000)
+
+        detector = RecurringDetector()
+        started = time.perf_counter()
+        recurring = detector.recurring(self.user.pk)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(len(detector._state(self.user.pk)['groups']), 5000)
+        self.assertEqual({item['frequency'] for item in recurring}, {'monthly'})
+        self.assertEqual(len(recurring), 5000)
\ No newline at end of file
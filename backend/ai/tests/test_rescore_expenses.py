@@ -0,0 +1,94 @@
+import os
+import tempfile
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from ai.services import rescoring
+from datetime import date
+
+User = get_user_model()
+
+class RescoreExpensesCommandTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        descriptions = [
+            'Waakye at chop bar', 'Trotro fare to Circle', 'ECG bill payment',
+            'Korle Bu hospital visit', 'Legon school fees', 'Shoprite shopping',
+        ]
+        for description in descriptions:
+            Expense.objects.create(
+                user=self.user,
+                amount=10,
+                description=description,
+                category='other',
+                date=date.today()
+            )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint_dir = os.path.join(tmp.name, 'checkpoints')
+
+    def _rescore(self, **options):
+        out = StringIO()
+        options.setdefault('shards', 3)
+        call_command(
+            'rescore_expenses', workers=1, batch_size=2,
+            checkpoint_dir=self.checkpoint_dir, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_rescore_applies_model_predictions(self):
+        output = self._rescore()
+        self.assertIn('Rescoring complete: 6 scanned, 6 updated', output)
+
+        pipeline = rescoring.load_pipeline(settings.AI_ML_MODEL_PATH)
+        for expense in Expense.objects.all():
+            self.assertEqual(expense.ai_predicted_category, pipeline.predict([expense.description])[0])
+        # User categories are never touched
+        self.assertFalse(Expense.objects.exclude(category='other').exists())
+
+    def test_rescore_resumes_from_checkpoints(self):
+        self._rescore()
+        Expense.objects.update(ai_predicted_category=None)
+
+        output = self._rescore()
+        self.assertIn('0 scanned, 0 updated', output)
+        self.assertFalse(Expense.objects.exclude(ai_predicted_category=None).exists())
+
+        output = self._rescore(restart=True)
+        self.assertIn('6 scanned, 6 updated', output)
+
+    def test_resume_keeps_the_saved_shard_plan(self):
+        self._rescore()
+        planned = rescoring.read_manifest(self.checkpoint_dir)['shards']
+        Expense.objects.update(ai_predicted_category=None)
+        new = Expense.objects.create(
+            user=self.user, amount=10, description='Waakye at chop bar', category='other', date=date.today()
+        )
+
+        # A different shard count and a higher Max(id) must not invalidate the checkpoints
+        output = self._rescore(shards=5)
+        self.assertIn('Rescoring complete: 1 scanned, 1 updated', output)
+        shards = rescoring.read_manifest(self.checkpoint_dir)['shards']
+        self.assertEqual(shards[:len(planned)], planned)
+        self.assertEqual(shards[len(planned):], [[new.id, new.id + 1]])
+        self.assertEqual(
+            sorted(os.listdir(self.checkpoint_dir)),
+            sorted(['manifest.json'] + [f'shard-{start}-{end}.json' for start, end in shards])
+        )
+
+    def test_shard_checkpoint_skips_processed_ids(self):
+        ids = list(Expense.objects.order_by('id').values_list('id', flat=True))
+        start, end = ids[0], ids[-1] + 1
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        rescoring.write_checkpoint(self.checkpoint_dir, start, end, {'last_id': ids[3], 'done': False})
+
+        pipeline = rescoring.load_pipeline(settings.AI_ML_MODEL_PATH)
+        _, _, scanned, _ = rescoring.rescore_shard(start, end, self.checkpoint_dir, pipeline=pipeline)
+        self.assertEqual(scanned, 2)
@@ -0,0 +1,163 @@
+import threading
+import time
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ai.interfaces.categorizer import CategorizerInterface
+from ai.models.rule_based_categorizer import RuleBasedCategorizer
+from ai.services.categorization_service import CategorizationService
+from ai.services.metrics import metrics
+from ai.services.shadow import ShadowEvaluator, parse_candidates, reset_shadow_evaluator
+
+User = get_user_model()
+
+class FixedCandidate(CategorizerInterface):
+    def __init__(self, category='food', confidence=0.9):
+        self.category = category
+        self.confidence = confidence
+
+    def predict(self, description):
+        return {'predicted_category': self.category, 'confidence': self.confidence, 'method': 'fixed'}
+
+    def get_supported_categories(self):
+        return [self.category]
+
+class SlowCandidate(FixedCandidate):
+    """Takes far longer than a request may"""
+    def predict(self, description):
+        time.sleep(0.3)
+        return super().predict(description)
+
+class BrokenCandidate(FixedCandidate):
+    def predict(self, description):
+        raise RuntimeError('model file missing')
+
+PRIMARY = {'predicted_category': 'food', 'confidence': 0.85, 'method': 'rule_based'}
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not reached')
+        time.sleep(0.01)
+
+class ShadowEvaluatorTestCase(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def _evaluator(self, candidates, **kwargs):
+        evaluator = ShadowEvaluator(candidates, rng=lambda: 0.0, sample_rate=kwargs.pop('sample_rate', 1.0), **kwargs)
+        self.addCleanup(evaluator.shutdown)
+        return evaluator
+
+    def test_records_agreement_latency_and_confidence(self):
+        evaluator = self._evaluator({'same': FixedCandidate('food', 0.9), 'other': FixedCandidate('travel', 0.35)})
+        evaluator.submit('Waakye', PRIMARY, primary_ms=1.5).result()
+
+        self.assertEqual(metrics.counter('ai.shadow.sampled'), 1)
+        self.assertEqual(metrics.counter('ai.shadow.agree', candidate='same'), 1)
+        self.assertEqual(metrics.counter('ai.shadow.disagree', candidate='other', primary='food', shadow='travel'), 1)
+        histograms = metrics.snapshot()['histograms']
+        self.assertEqual(histograms['ai.shadow.latency_ms{candidate=same}']['count'], 1)
+        self.assertEqual(histograms['ai.shadow.confidence{candidate=other}']['buckets']['0.4'], 1)
+        self.assertEqual(histograms['ai.shadow.primary_latency_ms']['count'], 1)
+        self.assertEqual(evaluator.summary(), {
+            'same': {'compared': 1, 'agreement': 1.0, 'errors': 0},
+            'other': {'compared': 1, 'agreement': 0.0, 'errors': 0},
+        })
+
+    def test_samples_at_the_configured_rate(self):
+        draws = iter([0.01, 0.5, 0.2])
+        evaluator = ShadowEvaluator({'same': FixedCandidate()}, sample_rate=0.1, rng=lambda: next(draws))
+        self.addCleanup(evaluator.shutdown)
+        futures = [evaluator.submit('Waakye', PRIMARY) for _ in range(3)]
+        self.assertIsNotNone(futures[0])
+        self.assertEqual(futures[1:], [None, None])
+
+    def test_full_queue_drops_samples_without_blocking(self):
+        release = threading.Event()
+
+        class Blocking(FixedCandidate):
+            def predict(self, description):
+                release.wait(5)
+                return super().predict(description)
+
+        evaluator = self._evaluator({'blocking': Blocking()}, max_pending=1)
+        first = evaluator.submit('Waakye', PRIMARY)
+        started = time.perf_counter()
+        self.assertIsNone(evaluator.submit('Kenkey', PRIMARY))
+        self.assertLess(time.perf_counter() - started, 0.05)
+        self.assertEqual(metrics.counter('ai.shadow.dropped', reason='queue_full'), 1)
+        release.set()
+        first.result()
+
+    def test_failing_candidate_is_counted_and_others_still_run(self):
+        evaluator = self._evaluator({'broken': BrokenCandidate(), 'same': FixedCandidate()})
+        evaluator.submit('Waakye', PRIMARY).result()
+        self.assertEqual(metrics.counter('ai.shadow.errors', candidate='broken'), 1)
+        self.assertEqual(metrics.counter('ai.shadow.agree', candidate='same'), 1)
+
+    def test_candidates_are_built_on_the_pool(self):
+        threads = []
+
+        def factory():
+            threads.append(threading.current_thread().name)
+            return FixedCandidate()
+
+        evaluator = self._evaluator({'lazy': factory})
+        self.assertEqual(threads, [])
+        evaluator.submit('Waakye', PRIMARY).result()
+        evaluator.submit('Kenkey', PRIMARY).result()
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('ai-shadow'))
+
+    def test_parse_candidates(self):
+        self.assertEqual(
+            parse_candidates(['retrained=/models/v2.pkl', ' ai.models.rule_based_categorizer.RuleBasedCategorizer', '']),
+            {
+                'retrained': '/models/v2.pkl',
+                'ai.models.rule_based_categorizer.RuleBasedCategorizer':
+                    'ai.models.rule_based_categorizer.RuleBasedCategorizer',
+            },
+        )
+
+@override_settings(AI_SHADOW_CANDIDATES=['slow=ai.tests.test_shadow.SlowCandidate'], AI_SHADOW_SAMPLE_RATE=1.0,
+                   AI_ADMISSION_ENABLED=False)
+class ShadowServiceTestCase(TestCase):
+    def setUp(self):
+        metrics.reset()
+        reset_shadow_evaluator()
+        self.addCleanup(reset_shadow_evaluator)
+
+    def test_primary_answers_without_waiting_for_candidates(self):
+        service = CategorizationService(RuleBasedCategorizer())
+        started = time.perf_counter()
+        result = service.categorize('Waakye at the chop bar')
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual(result['predicted_category'], 'food')
+
+        wait_for(lambda: metrics.counter('ai.shadow.compared', candidate='slow') == 1)
+        self.assertEqual(metrics.counter('ai.shadow.agree', candidate='slow'), 1)
+
+    def test_degraded_answers_are_not_compared(self):
+        class Degraded(FixedCandidate):
+            def predict(self, description):
+                return dict(super().predict(description), degraded=True)
+
+        CategorizationService(Degraded()).categorize('Waakye')
+        time.sleep(0.05)
+        self.assertEqual(metrics.counter('ai.shadow.sampled'), 0)
+
+    def test_metrics_endpoint_reports_candidates(self):
+        admin = User.objects.create_user(email='admin@example.com', username='admin', password='testpass123',
+                                         is_staff=True)
+        CategorizationService(RuleBasedCategorizer()).categorize('Trotro to Circle')
+        wait_for(lambda: metrics.counter('ai.shadow.compared', candidate='slow') == 1)
+
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        response = client.get(reverse('ai-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['shadow']['slow'], {'compared': 1, 'agreement': 0.0, 'errors': 0})
\ No newline at end of file
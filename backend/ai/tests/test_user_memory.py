@@ -0,0 +1,103 @@
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from expenses.text import normalize_description
+from expenses.versioning import bump_data_versions
+from ai.services.user_memory import UserDescriptionMemory, get_user_memory
+from datetime import date
+
+User = get_user_model()
+
+class UserMemoryTestCase(TestCase):
+    def setUp(self):
+        get_user_memory().clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _create(self, description, category, user=None):
+        return Expense.objects.create(
+            user=user or self.user, amount=20, description=description, category=category, date=date.today()
+        )
+
+    def test_normalize_description(self):
+        self.assertEqual(normalize_description('Waakye at Chop-Bar - 35 GHS'), 'waakye at chop bar')
+        self.assertEqual(normalize_description('  WAAKYE   at chop bar 12.50'), 'waakye at chop bar')
+
+    def test_categorize_prefers_user_history(self):
+        self._create('Silverbird ticket', 'shopping')
+        self._create('Silverbird Ticket - 60 GHS', 'entertainment')
+
+        with patch('ai.models.rule_based_categorizer.RuleBasedCategorizer.predict') as predict:
+            response = self.client.post(reverse('categorize-expense'), {'description': 'silverbird ticket'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['predicted_category'], 'entertainment')
+        self.assertEqual(response.data['method'], 'user_history')
+        predict.assert_not_called()
+
+    def test_memory_is_per_user(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self._create('Makola market run', 'food', user=other)
+
+        response = self.client.post(reverse('categorize-expense'), {'description': 'Makola market run'})
+        self.assertNotEqual(response.data['method'], 'user_history')
+
+    def test_overrides_update_loaded_memory(self):
+        expense = self._create('Kofi birthday gift', 'other')
+        memory = get_user_memory()
+        self.assertEqual(memory.lookup(self.user.pk, 'kofi birthday gift'), 'other')
+
+        self.client.post(reverse('override-ai-category'), {'expense_id': expense.id, 'category': 'shopping'})
+        # Only the data version check; the override was applied in place
+        with self.assertNumQueries(1):
+            self.assertEqual(memory.lookup(self.user.pk, 'kofi birthday gift'), 'shopping')
+
+        expense.refresh_from_db()
+        expense.description = 'Ama birthday gift'
+        expense.save()
+        self.assertIsNone(memory.lookup(self.user.pk, 'kofi birthday gift'))
+        self.assertEqual(memory.lookup(self.user.pk, 'ama birthday gift'), 'shopping')
+
+    def test_lru_eviction(self):
+        second = User.objects.create_user(email='second@example.com', username='second', password='testpass123')
+        memory = UserDescriptionMemory(max_users=1, max_entries=2)
+        self._create('waakye', 'food')
+        self._create('trotro', 'transport')
+        self._create('ecg bill', 'bills')
+
+        self.assertIsNone(memory.lookup(self.user.pk, 'waakye'))  # oldest entry evicted
+        self.assertEqual(memory.lookup(self.user.pk, 'ecg bill'), 'bills')
+        memory.lookup(second.pk, 'waakye')
+        with self.assertNumQueries(2):
+            memory.lookup(self.user.pk, 'ecg bill')
+
+    def test_auto_categorized_expenses_are_not_remembered(self):
+        memory = get_user_memory()
+        self.assertIsNone(memory.lookup(self.user.pk, 'kwame phone repair'))
+        response = self.client.post(reverse('expense-list-create'), {
+            'amount': '40.00', 'description': 'Kwame phone repair', 'date': date.today().isoformat()
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(memory.lookup(self.user.pk, 'kwame phone repair'))
+
+        # Once the user confirms the category it is remembered
+        self.client.post(reverse('override-ai-category'), {'expense_id': response.data['id'], 'category': 'other'})
+        self.assertEqual(memory.lookup(self.user.pk, 'kwame phone repair'), 'other')
+
+    def test_writes_from_other_processes_reload_the_memory(self):
+        expense = self._create('Kofi birthday gift', 'other')
+        memory = get_user_memory()
+        self.assertEqual(memory.lookup(self.user.pk, 'kofi birthday gift'), 'other')
+
+        # What another worker's write looks like here: no signal, only the version bump
+        Expense.objects.filter(id=expense.id).update(category='shopping')
+        bump_data_versions([self.user.pk])
+        self.assertEqual(memory.lookup(self.user.pk, 'kofi birthday gift'), 'shopping')
\ No newline at end of file
@@ -3,8 +3,14 @@ from . import views
 
 urlpatterns = [
     path('categorize/', views.categorize_expense, name='categorize-expense'),
+    path('categorize/async/', views.categorize_expense_async, name='categorize-expense-async'),
     path('auto-categorize/', views.auto_categorize_expense, name='auto-categorize-expense'),
     path('override-category/', views.override_ai_category, name='override-ai-category'),
+    path('override-category/bulk/', views.bulk_override_ai_category, name='bulk-override-ai-category'),
     path('insights/', views.get_insights, name='get-insights'),
+    path('insights/compare/', views.compare_periods, name='compare-periods'),
+    path('forecast/', views.get_forecast, name='get-forecast'),
+    path('recurring/', views.get_recurring, name='get-recurring'),
     path('categories/', views.get_supported_categories, name='supported-categories'),
+    path('metrics/', views.get_ai_metrics, name='ai-metrics'),
 ]
\ No newline at end of file
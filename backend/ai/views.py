@@ -1,10 +1,23 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from users.authentication import CachedJWTAuthentication
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+import json
 from .services.categorization_service import CategorizationService
-from .insights import InsightsGenerator
+from .services import category_overrides
+from .services.metrics import metrics
+from .services.shadow import get_shadow_evaluator
+from .insights import InsightsGenerator, get_insights_generator
+from .forecasting import get_forecast as build_user_forecast
+from .recurring import get_detector
 from expenses.models import Expense
+from expenses.versioning import UserDataValidators
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -38,10 +51,43 @@ def categorize_expense(request):
                        status=status.HTTP_400_BAD_REQUEST)
 
     service = CategorizationService()
-    result = service.categorize(description)
+    result = service.categorize(description, user=request.user)
     
     return Response(result)
 
+async def categorize_expense_async(request):
+    """
+    Async variant of categorize_expense for the ASGI path.
+    
+    Model inference runs on the bounded inference pool so slow language
+    model calls do not block the event loop. If the prediction does not
+    finish within AI_INFERENCE_TIMEOUT seconds, the keyword result is
+    returned with degraded=true and degradation_reason set.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required'}, status=405)
+
+    try:
+        auth = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({'error': str(e.detail)}, status=401)
+    if auth is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    description = data.get('description')
+    if not description:
+        return JsonResponse({'error': 'Description is required'}, status=400)
+
+    service = CategorizationService()
+    result = await service.acategorize(description, user=auth[0])
+    
+    return JsonResponse(result)
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def auto_categorize_expense(request):
@@ -104,6 +150,7 @@ def override_ai_category(request):
     **Error Cases:**
     - 400: Missing required fields or invalid category
     - 404: Expense not found or not owned by user
+    - 409: The expense kept changing concurrently; nothing was written
     """
     expense_id = request.data.get('expense_id')
     new_category = request.data.get('category')
@@ -112,30 +159,61 @@ def override_ai_category(request):
         return Response({'error': 'expense_id and category are required'}, 
                        status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        expense = Expense.objects.get(id=expense_id, user=request.user)
-    except Expense.DoesNotExist:
-        return Response({'error': 'Expense not found'}, 
-                       status=status.HTTP_404_NOT_FOUND)
-
     # Validate category choice
     valid_categories = [choice[0] for choice in Expense.CATEGORY_CHOICES]
     if new_category not in valid_categories:
         return Response({'error': f'Invalid category. Must be one of: {valid_categories}'}, 
                        status=status.HTTP_400_BAD_REQUEST)
 
-    # Store original AI prediction and user override
-    old_category = expense.category
-    expense.category = new_category
-    expense.save()
+    # Targeted UPDATE of the category; the AI prediction is preserved and
+    # the correction is appended to the feedback log
+    result = category_overrides.override_category(request.user, expense_id, new_category)
+    if result is None:
+        return Response({'error': 'Expense not found'}, 
+                       status=status.HTTP_404_NOT_FOUND)
+    if result.get('conflict'):
+        return Response({'error': 'Expense was changed concurrently, please retry',
+                         'current_category': result['current_category']},
+                       status=status.HTTP_409_CONFLICT)
     
-    return Response({
-        'expense_id': expense.id,
-        'old_category': old_category,
-        'new_category': new_category,
-        'ai_predicted_category': expense.ai_predicted_category,
-        'override_applied': True
-    })
+    result['override_applied'] = True
+    return Response(result)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_override_ai_category(request):
+    """
+    Override the category of many expenses in one request.
+    
+    **Request Body:**
+    - overrides (list, required): Items of {expense_id, category}
+    
+    **Response:**
+    - updated: Number of expenses whose category changed
+    - not_found: Expense IDs that do not exist or are not owned by the user
+    - results: Per-expense old/new category and preserved AI prediction
+    """
+    overrides = request.data.get('overrides')
+    if not isinstance(overrides, list) or not overrides:
+        return Response({'error': 'overrides must be a non-empty list'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
+
+    valid_categories = [choice[0] for choice in Expense.CATEGORY_CHOICES]
+    for item in overrides:
+        if not isinstance(item, dict) or not item.get('expense_id') or not item.get('category'):
+            return Response({'error': 'Each override needs expense_id and category'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        if item['category'] not in valid_categories:
+            return Response({'error': f'Invalid category. Must be one of: {valid_categories}'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        try:
+            int(item['expense_id'])
+        except (TypeError, ValueError):
+            return Response({'error': 'expense_id must be an integer'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+
+    result = category_overrides.bulk_override_categories(request.user, overrides)
+    return Response(result)
 
 @api_view(['GET'])
 @permission_classes([])
@@ -193,8 +271,16 @@ def get_insights(request):
                 'last_name': 'User'
             }
         )
-    
-    generator = InsightsGenerator(user)
+
+    # Insights cover rolling windows, so a copy from before today is stale
+    validators = UserDataValidators(
+        request, user, 'insights', fresh_from=timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    not_modified = validators.not_modified()
+    if not_modified is not None:
+        return not_modified
+
+    generator = get_insights_generator(user)
     
     # Get query parameters
     year = request.GET.get('year')
@@ -212,7 +298,85 @@ def get_insights(request):
         'spending_trends': generator.get_spending_trends()
     }
     
-    return Response(insights)
+    return validators.apply(Response(insights))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def compare_periods(request):
+    """
+    Compare spending against a previous period, broken down by category.
+
+    **Query Parameters:**
+    - mode: 'mom' (month over month, default), 'yoy' (year over year) or 'custom'
+    - months (mom/yoy): number of months to return, ending this month (default 12, max 60)
+    - start, end (custom): YYYY-MM-DD range compared with the equally long period before it
+    """
+    mode = request.GET.get('mode', 'mom')
+    generator = InsightsGenerator(request.user)
+
+    if mode in ('mom', 'yoy'):
+        try:
+            months = int(request.GET.get('months', 12))
+        except ValueError:
+            return Response({'error': 'months must be an integer'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= months <= 60:
+            return Response({'error': 'months must be between 1 and 60'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        return Response(generator.compare_months(mode, months))
+
+    if mode == 'custom':
+        try:
+            start = parse_date(request.GET.get('start') or '')
+            end = parse_date(request.GET.get('end') or '')
+        except ValueError:
+            start = end = None
+        if not start or not end or start > end:
+            return Response({'error': 'custom mode needs start <= end as YYYY-MM-DD'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        return Response(generator.compare_range(start, end))
+
+    return Response({'error': "mode must be 'mom', 'yoy' or 'custom'"}, 
+                   status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_forecast(request):
+    """
+    Project end-of-month and next-month spending per category.
+
+    Fits exponential smoothing and same-month-of-year averages over the
+    user's daily spending series. The result is cached until the user's
+    expenses change.
+    """
+    return Response(build_user_forecast(request.user))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_recurring(request):
+    """
+    Detect recurring payments and subscriptions in the user's history.
+
+    Expenses are grouped by normalized description and each group's date
+    gaps are tested for a weekly, biweekly, monthly, quarterly or yearly
+    period. Includes the next expected date and the monthly equivalent cost.
+    """
+    recurring = get_detector().recurring(request.user.pk)
+    return Response({
+        'recurring': recurring,
+        'count': len(recurring),
+        'monthly_commitment': round(sum(item['monthly_cost'] for item in recurring), 2),
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_ai_metrics(request):
+    """Counters and latency histograms of this worker process (admission control, shadow evaluation)"""
+    data = metrics.snapshot()
+    evaluator = get_shadow_evaluator()
+    if evaluator is not None:
+        data['shadow'] = evaluator.summary()
+    return Response(data)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from django.db import models
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+
+User = get_user_model()
+
+
+class Budget(models.Model):
+    PERIOD_CHOICES = [
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='budgets')
+    category = models.CharField(max_length=20, choices=Expense.CATEGORY_CHOICES)
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES, default='monthly')
+    limit = models.DecimalField(max_digits=10, decimal_places=2)
+    # Percentage of the limit at which a warning is raised
+    warn_percent = models.PositiveSmallIntegerField(default=80)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['category', 'period']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category', 'period'], name='unique_budget_per_category_period'),
+        ]
+
+    def period_bounds(self, day):
+        """[start, end) of the budget period containing day"""
+        if self.period == 'weekly':
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(days=7)
+        start = day.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1)
+
+    def level_for(self, total):
+        """Threshold level reached by total"""
+        if total > self.limit:
+            return BudgetPeriodTotal.EXCEEDED
+        if total * 100 >= self.limit * self.warn_percent:
+            return BudgetPeriodTotal.WARNING
+        return BudgetPeriodTotal.OK
+
+    def __str__(self):
+        return f"{self.category} {self.period} budget - GH₵{self.limit}"
+
+
+class BudgetPeriodTotal(models.Model):
+    """Running spend of one budget in one period, maintained on expense writes"""
+    OK, WARNING, EXCEEDED = 0, 1, 2
+    LEVEL_CHOICES = [
+        (OK, 'ok'),
+        (WARNING, 'warning'),
+        (EXCEEDED, 'exceeded'),
+    ]
+
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='period_totals')
+    period_start = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    level = models.PositiveSmallIntegerField(choices=LEVEL_CHOICES, default=OK)
+
+    class Meta:
+        ordering = ['-period_start']
+        constraints = [
+            models.UniqueConstraint(fields=['budget', 'period_start'], name='unique_budget_period_total'),
+        ]
+
+    def __str__(self):
+        return f"{self.budget_id} @ {self.period_start}: {self.total}"
+
+
+class BudgetEvent(models.Model):
+    """A budget period crossing its warning or limit threshold"""
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='events')
+    period_start = models.DateField()
+    level = models.PositiveSmallIntegerField(choices=BudgetPeriodTotal.LEVEL_CHOICES)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"{self.budget_id} {self.get_level_display()} at {self.total}"
\ No newline at end of file
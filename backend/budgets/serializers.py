@@ -0,0 +1,38 @@
+from rest_framework import serializers
+from .models import Budget, BudgetEvent
+
+class BudgetSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Budget
+        fields = ['id', 'category', 'period', 'limit', 'warn_percent', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def validate_limit(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Limit must be greater than zero')
+        return value
+
+    def validate_warn_percent(self, value):
+        if not 1 <= value <= 100:
+            raise serializers.ValidationError('warn_percent must be between 1 and 100')
+        return value
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        category = attrs.get('category', getattr(self.instance, 'category', None))
+        period = attrs.get('period', getattr(self.instance, 'period', 'monthly'))
+        existing = Budget.objects.filter(user=user, category=category, period=period)
+        if self.instance is not None:
+            existing = existing.exclude(pk=self.instance.pk)
+        if existing.exists():
+            raise serializers.ValidationError(f'A {period} budget for {category} already exists')
+        return attrs
+
+class BudgetEventSerializer(serializers.ModelSerializer):
+    category = serializers.CharField(source='budget.category', read_only=True)
+    period = serializers.CharField(source='budget.period', read_only=True)
+    level = serializers.CharField(source='get_level_display', read_only=True)
+
+    class Meta:
+        model = BudgetEvent
+        fields = ['id', 'budget', 'category', 'period', 'period_start', 'level', 'total', 'created_at']
\ No newline at end of file
@@ -0,0 +1,12 @@
+from django.dispatch import Signal, receiver
+from expenses.signals import expense_changed
+from .tracking import apply_expense_change
+
+# Sent with budget and event (a BudgetEvent) when a period first reaches
+# its warning level or goes over its limit
+budget_threshold_crossed = Signal()
+
+
+@receiver(expense_changed)
+def _update_budget_totals(sender, user_id, old, new, created=False, **kwargs):
+    apply_expense_change(user_id, old, new, created)
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""Background job handlers for budgets (see jobs.registry)"""
+from jobs.registry import register
+from .models import Budget
+from .tracking import rebuild_totals
+
+
+@register('budgets.rebuild_totals')
+def rebuild_budget_totals(job):
+    """Re-sum stored budget periods; payload budget_ids limits it, otherwise every budget"""
+    budgets = Budget.objects.all()
+    if job.payload.get('budget_ids') is not None:
+        budgets = budgets.filter(id__in=job.payload['budget_ids'])
+    return {'changed': rebuild_totals(budgets.iterator())}
\ No newline at end of file
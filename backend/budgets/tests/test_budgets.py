@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from budgets.models import Budget, BudgetEvent, BudgetPeriodTotal
+from budgets.signals import budget_threshold_crossed
+
+User = get_user_model()
+
+class BudgetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.today = timezone.localdate()
+
+    def _budget(self, **data):
+        data = dict({'category': 'food', 'period': 'monthly', 'limit': '100.00'}, **data)
+        response = self.client.post(reverse('budget-list-create'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Budget.objects.get(id=response.data['id'])
+
+    def _expense(self, amount, category='food', day=None):
+        return Expense.objects.create(
+            user=self.user, amount=Decimal(amount), description='Waakye', category=category, date=day or self.today
+        )
+
+    def _status(self, budget):
+        return self.client.get(reverse('budget-status', args=[budget.id])).data
+
+    def test_budget_counts_existing_spend_in_current_period(self):
+        self._expense('30.00')
+        self._expense('15.00', category='transport')
+        budget = self._budget()
+        data = self._status(budget)
+        self.assertEqual(data['spent'], Decimal('30.00'))
+        self.assertEqual(data['remaining'], Decimal('70.00'))
+        self.assertEqual(data['status'], 'ok')
+
+    def test_totals_follow_create_update_and_delete(self):
+        budget = self._budget()
+        self._status(budget)
+        expense = self._expense('40.00')
+
+        expense.amount = Decimal('55.00')
+        expense.save()
+        self.assertEqual(self._status(budget)['spent'], Decimal('55.00'))
+
+        expense.category = 'transport'
+        expense.save()
+        self.assertEqual(self._status(budget)['spent'], Decimal('0.00'))
+
+        other = self._expense('20.00')
+        other.delete()
+        self.assertEqual(self._status(budget)['spent'], Decimal('0.00'))
+
+    def test_save_without_loaded_snapshot_is_not_double_counted(self):
+        budget = self._budget()
+        self._status(budget)
+        expense = self._expense('40.00')
+
+        # Built by hand, as an upsert would: there is no snapshot of the stored row
+        Expense(id=expense.id, user=self.user, amount=Decimal('45.00'), description='Waakye', category='food',
+                date=self.today, created_at=expense.created_at).save()
+        self.assertEqual(self._status(budget)['spent'], Decimal('45.00'))
+
+        deferred = Expense.objects.only('id', 'user_id', 'amount').get(id=expense.id)
+        deferred.amount = Decimal('50.00')
+        deferred.save(update_fields=['amount'])
+        self.assertEqual(self._status(budget)['spent'], Decimal('50.00'))
+
+    def test_status_read_does_not_scan_expenses(self):
+        budget = self._budget()
+        self._expense('10.00')
+        with self.assertNumQueries(2):
+            self.client.get(reverse('budget-status', args=[budget.id]))
+
+    def test_threshold_crossings_emitted_once(self):
+        budget = self._budget()
+        received = []
+        handler = lambda sender, budget, event, **kwargs: received.append(event.get_level_display())
+        budget_threshold_crossed.connect(handler)
+        try:
+            self._expense('50.00')
+            self._expense('35.00')  # 85% -> warning
+            self._expense('5.00')   # still warning, no new event
+            self._expense('20.00')  # over the limit
+        finally:
+            budget_threshold_crossed.disconnect(handler)
+
+        self.assertEqual(received, ['warning', 'exceeded'])
+        self.assertEqual(self._status(budget)['status'], 'exceeded')
+        events = self.client.get(reverse('budget-events')).data
+        self.assertEqual([event['level'] for event in events], ['exceeded', 'warning'])
+
+    def test_category_override_moves_spend(self):
+        budget = self._budget(category='entertainment')
+        expense = self._expense('60.00', category='shopping')
+        self.client.post(reverse('override-ai-category'), {'expense_id': expense.id, 'category': 'entertainment'})
+        self.assertEqual(self._status(budget)['spent'], Decimal('60.00'))
+
+    def test_weekly_periods_are_tracked_separately(self):
+        budget = self._budget(period='weekly')
+        self._expense('25.00', day=self.today - timedelta(days=7))
+        self._expense('10.00')
+        self.assertEqual(self._status(budget)['spent'], Decimal('10.00'))
+        self.assertEqual(BudgetPeriodTotal.objects.filter(budget=budget).count(), 2)
+
+    def test_raising_limit_clears_status_without_event(self):
+        budget = self._budget()
+        self._expense('120.00')
+        self.client.patch(reverse('budget-detail', args=[budget.id]), {'limit': '500.00'})
+        self.assertEqual(self._status(budget)['status'], 'ok')
+        self.assertEqual(BudgetEvent.objects.count(), 1)
+
+    def test_duplicate_budget_rejected(self):
+        self._budget()
+        response = self.client.post(reverse('budget-list-create'), {'category': 'food', 'limit': '50.00'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_users_budget_not_visible(self):
+        budget = self._budget()
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('budget-status', args=[budget.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
@@ -0,0 +1,140 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, Sum
+from expenses.fx import get_rate_cache, reporting_amount
+from expenses.models import Expense
+from .models import Budget, BudgetPeriodTotal, BudgetEvent
+
+
+def _spent_in_period(budget, start, end):
+    return Expense.objects.filter(
+        user_id=budget.user_id, category=budget.category, date__gte=start, date__lt=end
+    ).aggregate(total=Sum(reporting_amount()))['total'] or Decimal('0')
+
+
+def _set_level(budget, period_total, total, emit=True):
+    """Move the stored level to match total, recording upward crossings"""
+    from .signals import budget_threshold_crossed
+
+    level = budget.level_for(total)
+    if level == period_total.level:
+        return
+    # Guarded on the level we read, so concurrent writers emit a crossing once
+    changed = BudgetPeriodTotal.objects.filter(pk=period_total.pk, level=period_total.level).update(level=level)
+    if not changed or not emit or level < period_total.level:
+        return
+    event = BudgetEvent.objects.create(
+        budget=budget, period_start=period_total.period_start, level=level, total=total
+    )
+    budget_threshold_crossed.send(sender=Budget, budget=budget, event=event)
+
+
+def get_period_total(budget, day):
+    """
+    The budget's running total for the period containing day.
+
+    A period is summed from expenses only the first time it is touched;
+    after that its row is kept current by apply_expense_change.
+    """
+    start, end = budget.period_bounds(day)
+    period_total = BudgetPeriodTotal.objects.filter(budget=budget, period_start=start).first()
+    if period_total is None:
+        total = _spent_in_period(budget, start, end)
+        period_total, created = BudgetPeriodTotal.objects.get_or_create(
+            budget=budget, period_start=start, defaults={'total': total}
+        )
+        if created:
+            _set_level(budget, period_total, total)
+            period_total.level = budget.level_for(total)
+    return period_total
+
+
+def apply_expense_change(user_id, old, new, created=False):
+    """
+    Update the running totals of the budgets an expense write touches.
+
+    old and new are ExpenseSnapshots (either may be None). Costs one
+    budget lookup plus an F() update per affected budget period. A write
+    to an existing expense without an old snapshot (an instance built by
+    hand or loaded with deferred fields) cannot be turned into a delta, so
+    the user's stored periods are re-summed from the database instead.
+    """
+    if old is None and not created:
+        rebuild_totals(Budget.objects.filter(user_id=user_id), emit=True)
+        return
+
+    categories = {snap.category for snap in (old, new) if snap is not None}
+    budgets = list(Budget.objects.filter(user_id=user_id, category__in=categories))
+    if not budgets:
+        return
+
+    deltas = defaultdict(Decimal)
+    for budget in budgets:
+        for snap, sign in ((old, -1), (new, 1)):
+            if snap is not None and snap.category == budget.category:
+                start, _ = budget.period_bounds(snap.date)
+                amount = get_rate_cache().convert(Decimal(str(snap.amount)), snap.currency, snap.date)
+                deltas[(budget, start)] += sign * amount
+
+    with transaction.atomic():
+        for (budget, start), delta in deltas.items():
+            if not delta:
+                continue
+            updated = BudgetPeriodTotal.objects.filter(budget=budget, period_start=start).update(
+                total=F('total') + delta
+            )
+            if not updated:
+                # First write to this period: summing it already includes this change
+                get_period_total(budget, start)
+                continue
+            period_total = BudgetPeriodTotal.objects.get(budget=budget, period_start=start)
+            _set_level(budget, period_total, period_total.total)
+
+
+def reset_budget(budget):
+    """Drop running totals after a budget's category or period changes"""
+    BudgetPeriodTotal.objects.filter(budget=budget).delete()
+
+
+def refresh_levels(budget):
+    """Re-evaluate stored levels after a limit change, without emitting events"""
+    for period_total in BudgetPeriodTotal.objects.filter(budget=budget):
+        _set_level(budget, period_total, period_total.total, emit=False)
+
+
+def rebuild_totals(budgets, emit=False):
+    """
+    Re-sum every stored period of budgets from their expenses, e.g. after
+    new FX rates change converted amounts. Levels follow, emitting
+    crossing events only if emit. Returns the number of periods whose
+    total changed.
+    """
+    changed = 0
+    for budget in budgets:
+        for period_total in BudgetPeriodTotal.objects.filter(budget=budget):
+            start, end = budget.period_bounds(period_total.period_start)
+            total = _spent_in_period(budget, start, end)
+            if total != period_total.total:
+                BudgetPeriodTotal.objects.filter(pk=period_total.pk).update(total=total)
+                changed += 1
+            _set_level(budget, period_total, total, emit=emit)
+    return changed
+
+
+def budget_status(budget, day):
+    period_total = get_period_total(budget, day)
+    start, end = budget.period_bounds(day)
+    remaining = budget.limit - period_total.total
+    return {
+        'budget_id': budget.id,
+        'category': budget.category,
+        'period': budget.period,
+        'period_start': start,
+        'period_end': end,
+        'limit': budget.limit,
+        'spent': period_total.total,
+        'remaining': remaining,
+        'percent_used': round(float(period_total.total / budget.limit * 100), 1) if budget.limit else None,
+        'status': period_total.get_level_display(),
+    }
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.BudgetListCreateView.as_view(), name='budget-list-create'),
+    path('<int:pk>/', views.BudgetDetailView.as_view(), name='budget-detail'),
+    path('<int:pk>/status/', views.budget_status, name='budget-status'),
+    path('status/', views.budget_status_list, name='budget-status-list'),
+    path('events/', views.BudgetEventListView.as_view(), name='budget-events'),
+]
\ No newline at end of file
@@ -0,0 +1,56 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import Budget, BudgetEvent
+from .serializers import BudgetSerializer, BudgetEventSerializer
+from . import tracking
+
+class BudgetListCreateView(generics.ListCreateAPIView):
+    serializer_class = BudgetSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Budget.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+class BudgetDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = BudgetSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Budget.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        before = (serializer.instance.category, serializer.instance.period)
+        budget = serializer.save()
+        if (budget.category, budget.period) != before:
+            tracking.reset_budget(budget)
+        else:
+            tracking.refresh_levels(budget)
+
+class BudgetEventListView(generics.ListAPIView):
+    serializer_class = BudgetEventSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return BudgetEvent.objects.filter(budget__user=self.request.user).select_related('budget')
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def budget_status_list(request):
+    """Current-period spend and threshold status of every budget"""
+    today = timezone.localdate()
+    budgets = Budget.objects.filter(user=request.user)
+    return Response([tracking.budget_status(budget, today) for budget in budgets])
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def budget_status(request, pk):
+    """Current-period spend and threshold status of one budget"""
+    budget = get_object_or_404(Budget, pk=pk, user=request.user)
+    return Response(tracking.budget_status(budget, timezone.localdate()))
\ No newline at end of file
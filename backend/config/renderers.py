@@ -0,0 +1,92 @@
+"""
+Fast renderers and parsers for the API.
+
+orjson encodes dates, datetimes, UUIDs and NumPy values natively and falls
+back to DRF's encoder only for the rest (Decimal, lazy strings, querysets),
+so its output matches rest_framework.renderers.JSONRenderer, with one
+exception: NaN and infinite floats render as null, where DRF's strict
+JSON raises ValueError (finding them would mean walking every payload in
+Python). MessagePack
+(application/msgpack) carries the same values for the mobile client.
+Both libraries are optional: without orjson the JSON classes behave like
+DRF's own, and the MessagePack classes are only listed in settings when
+msgpack is installed.
+"""
+from datetime import date
+from decimal import Decimal
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # The common raw values of insights payloads skip the encoder's isinstance chain
+    if type(obj) is Decimal:
+        return float(obj)
+    if type(obj) is date:
+        return obj.isoformat()
+    return _encoder.default(obj)
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        # The browsable API asks for indented JSON; orjson only indents by two
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        rendered = orjson.dumps(data, default=_default, option=options)
+        # Like DRF, escape the line separators that are valid JSON but not JavaScript
+        return rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
\ No newline at end of file
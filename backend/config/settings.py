@@ -1,6 +1,7 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +24,8 @@ INSTALLED_APPS = [
     'django_filters',
     'users',
     'expenses',
+    'budgets',
+    'jobs',
     'ai',
     'demo',
 ]
@@ -57,6 +60,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 DATABASES = {
     'default': {
@@ -83,19 +87,36 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt tokens, with cached users instead of a query per request
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson-backed JSON (plain DRF JSON when orjson is missing); see config/renderers.py
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# MessagePack for clients that send Accept: application/msgpack
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('config.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('config.renderers.MessagePackParser')
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.VersionedTokenRefreshSerializer',
 }
 
 # Spectacular settings
@@ -112,4 +133,90 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # Custom User Model
-AUTH_USER_MODEL = 'users.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'users.User'
+
+# AI inference pool (async categorization views)
+AI_INFERENCE_EXECUTOR = config('AI_INFERENCE_EXECUTOR', default='thread')  # 'thread' or 'process'
+AI_INFERENCE_WORKERS = config('AI_INFERENCE_WORKERS', default=4, cast=int)
+AI_INFERENCE_TIMEOUT = config('AI_INFERENCE_TIMEOUT', default=2.0, cast=float)
+
+# Trained ML model and batch rescoring
+AI_ML_MODEL_PATH = config('AI_ML_MODEL_PATH', default=str(BASE_DIR.parent / 'ml_pipeline' / 'models' / 'ghana_expense_categorizer.pkl'))
+AI_RESCORE_CHECKPOINT_DIR = config('AI_RESCORE_CHECKPOINT_DIR', default=str(BASE_DIR / 'rescore_checkpoints'))
+
+# Confidence-gated categorizer cascade (rules -> linear model -> language model)
+AI_CASCADE_ENABLED = config('AI_CASCADE_ENABLED', default=False, cast=bool)
+AI_CASCADE_BUDGET_MS = config('AI_CASCADE_BUDGET_MS', default=500.0, cast=float)
+AI_CASCADE_ML_THRESHOLD = config('AI_CASCADE_ML_THRESHOLD', default=0.6, cast=float)
+AI_CASCADE_LM_EXPECTED_MS = config('AI_CASCADE_LM_EXPECTED_MS', default=250.0, cast=float)
+AI_CASCADE_CACHE_SIZE = config('AI_CASCADE_CACHE_SIZE', default=10000, cast=int)
+
+# Recorded with every category correction so feedback can be tied to a model
+AI_MODEL_VERSION = config('AI_MODEL_VERSION', default='rule_based-1')
+
+# Online model trained incrementally from user corrections
+AI_ONLINE_MODEL_ENABLED = config('AI_ONLINE_MODEL_ENABLED', default=False, cast=bool)
+AI_ONLINE_MODEL_DIR = config('AI_ONLINE_MODEL_DIR', default=str(BASE_DIR / 'online_model'))
+AI_ONLINE_SEED_DATA = config('AI_ONLINE_SEED_DATA', default=str(BASE_DIR.parent / 'ml_pipeline' / 'data' / 'ghana_expenses.csv'))
+AI_ONLINE_RELOAD_INTERVAL = config('AI_ONLINE_RELOAD_INTERVAL', default=30.0, cast=float)
+AI_ONLINE_KEEP_VERSIONS = config('AI_ONLINE_KEEP_VERSIONS', default=5, cast=int)
+
+# Per-user description memory consulted before any categorizer
+AI_USER_MEMORY_ENABLED = config('AI_USER_MEMORY_ENABLED', default=True, cast=bool)
+AI_USER_MEMORY_MAX_USERS = config('AI_USER_MEMORY_MAX_USERS', default=1000, cast=int)
+AI_USER_MEMORY_MAX_ENTRIES = config('AI_USER_MEMORY_MAX_ENTRIES', default=5000, cast=int)
+
+# Spending forecast (smoothing factor for the daily series, cache lifetime in seconds)
+AI_FORECAST_SMOOTHING = config('AI_FORECAST_SMOOTHING', default=0.1, cast=float)
+AI_FORECAST_CACHE_TIMEOUT = config('AI_FORECAST_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Users whose grouped history is kept in memory for recurring-payment detection
+AI_RECURRING_MAX_USERS = config('AI_RECURRING_MAX_USERS', default=200, cast=int)
+
+# Insights backend: 'columnar' (NumPy over cached per-user arrays) or 'orm'
+AI_INSIGHTS_BACKEND = config('AI_INSIGHTS_BACKEND', default='columnar')
+AI_COLUMNAR_MAX_ROWS = config('AI_COLUMNAR_MAX_ROWS', default=2000000, cast=int)
+
+# Store expense amounts as integer pesewas and categories as small-integer codes instead of decimals and strings.
+# Applied by migrate on a new database; after changing it on an existing one run `manage.py convert_expense_storage`
+EXPENSES_COMPACT_STORAGE = config('EXPENSES_COMPACT_STORAGE', default=False, cast=bool)
+
+# Multi-currency expenses: totals are reported in this currency; FxRate rows are reloaded after the timeout (seconds)
+FX_REPORTING_CURRENCY = config('FX_REPORTING_CURRENCY', default='GHS')
+FX_RATE_CACHE_TIMEOUT = config('FX_RATE_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Admission control for model categorization: per-client and global token buckets (requests/second, burst),
+# concurrent language-model inferences and queued inference jobs; over the limits requests degrade to keywords
+AI_ADMISSION_ENABLED = config('AI_ADMISSION_ENABLED', default=True, cast=bool)
+AI_ADMISSION_CLIENT_RATE = config('AI_ADMISSION_CLIENT_RATE', default=2.0, cast=float)
+AI_ADMISSION_CLIENT_BURST = config('AI_ADMISSION_CLIENT_BURST', default=10, cast=int)
+AI_ADMISSION_GLOBAL_RATE = config('AI_ADMISSION_GLOBAL_RATE', default=20.0, cast=float)
+AI_ADMISSION_GLOBAL_BURST = config('AI_ADMISSION_GLOBAL_BURST', default=50, cast=int)
+AI_ADMISSION_MAX_CLIENTS = config('AI_ADMISSION_MAX_CLIENTS', default=10000, cast=int)
+AI_LM_MAX_CONCURRENCY = config('AI_LM_MAX_CONCURRENCY', default=2, cast=int)
+AI_INFERENCE_MAX_PENDING = config('AI_INFERENCE_MAX_PENDING', default=16, cast=int)
+
+# Background jobs (manage.py run_workers): retries back off exponentially from the base delay up to the max
+# (seconds); running jobs not finished within the stale timeout are requeued; finished jobs are kept for retention
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_BACKOFF_BASE = config('JOBS_BACKOFF_BASE', default=10.0, cast=float)
+JOBS_BACKOFF_MAX = config('JOBS_BACKOFF_MAX', default=3600.0, cast=float)
+JOBS_STALE_TIMEOUT = config('JOBS_STALE_TIMEOUT', default=1800, cast=int)
+JOBS_MAINTENANCE_INTERVAL = config('JOBS_MAINTENANCE_INTERVAL', default=60, cast=int)
+JOBS_RETENTION = config('JOBS_RETENTION', default=7 * 86400, cast=int)
+
+# Expenses created without a category get a keyword/history category at once; the trained model's prediction
+# follows from a background job that batches creates arriving within this many seconds, up to the batch size
+AI_AUTO_CATEGORIZE_BATCH_DELAY = config('AI_AUTO_CATEGORIZE_BATCH_DELAY', default=2.0, cast=float)
+AI_AUTO_CATEGORIZE_BATCH_SIZE = config('AI_AUTO_CATEGORIZE_BATCH_SIZE', default=1000, cast=int)
+
+# Users authenticated from JWTs are cached per process; read-only requests reuse them for this many seconds
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=60, cast=int)
+AUTH_USER_CACHE_MAX_USERS = config('AUTH_USER_CACHE_MAX_USERS', default=10000, cast=int)
+
+# Shadow evaluation: a sample of primary predictions is re-run by these candidates ('name=model.pkl' or
+# 'name=dotted.CategorizerClass', comma-separated) on a background pool; results appear in /api/ai/metrics/
+AI_SHADOW_CANDIDATES = config('AI_SHADOW_CANDIDATES', default='', cast=Csv())
+AI_SHADOW_SAMPLE_RATE = config('AI_SHADOW_SAMPLE_RATE', default=0.05, cast=float)
+AI_SHADOW_WORKERS = config('AI_SHADOW_WORKERS', default=1, cast=int)
+AI_SHADOW_MAX_PENDING = config('AI_SHADOW_MAX_PENDING', default=64, cast=int)
\ No newline at end of file
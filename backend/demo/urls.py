@@ -7,5 +7,6 @@ urlpatterns = [
     path('register/', views.demo_register, name='demo_register'),
     path('logout/', views.demo_logout, name='demo_logout'),
     path('categorize/', views.demo_categorize, name='demo_categorize'),
+    path('categorize/async/', views.demo_categorize_async, name='demo_categorize_async'),
     path('analytics/', views.demo_analytics, name='demo_analytics'),
 ]
\ No newline at end of file
@@ -5,11 +5,14 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login
 from django.contrib.auth import get_user_model
 from ai.services.categorization_service import CategorizationService
-from ai.insights import InsightsGenerator
+from ai.services import inference_executor
+from ai.services.admission import client_key_for
+from ai.insights import get_insights_generator
 from expenses.models import Expense
 import json
 from decimal import Decimal
 from datetime import date, datetime
+from functools import partial
 
 User = get_user_model()
 
@@ -30,6 +33,32 @@ def demo_logout(request):
     from django.shortcuts import redirect
     return redirect('demo_login')
 
+def _demo_predict(description, model_type='auto', client_key=None):
+    """Route a demo categorization to the selected model"""
+    if model_type == 'rule_based':
+        from ai.models.rule_based_categorizer import RuleBasedCategorizer
+        categorizer = RuleBasedCategorizer()
+        result = categorizer.predict(description)
+    elif model_type == 'ml_primary':
+        # ML Enhanced categorizer
+        from ai.models.rule_based_categorizer import RuleBasedCategorizer
+        categorizer = RuleBasedCategorizer()
+        result = categorizer.predict(description)
+        result['method'] = 'ml_primary'
+        result['confidence'] = 0.92
+    elif model_type == 'smol_vlm':
+        # SmolVLM simulation with enhanced logic
+        from ai.models.rule_based_categorizer import RuleBasedCategorizer
+        categorizer = RuleBasedCategorizer()
+        result = categorizer.predict(description)
+        result['method'] = 'smol_vlm'
+        result['confidence'] = 0.88
+    else:  # auto
+        service = CategorizationService()
+        result = service.categorize(description, client_key=client_key)
+    
+    return result
+
 @csrf_exempt
 def demo_categorize(request):
     """Live AI categorization endpoint for demo"""
@@ -38,34 +67,29 @@ def demo_categorize(request):
         description = data.get('description', '')
         model_type = data.get('model', 'auto')
         
-        service = CategorizationService()
+        result = _demo_predict(description, model_type, client_key=client_key_for(request))
+        
+        return JsonResponse(result)
+    
+    return JsonResponse({'error': 'POST required'})
+
+async def demo_categorize_async(request):
+    """Live AI categorization for the ASGI path, offloaded to the inference pool"""
+    if request.method == 'POST':
+        data = json.loads(request.body)
+        description = data.get('description', '')
+        model_type = data.get('model', 'auto')
         
-        # Route to specific model based on selection
-        if model_type == 'rule_based':
-            from ai.models.rule_based_categorizer import RuleBasedCategorizer
-            categorizer = RuleBasedCategorizer()
-            result = categorizer.predict(description)
-        elif model_type == 'ml_primary':
-            # ML Enhanced categorizer
-            from ai.models.rule_based_categorizer import RuleBasedCategorizer
-            categorizer = RuleBasedCategorizer()
-            result = categorizer.predict(description)
-            result['method'] = 'ml_primary'
-            result['confidence'] = 0.92
-        elif model_type == 'smol_vlm':
-            # SmolVLM simulation with enhanced logic
-            from ai.models.rule_based_categorizer import RuleBasedCategorizer
-            categorizer = RuleBasedCategorizer()
-            result = categorizer.predict(description)
-            result['method'] = 'smol_vlm'
-            result['confidence'] = 0.88
-        else:  # auto
-            result = service.categorize(description)
+        predict = partial(_demo_predict, model_type=model_type, client_key=client_key_for(request))
+        result = await inference_executor.acategorize(predict, description)
         
         return JsonResponse(result)
     
     return JsonResponse({'error': 'POST required'})
 
+# csrf_exempt is not coroutine-aware on Django 4.2, so mark the view directly
+demo_categorize_async.csrf_exempt = True
+
 def demo_analytics(request):
     """Demo analytics dashboard"""
     # Create demo user if not exists
@@ -79,7 +103,7 @@ def demo_analytics(request):
         _create_demo_data(demo_user)
     
     # Generate insights
-    generator = InsightsGenerator(demo_user)
+    generator = get_insights_generator(demo_user)
     insights = generator.get_monthly_summary()
     top_categories = generator.get_top_categories()
     anomalies = generator.detect_anomalies()
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ExpensesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'expenses'
\ No newline at end of file
+    name = 'expenses'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,156 @@
+import zlib
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal
+import numpy as np
+from .models import DEFAULT_CURRENCY, Expense
+from .text import normalize_description
+
+DuplicateMatch = namedtuple('DuplicateMatch', ['expense_id', 'duplicate_of', 'similarity'])
+
+# Mersenne-style prime above 2**32; with a < 2**31 the hash a*x + b fits in uint64
+_PRIME = np.uint64(4294967311)
+
+
+def shingles(description, size=3):
+    """Character shingles of the normalized description"""
+    text = normalize_description(description)
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def amount_key(amount):
+    """Amount in pesewas, the blocking key shared by duplicates"""
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+class DuplicateDetector:
+    """
+    Near-duplicate expenses of one user: same amount in the same currency,
+    dates within window_days, and similar descriptions.
+
+    Descriptions are MinHashed over character shingles and indexed with
+    LSH; each bucket key also carries the currency and amount, so a lookup
+    only ever sees expenses of the same amount that share a band with the
+    query.
+    """
+
+    def __init__(self, window_days=3, threshold=0.6, num_perm=64, bands=16, seed=1):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.window_days = window_days
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._signatures = {}
+        self._entries = {}
+        self._buckets = defaultdict(list)
+
+    def signature(self, description):
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(description)), dtype=np.uint64
+        )
+        # One row per permutation, reduced over all shingles at once
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _signature_for(self, description):
+        key = normalize_description(description)
+        signature = self._signatures.get(key)
+        if signature is None:
+            signature = self._signatures[key] = self.signature(description)
+        return signature
+
+    def _bucket_keys(self, currency, amount, signature):
+        cents = amount_key(amount)
+        band_values = signature.reshape(self.bands, self.rows_per_band)
+        return [(currency, cents, band, band_values[band].tobytes()) for band in range(self.bands)]
+
+    def add(self, expense_id, description, amount, day, currency=DEFAULT_CURRENCY):
+        signature = self._signature_for(description)
+        self._entries[expense_id] = (signature, day)
+        for key in self._bucket_keys(currency, amount, signature):
+            self._buckets[key].append(expense_id)
+
+    def matches(self, description, amount, day, currency=DEFAULT_CURRENCY, exclude_id=None):
+        """Indexed expenses that look like duplicates, most similar first"""
+        signature = self._signature_for(description)
+        candidates = set()
+        for key in self._bucket_keys(currency, amount, signature):
+            candidates.update(self._buckets.get(key, ()))
+        candidates.discard(exclude_id)
+
+        window = timedelta(days=self.window_days)
+        found = []
+        for candidate in candidates:
+            other_signature, other_day = self._entries[candidate]
+            if abs(other_day - day) > window:
+                continue
+            similarity = float(np.mean(signature == other_signature))
+            if similarity >= self.threshold:
+                found.append((candidate, similarity))
+        found.sort(key=lambda item: (-item[1], item[0]))
+        return found
+
+    def scan(self, rows):
+        """
+        Index rows of (id, description, amount, date, currency) in date
+        order and report each row that duplicates an earlier one.
+        """
+        duplicates = []
+        for expense_id, description, amount, day, currency in sorted(rows, key=lambda row: (row[3], row[0])):
+            found = self.matches(description, amount, day, currency)
+            if found:
+                original, similarity = found[0]
+                duplicates.append(DuplicateMatch(expense_id, original, round(similarity, 2)))
+            self.add(expense_id, description, amount, day, currency)
+        return duplicates
+
+
+def _user_rows(user, date_from=None, date_to=None):
+    queryset = Expense.objects.filter(user=user).order_by()
+    if date_from is not None:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(date__lte=date_to)
+    return queryset.values_list('id', 'description', 'amount', 'date', 'currency').iterator(chunk_size=2000)
+
+
+def find_duplicates(user, **options):
+    """Every expense of user that duplicates an earlier one"""
+    return DuplicateDetector(**options).scan(_user_rows(user))
+
+
+def find_matches(user, description, amount, day, currency=DEFAULT_CURRENCY, exclude_id=None, **options):
+    """
+    Existing expenses that the given one would duplicate.
+
+    For a single write the amount, currency and date window already narrow
+    the candidates to a handful of rows, so they are fetched directly.
+    """
+    detector = DuplicateDetector(**options)
+    window = timedelta(days=detector.window_days)
+    candidates = Expense.objects.filter(
+        user=user, amount=amount, currency=currency, date__gte=day - window, date__lte=day + window
+    ).exclude(id=exclude_id).order_by().values_list('id', 'description', 'amount', 'date', 'currency')
+    for row in candidates:
+        detector.add(*row)
+    return detector.matches(description, amount, day, currency)
+
+
+def detector_for_import(user, rows, **options):
+    """
+    Detector preloaded with the user's expenses around the dates of an
+    import batch (rows of description, amount, date, currency), ready for
+    matches()
+    """
+    detector = DuplicateDetector(**options)
+    if rows:
+        window = timedelta(days=detector.window_days)
+        days = [row[2] for row in rows]
+        for row in _user_rows(user, min(days) - window, max(days) + window):
+            detector.add(*row)
+    return detector
\ No newline at end of file
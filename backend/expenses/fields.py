@@ -0,0 +1,127 @@
+from decimal import Decimal
+from django.conf import settings
+from django.db import models
+
+
+def compact_storage():
+    """Whether expense amounts and categories are stored compactly (opt-in)"""
+    return getattr(settings, 'EXPENSES_COMPACT_STORAGE', False)
+
+
+class MinorUnitAmountField(models.DecimalField):
+    """
+    A DecimalField that, with EXPENSES_COMPACT_STORAGE, is stored as an
+    integer count of minor units (pesewas); Python, forms and serializers
+    see a Decimal with decimal_places either way.
+
+    Compactly stored, SUM and GROUP BY run on integers. Expressions whose
+    output field Django derives as a plain DecimalField (Case, Coalesce,
+    arithmetic) must pass this field as output_field to be converted back
+    from minor units; Avg is better derived from Sum and Count, as its
+    result is not integral.
+    """
+
+    def get_internal_type(self):
+        return 'BigIntegerField' if compact_storage() else 'DecimalField'
+
+    @property
+    def _scale(self):
+        return Decimal(10) ** self.decimal_places
+
+    def stored_units(self):
+        """What one unit of amount is stored as, for reading raw column values"""
+        return 10 ** self.decimal_places if compact_storage() else 1
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not compact_storage():
+            return super().get_db_prep_value(value, connection, prepared)
+        if value is None:
+            return None
+        minor = self.to_python(value) * self._scale
+        integral = minor.to_integral_value()
+        # Lookups (amount__gt=12.345) may fall between two stored values
+        return int(integral) if minor == integral else float(minor)
+
+    def get_db_prep_save(self, value, connection):
+        if not compact_storage():
+            return super().get_db_prep_save(value, connection)
+        # DecimalField adapts saves to a decimal string; store the integer instead
+        return self.get_db_prep_value(value, connection)
+
+    def to_python(self, value):
+        if isinstance(value, float):
+            value = Decimal(str(value))
+        return super().to_python(value)
+
+    def get_db_converters(self, connection):
+        # Standard storage reads plain decimals and needs no converter per row
+        if compact_storage():
+            return [self._from_minor_units] + super().get_db_converters(connection)
+        return super().get_db_converters(connection)
+
+    def _from_minor_units(self, value, expression, connection):
+        if value is None:
+            return None
+        return Decimal(int(value)).scaleb(-self.decimal_places)
+
+
+class CategoryCodeField(models.CharField):
+    """
+    A choice field that, with EXPENSES_COMPACT_STORAGE, is stored as the
+    small integer `codes` assigns to each choice value.
+
+    Python and the API keep seeing the choice strings; queries such as
+    filter(category='food') are translated to the code. Codes are part of
+    the stored data and independent of the order of choices: a new choice
+    takes an unused code, and a code is never renumbered or reused.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.codes = dict(codes or {})
+        missing = [value for value, _ in self.flatchoices if value not in self.codes]
+        if missing:
+            raise ValueError(f'CategoryCodeField choices {missing} have no code')
+        if len(set(self.codes.values())) != len(self.codes):
+            raise ValueError('CategoryCodeField codes must be unique')
+        self._values = {code: value for value, code in self.codes.items()}
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'PositiveSmallIntegerField' if compact_storage() else 'CharField'
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if not compact_storage():
+            return value
+        if value is None or value == '':
+            return None
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f'{value!r} is not a valid choice for {self.name}')
+
+    def _value(self, code):
+        try:
+            return self._values[int(code)]
+        except KeyError:
+            raise ValueError(f'{code!r} is not a stored code of {self.name}')
+
+    def get_db_converters(self, connection):
+        if compact_storage():
+            return [self._from_code] + super().get_db_converters(connection)
+        return super().get_db_converters(connection)
+
+    def _from_code(self, value, expression, connection):
+        if value is None:
+            return None
+        return self._value(value)
+
+    def to_python(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self._value(value)
+        return super().to_python(value)
\ No newline at end of file
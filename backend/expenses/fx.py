@@ -0,0 +1,141 @@
+import threading
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.db.models import Case, F, OuterRef, Subquery, When
+from django.db.models.functions import Coalesce, Round
+import numpy as np
+from .fields import compact_storage
+from .models import Expense, FxRate
+
+
+def reporting_currency():
+    return getattr(settings, 'FX_REPORTING_CURRENCY', 'GHS')
+
+
+def reporting_amount(amount='amount', currency='currency', day='date'):
+    """
+    Expression for an expense amount in the reporting currency, for use
+    inside aggregates: Sum(reporting_amount()).
+
+    Rows already in the reporting currency pass through; others are
+    multiplied by the latest rate on or before their date (or the earliest
+    rate when the expense predates the table) with one indexed lookup.
+    The result is rounded to whole minor units like the stored amounts.
+    """
+    rates = FxRate.objects.filter(currency=OuterRef(currency)).values('rate')
+    rate = Coalesce(
+        Subquery(rates.filter(date__lte=OuterRef(day)).order_by('-date')[:1]),
+        Subquery(rates.order_by('date')[:1]),
+    )
+    amount_field = Expense._meta.get_field('amount')
+    # Compactly stored amounts are already counted in minor units
+    places = 0 if compact_storage() else amount_field.decimal_places
+    return Case(
+        When(**{currency: reporting_currency()}, then=F(amount)),
+        default=Round(F(amount) * rate, places),
+        output_field=amount_field,
+    )
+
+
+class FxRateCache:
+    """
+    The FxRate table in memory: per currency, the rate days (date ordinals)
+    sorted ascending with their rates as float64 arrays.
+
+    Scalar lookups are memoized by (currency, date); array conversion
+    resolves every row of a currency with one searchsorted. The table is
+    reloaded after `timeout` seconds so rates loaded by another process
+    are picked up.
+    """
+
+    def __init__(self, timeout: float = 3600.0):
+        self.timeout = timeout
+        self._rates = None
+        self._memo = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _table(self):
+        with self._lock:
+            if self._rates is not None and time.monotonic() - self._loaded_at < self.timeout:
+                return self._rates
+
+        columns = {}
+        for currency, day, rate in FxRate.objects.order_by('currency', 'date').values_list('currency', 'date', 'rate'):
+            days, rates = columns.setdefault(currency, ([], []))
+            days.append(day.toordinal())
+            rates.append(float(rate))
+        table = {
+            currency: (np.asarray(days, dtype=np.int64), np.asarray(rates, dtype=np.float64))
+            for currency, (days, rates) in columns.items()
+        }
+        with self._lock:
+            self._rates = table
+            self._memo = {}
+            self._loaded_at = time.monotonic()
+        return table
+
+    def invalidate(self):
+        with self._lock:
+            self._rates = None
+            self._memo = {}
+
+    def currencies(self):
+        return {reporting_currency(), *self._table()}
+
+    def _lookup(self, currency, days):
+        """Rates for date ordinals `days`, falling back to the earliest rate"""
+        rate_days, rates = self._table()[currency]
+        index = np.searchsorted(rate_days, days, side='right') - 1
+        return rates[np.maximum(index, 0)]
+
+    def rate(self, currency, day):
+        """Value of one unit of currency on day in the reporting currency"""
+        if currency == reporting_currency():
+            return 1.0
+        key = (currency, day)
+        rate = self._memo.get(key)
+        if rate is None:
+            if currency not in self._table():
+                raise KeyError(f'No FX rates for {currency}')
+            rate = self._memo[key] = float(self._lookup(currency, np.asarray([day.toordinal()]))[0])
+        return rate
+
+    def convert_minor(self, amounts, currencies, days):
+        """
+        Vectorized conversion of minor-unit amounts (int64) in `currencies`
+        on date ordinals `days` to reporting minor units, rounded half up.
+        """
+        amounts = np.asarray(amounts, dtype=np.int64)
+        currencies = np.asarray(currencies)
+        days = np.asarray(days, dtype=np.int64)
+        converted = amounts.copy()
+        for currency in np.unique(currencies):
+            if currency == reporting_currency():
+                continue
+            if currency not in self._table():
+                raise KeyError(f'No FX rates for {currency}')
+            mask = currencies == currency
+            converted[mask] = np.floor(amounts[mask] * self._lookup(currency, days[mask]) + 0.5)
+        return converted
+
+    def convert(self, amount, currency, day):
+        """A single Decimal amount in the reporting currency, rounded like convert_minor"""
+        if currency == reporting_currency():
+            return amount
+        minor = (Decimal(str(amount)) * 100).to_integral_value()
+        return Decimal(int(np.floor(float(minor) * self.rate(currency, day) + 0.5))).scaleb(-2)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_rate_cache() -> FxRateCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FxRateCache(timeout=settings.FX_RATE_CACHE_TIMEOUT)
+    return _cache
\ No newline at end of file
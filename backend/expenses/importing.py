@@ -0,0 +1,57 @@
+from django.db import transaction
+from ai.services.auto_categorization import queue_model_predictions, rule_category
+from .models import DEFAULT_CURRENCY, Expense, snapshot
+from .signals import expense_changed
+from . import dedup
+
+
+def import_rows(user, items, skip_duplicates=True):
+    """
+    Create expenses from validated serializer rows for user.
+
+    Rows that duplicate an existing expense (or an earlier row of the same
+    import) are skipped unless skip_duplicates is false, in which case they
+    are created and reported. Rows without a category get one from keyword
+    rules, refined later by a model job. Returns (created expenses,
+    duplicates).
+    """
+    rows = [
+        (item['description'], item['amount'], item['date'], item.get('currency', DEFAULT_CURRENCY))
+        for item in items
+    ]
+    detector = dedup.detector_for_import(user, rows)
+    to_create, duplicates = [], []
+    # Positions in to_create of rows given no category
+    auto_categorized = set()
+    for index, item in enumerate(items):
+        found = detector.matches(*rows[index])
+        if found:
+            # Negative ids are rows earlier in this import
+            duplicate_of, similarity = found[0]
+            duplicates.append({
+                'index': index,
+                'duplicate_of': duplicate_of if duplicate_of > 0 else None,
+                'duplicate_of_index': -duplicate_of - 1 if duplicate_of < 0 else None,
+                'similarity': round(similarity, 2),
+            })
+            if skip_duplicates:
+                continue
+        detector.add(-index - 1, *rows[index])
+        ai_predicted = item.pop('ai_predicted', False)
+        item.pop('ai_confidence', None)
+        if 'category' not in item:
+            item['category'] = item['ai_predicted_category'] = rule_category(user, item['description'])
+            item['auto_categorized'] = True
+            auto_categorized.add(len(to_create))
+        elif ai_predicted:
+            item['ai_predicted_category'] = item['category']
+        to_create.append(Expense(user=user, **item))
+
+    with transaction.atomic():
+        created = Expense.objects.bulk_create(to_create)
+    # bulk_create skips post_save, so tell derived data about the new rows here
+    for expense in created:
+        expense_changed.send(sender=Expense, user_id=user.id, old=None, new=snapshot(expense), created=True)
+    # One model job for every uncategorized row of the import
+    queue_model_predictions(created[index].id for index in sorted(auto_categorized))
+    return created, duplicates
\ No newline at end of file
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from expenses.fields import compact_storage
+from expenses.models import Expense
+from expenses.storage import convert_expense_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert stored expenses to the storage EXPENSES_COMPACT_STORAGE selects: integer pesewas "
+        "and category codes when it is set, decimal amounts and category strings otherwise. "
+        "Run it after changing the setting, before the application serves requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to convert')
+
+    def handle(self, **options):
+        storage = 'compact' if compact_storage() else 'standard'
+        with connections[options['database']].schema_editor() as schema_editor:
+            converted = convert_expense_storage(schema_editor, Expense, Expense.CATEGORY_CODES)
+        if converted:
+            self.stdout.write(self.style.SUCCESS(f"Converted expenses to {storage} storage"))
+        else:
+            self.stdout.write(f"Expenses already use {storage} storage")
\ No newline at end of file
@@ -0,0 +1,57 @@
+import csv
+from decimal import Decimal, InvalidOperation
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from expenses.fx import get_rate_cache, reporting_currency
+from expenses.models import FxRate
+from expenses.versioning import bump_all_data_versions
+from jobs.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Load daily exchange rates from CSV files with date,currency,rate columns, "
+        "where rate is the value of one unit of currency in the reporting currency. "
+        "Existing rates for the same currency and date are replaced."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='CSV files to load')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rates written per INSERT')
+
+    def handle(self, **options):
+        rates = {}
+        for path in options['files']:
+            with open(path, newline='') as stream:
+                for line, row in enumerate(csv.DictReader(stream), start=2):
+                    try:
+                        day = parse_date(row['date'].strip())
+                        currency = row['currency'].strip().upper()
+                        rate = Decimal(row['rate'].strip())
+                    except (KeyError, AttributeError, ValueError, InvalidOperation):
+                        raise CommandError(f"{path}:{line}: expected date,currency,rate")
+                    if day is None or len(currency) != 3 or rate <= 0:
+                        raise CommandError(f"{path}:{line}: invalid rate {row}")
+                    if currency == reporting_currency():
+                        continue
+                    # Later files win for the same currency and day
+                    rates[(currency, day)] = rate
+
+        with transaction.atomic():
+            FxRate.objects.bulk_create(
+                [FxRate(currency=currency, date=day, rate=rate) for (currency, day), rate in rates.items()],
+                batch_size=options['batch_size'],
+                update_conflicts=True,
+                unique_fields=['currency', 'date'],
+                update_fields=['rate'],
+            )
+            # Converted totals change for everyone holding these currencies
+            bump_all_data_versions()
+            # Stored budget totals were summed at the old rates
+            enqueue('budgets.rebuild_totals', dedup_key='budgets.rebuild_totals')
+        get_rate_cache().invalidate()
+
+        currencies = sorted({currency for currency, _ in rates})
+        self.stdout.write(f"Loaded {len(rates)} rates for {', '.join(currencies) or 'no currencies'}")
\ No newline at end of file
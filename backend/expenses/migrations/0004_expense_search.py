@@ -0,0 +1,77 @@
+from django.db import migrations, OperationalError
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE expenses_expense_fts USING fts5(
+        description,
+        content='expenses_expense',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER expenses_expense_fts_insert AFTER INSERT ON expenses_expense BEGIN
+        INSERT INTO expenses_expense_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER expenses_expense_fts_delete AFTER DELETE ON expenses_expense BEGIN
+        INSERT INTO expenses_expense_fts(expenses_expense_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER expenses_expense_fts_update AFTER UPDATE OF description ON expenses_expense BEGIN
+        INSERT INTO expenses_expense_fts(expenses_expense_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO expenses_expense_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    "INSERT INTO expenses_expense_fts(expenses_expense_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS expenses_expense_fts_update",
+    "DROP TRIGGER IF EXISTS expenses_expense_fts_delete",
+    "DROP TRIGGER IF EXISTS expenses_expense_fts_insert",
+    "DROP TABLE IF EXISTS expenses_expense_fts",
+]
+
+# Must match the expression SearchVector('description', config='simple') compiles to
+POSTGRESQL_FORWARD = [
+    """
+    CREATE INDEX IF NOT EXISTS expenses_expense_description_search
+    ON expenses_expense USING GIN (to_tsvector('simple'::regconfig, COALESCE(description, '')))
+    """,
+]
+
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS expenses_expense_description_search",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        try:
+            for statement in statements:
+                schema_editor.execute(statement)
+        except OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE search
+            print(f"Skipping full-text search index: {e}")
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0003_category_correction'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRESQL_REVERSE}),
+        ),
+    ]
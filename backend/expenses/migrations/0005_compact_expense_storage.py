@@ -0,0 +1,24 @@
+from django.db import migrations
+import expenses.fields
+import expenses.storage
+
+CATEGORY_CHOICES = [('food', 'Food & Dining'), ('transport', 'Transportation'), ('shopping', 'Shopping'), ('entertainment', 'Entertainment'), ('bills', 'Bills & Utilities'), ('healthcare', 'Healthcare'), ('education', 'Education'), ('travel', 'Travel'), ('other', 'Other')]
+CATEGORY_CODES = {'food': 0, 'transport': 1, 'shopping': 2, 'entertainment': 3, 'bills': 4, 'healthcare': 5, 'education': 6, 'travel': 7, 'other': 8}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0004_expense_search'),
+    ]
+
+    operations = [
+        # The columns change only when EXPENSES_COMPACT_STORAGE is set
+        expenses.storage.ConvertExpenseStorage(
+            fields=[
+                ('amount', expenses.fields.MinorUnitAmountField(decimal_places=2, max_digits=10)),
+                ('category', expenses.fields.CategoryCodeField(choices=CATEGORY_CHOICES, codes=CATEGORY_CODES, max_length=20)),
+                ('ai_predicted_category', expenses.fields.CategoryCodeField(blank=True, choices=CATEGORY_CHOICES, codes=CATEGORY_CODES, max_length=20, null=True)),
+            ],
+        ),
+    ]
\ No newline at end of file
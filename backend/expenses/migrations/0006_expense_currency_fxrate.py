@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:01
+
+from django.db import migrations, models
+import expenses.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0005_compact_expense_storage'),
+    ]
+
+    operations = [
+        # Adding or removing the column rebuilds the table on SQLite
+        migrations.RunPython(migrations.RunPython.noop, expenses.search.restore_search_triggers),
+        migrations.CreateModel(
+            name='FxRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('date', models.DateField()),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+            ],
+            options={
+                'ordering': ['currency', 'date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='currency',
+            field=models.CharField(default='GHS', max_length=3),
+        ),
+        migrations.RunPython(expenses.search.restore_search_triggers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='fxrate',
+            constraint=models.UniqueConstraint(fields=('currency', 'date'), name='unique_fx_rate_per_day'),
+        ),
+    ]
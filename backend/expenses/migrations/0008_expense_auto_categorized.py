@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:44
+
+from django.db import migrations, models
+from django.db.models import F
+import expenses.search
+
+
+def mark_auto_categorized(apps, schema_editor):
+    # Rows the server categorized carry the same value in both columns. Rows
+    # where the user accepted an AI suggestion look the same and are marked
+    # too: erring this way keeps them out of the user's description memory.
+    Expense = apps.get_model('expenses', 'Expense')
+    Expense.objects.filter(
+        category=F('ai_predicted_category'), corrections__isnull=True
+    ).update(auto_categorized=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0007_user_data_version'),
+    ]
+
+    operations = [
+        # Adding or removing the column rebuilds the table on SQLite
+        migrations.RunPython(migrations.RunPython.noop, expenses.search.restore_search_triggers),
+        migrations.AddField(
+            model_name='expense',
+            name='auto_categorized',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(expenses.search.restore_search_triggers, migrations.RunPython.noop),
+        migrations.RunPython(mark_auto_categorized, migrations.RunPython.noop),
+    ]
\ No newline at end of file
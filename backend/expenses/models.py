@@ -1,8 +1,28 @@
+from collections import namedtuple
 from django.db import models
 from django.contrib.auth import get_user_model
+from .fields import MinorUnitAmountField, CategoryCodeField
 
 User = get_user_model()
 
+DEFAULT_CURRENCY = 'GHS'
+
+# Immutable view of the fields that derived data (caches, totals, indexes) depend on
+ExpenseSnapshot = namedtuple('ExpenseSnapshot', [
+    'id', 'user_id', 'description', 'category', 'amount', 'date', 'currency', 'auto_categorized',
+])
+
+SNAPSHOT_FIELDS = ExpenseSnapshot._fields
+
+
+def snapshot(expense):
+    """Snapshot an Expense instance, or None if a needed field is deferred"""
+    deferred = expense.get_deferred_fields()
+    if deferred and any(field in deferred for field in SNAPSHOT_FIELDS):
+        return None
+    return ExpenseSnapshot(*(getattr(expense, field) for field in SNAPSHOT_FIELDS))
+
+
 class Expense(models.Model):
     CATEGORY_CHOICES = [
         ('food', 'Food & Dining'),
@@ -15,12 +35,25 @@ class Expense(models.Model):
         ('travel', 'Travel'),
         ('other', 'Other'),
     ]
+    # Stored category codes with compact storage: never renumber or reuse
+    # a code, a new category takes the next unused one
+    CATEGORY_CODES = {
+        'food': 0, 'transport': 1, 'shopping': 2, 'entertainment': 3, 'bills': 4,
+        'healthcare': 5, 'education': 6, 'travel': 7, 'other': 8,
+    }
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='expenses')
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # With EXPENSES_COMPACT_STORAGE, stored as integer pesewas and category
+    # codes; Python and the API still see Decimal amounts and category strings
+    amount = MinorUnitAmountField(max_digits=10, decimal_places=2)
     description = models.CharField(max_length=255)
-    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
-    ai_predicted_category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, null=True, blank=True)
+    category = CategoryCodeField(max_length=20, choices=CATEGORY_CHOICES, codes=CATEGORY_CODES)
+    ai_predicted_category = CategoryCodeField(max_length=20, choices=CATEGORY_CHOICES, codes=CATEGORY_CODES,
+                                              null=True, blank=True)
+    # The category was assigned by the server, not chosen or confirmed by the user
+    auto_categorized = models.BooleanField(default=False)
+    # ISO 4217 code; reports convert other currencies through FxRate
+    currency = models.CharField(max_length=3, default=DEFAULT_CURRENCY)
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -28,5 +61,55 @@ class Expense(models.Model):
     class Meta:
         ordering = ['-date', '-created_at']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Keep the loaded values so writes can report what changed
+        instance._loaded_snapshot = snapshot(instance)
+        return instance
+
+    def __str__(self):
+        if self.currency != DEFAULT_CURRENCY:
+            return f"{self.description} - {self.currency} {self.amount}"
+        return f"{self.description} - GH₵{self.amount}"
+
+class CategoryCorrection(models.Model):
+    """Append-only log of user category overrides, used as training feedback"""
+    expense = models.ForeignKey(Expense, on_delete=models.CASCADE, related_name='corrections')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='category_corrections')
+    predicted_category = models.CharField(max_length=20, choices=Expense.CATEGORY_CHOICES, null=True, blank=True)
+    corrected_category = models.CharField(max_length=20, choices=Expense.CATEGORY_CHOICES)
+    model_version = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['user', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.expense_id}: {self.predicted_category} -> {self.corrected_category}"
+
+class FxRate(models.Model):
+    """Daily exchange rate: the value of one unit of currency in the reporting currency"""
+    currency = models.CharField(max_length=3)
+    date = models.DateField()
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+
+    class Meta:
+        ordering = ['currency', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['currency', 'date'], name='unique_fx_rate_per_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.currency} {self.date}: {self.rate}"
+
+
+class UserDataVersion(models.Model):
+    """Counter bumped on every write to a user's expenses; drives ETag and Last-Modified"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
     def __str__(self):
-        return f"{self.description} - GH₵{self.amount}"
\ No newline at end of file
+        return f"{self.user_id}: v{self.version}"
\ No newline at end of file
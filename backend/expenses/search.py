@@ -0,0 +1,114 @@
+import re
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+FTS_TABLE = 'expenses_expense_fts'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+_fts_available = {}
+
+
+# Keep the FTS table in step with expenses_expense (created by migration 0004)
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON expenses_expense BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON expenses_expense BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF description ON expenses_expense BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+]
+
+
+def restore_search_triggers(apps, schema_editor):
+    """
+    Migration step for schema changes that make SQLite rebuild
+    expenses_expense, which drops the triggers; row ids, and so the index,
+    are unchanged.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or FTS_TABLE not in connection.introspection.table_names():
+        return
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def search_terms(query):
+    return _TOKEN.findall(query.lower())
+
+
+def _has_fts_table(alias):
+    if alias not in _fts_available:
+        with connections[alias].cursor() as cursor:
+            _fts_available[alias] = FTS_TABLE in connections[alias].introspection.table_names(cursor)
+    return _fts_available[alias]
+
+
+def search_expenses(queryset, query):
+    """
+    Filter queryset to expenses whose description matches every term of
+    query (each term also matches as a prefix) and annotate search_rank,
+    where lower is a better match.
+
+    Uses the FTS5 table on SQLite and the GIN-indexed tsvector on
+    PostgreSQL; other backends fall back to icontains. query must
+    contain at least one word.
+    """
+    terms = search_terms(query)
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite' and _has_fts_table(queryset.db):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # A join (rather than a correlated subquery) lets bm25() score all
+        # matches in a single pass over the index
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = expenses_expense.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE})'},
+        )
+
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector('description', config='simple')
+        search_query = SearchQuery(' & '.join(f'{term}:*' for term in terms), config='simple', search_type='raw')
+        return queryset.annotate(search_vector=vector).filter(search_vector=search_query).annotate(
+            search_rank=-SearchRank(F('search_vector'), search_query)
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(description__icontains=term)
+    return queryset.filter(condition).annotate(search_rank=RawSQL('0', []))
+
+
+class DescriptionSearchFilter(BaseFilterBackend):
+    """
+    ?q= full-text search over descriptions.
+
+    Results are ordered by relevance unless the request asks for an
+    explicit ?ordering=, so list it after OrderingFilter.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        if not search_terms(query):
+            return queryset.none()
+        queryset = search_expenses(queryset, query)
+        if 'ordering' not in request.query_params:
+            queryset = queryset.order_by('search_rank', '-date', '-id')
+        return queryset
\ No newline at end of file
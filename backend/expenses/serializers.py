@@ -1,4 +1,9 @@
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
 from rest_framework import serializers
+from ai.services.auto_categorization import queue_model_predictions, rule_category
+from .fx import get_rate_cache
 from .models import Expense
 
 class ExpenseSerializer(serializers.ModelSerializer):
@@ -8,21 +13,88 @@ class ExpenseSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Expense
-        fields = ['id', 'amount', 'description', 'category', 'ai_predicted_category', 'date', 'created_at', 'updated_at', 'ai_predicted', 'ai_predicted_read', 'ai_confidence']
+        fields = ['id', 'amount', 'currency', 'description', 'category', 'ai_predicted_category', 'date', 'created_at', 'updated_at', 'ai_predicted', 'ai_predicted_read', 'ai_confidence']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # Left out, the server categorizes the expense (see create)
+        extra_kwargs = {'category': {'required': False}}
     
     def get_ai_predicted_read(self, obj):
         return obj.ai_predicted_category is not None
 
+    def validate_currency(self, value):
+        value = value.upper()
+        # Reports could not convert a currency without rates
+        if value not in get_rate_cache().currencies():
+            raise serializers.ValidationError(f'No exchange rates loaded for {value}')
+        return value
+
     def create(self, validated_data):
         # Handle frontend fields
         ai_predicted_input = validated_data.pop('ai_predicted', False)
         ai_confidence = validated_data.pop('ai_confidence', None)
         
+        auto_categorize = 'category' not in validated_data
+        if auto_categorize:
+            # Keywords now; the trained model's prediction follows from a background job
+            validated_data['category'] = validated_data['ai_predicted_category'] = rule_category(
+                validated_data.get('user'), validated_data['description']
+            )
+            validated_data['auto_categorized'] = True
         # Set ai_predicted_category if this was AI categorized
-        if ai_predicted_input:
+        elif ai_predicted_input:
             validated_data['ai_predicted_category'] = validated_data['category']
         
         expense = super().create(validated_data)
+        if auto_categorize:
+            queue_model_predictions([expense.id])
         print(f"Created expense: {expense.id}, ai_predicted_category: {expense.ai_predicted_category}")  # Debug
-        return expense
\ No newline at end of file
+        return expense
+
+    def update(self, instance, validated_data):
+        validated_data.pop('ai_predicted', None)
+        validated_data.pop('ai_confidence', None)
+        if 'category' in validated_data:
+            # A category sent by the client is the user's choice
+            validated_data['auto_categorized'] = False
+        return super().update(instance, validated_data)
+
+
+# Columns of ExpenseSerializer's output, in its field order
+LIST_FIELDS = ['id', 'amount', 'currency', 'description', 'category', 'ai_predicted_category', 'date', 'created_at', 'updated_at']
+
+
+def _datetime_representation(value):
+    # As serializers.DateTimeField renders it
+    if settings.USE_TZ:
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def expense_list_data(queryset):
+    """
+    ExpenseSerializer(queryset, many=True).data without building model
+    instances or serializer fields: one .values() query with
+    ai_predicted_read computed in SQL, formatted row by row.
+    """
+    rows = queryset.annotate(
+        ai_predicted_read=ExpressionWrapper(Q(ai_predicted_category__isnull=False), output_field=BooleanField())
+    ).values_list(*LIST_FIELDS, 'ai_predicted_read')
+    return [
+        {
+            'id': expense_id,
+            'amount': format(amount, 'f'),
+            'currency': currency,
+            'description': description,
+            'category': category,
+            'ai_predicted_category': ai_predicted_category,
+            'date': day.isoformat(),
+            'created_at': _datetime_representation(created_at),
+            'updated_at': _datetime_representation(updated_at),
+            'ai_predicted_read': ai_predicted_read,
+        }
+        for (expense_id, amount, currency, description, category, ai_predicted_category, day,
+             created_at, updated_at, ai_predicted_read) in rows
+    ]
\ No newline at end of file
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Expense, snapshot
+
+# Sent after any expense write with user_id, old and new snapshots (old is None
+# on create, new is None on delete). Queryset update()/bulk paths that bypass
+# post_save must send it themselves.
+expense_changed = Signal()
+
+
+@receiver(post_save, sender=Expense)
+def _expense_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else getattr(instance, '_loaded_snapshot', None)
+    new = snapshot(instance)
+    instance._loaded_snapshot = new
+    expense_changed.send(sender=Expense, user_id=instance.user_id, old=old, new=new, created=created)
+
+
+@receiver(post_delete, sender=Expense)
+def _expense_deleted(sender, instance, **kwargs):
+    old = getattr(instance, '_loaded_snapshot', None) or snapshot(instance)
+    expense_changed.send(sender=Expense, user_id=instance.user_id, old=old, new=None, created=False)
+
+@receiver(expense_changed)
+def _bump_data_version(sender, user_id, **kwargs):
+    from .versioning import bump_data_versions
+    bump_data_versions([user_id])
\ No newline at end of file
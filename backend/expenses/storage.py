@@ -0,0 +1,109 @@
+from django.db import models
+from django.db.migrations.operations.base import Operation
+from .search import restore_search_triggers
+
+CODED_FIELDS = ('category', 'ai_predicted_category')
+
+
+def stored_compact(connection, table='expenses_expense'):
+    """Whether the expense table currently stores amounts as minor units"""
+    introspection = connection.introspection
+    with connection.cursor() as cursor:
+        for column in introspection.get_table_description(cursor, table):
+            if column.name == 'amount':
+                return introspection.get_field_type(column.type_code, column) == 'BigIntegerField'
+    return False
+
+
+def _plain(field, field_class, **kwargs):
+    plain = field_class(null=field.null, **kwargs)
+    plain.set_attributes_from_name(field.name)
+    return plain
+
+
+def _recode(schema_editor, table, field, mapping):
+    # Unknown values are left as they are, so a later cast fails loudly
+    column = schema_editor.quote_name(field.column)
+    whens = ' '.join('WHEN %s THEN %s' for _ in mapping)
+    params = [item for pair in mapping.items() for item in pair]
+    schema_editor.execute(f'UPDATE {table} SET {column} = CASE {column} {whens} ELSE {column} END', params)
+
+
+def convert_expense_storage(schema_editor, model, codes):
+    """
+    Convert the expense table to the storage `model`'s amount field uses:
+    integer minor units and category codes (compact) or decimal amounts and
+    category strings (standard). `codes` maps category values to codes.
+
+    Returns False when the table is already stored that way. Each step is
+    a plain column alter around an UPDATE, with the amount column widened
+    while it holds the other representation.
+    """
+    amount = model._meta.get_field('amount')
+    compact = amount.get_internal_type() == 'BigIntegerField'
+    if stored_compact(schema_editor.connection, model._meta.db_table) == compact:
+        return False
+    table = schema_editor.quote_name(model._meta.db_table)
+    column = schema_editor.quote_name(amount.column)
+    scale = 10 ** amount.decimal_places
+    digits = {'max_digits': amount.max_digits, 'decimal_places': amount.decimal_places}
+    standard = _plain(amount, models.DecimalField, **digits)
+    wide = _plain(amount, models.DecimalField, max_digits=amount.max_digits + amount.decimal_places,
+                  decimal_places=amount.decimal_places)
+    coded = [model._meta.get_field(name) for name in CODED_FIELDS]
+
+    if compact:
+        for field in coded:
+            _recode(schema_editor, table, field, {value: str(code) for value, code in codes.items()})
+        schema_editor.alter_field(model, standard, wide)
+        # ROUND keeps amounts stored as REAL on SQLite exact
+        schema_editor.execute(f'UPDATE {table} SET {column} = ROUND({column} * {scale})')
+        schema_editor.alter_field(model, wide, amount)
+        for field in coded:
+            schema_editor.alter_field(model, _plain(field, models.CharField, max_length=field.max_length), field)
+    else:
+        for field in coded:
+            schema_editor.alter_field(model, _plain(field, models.PositiveSmallIntegerField), field)
+            _recode(schema_editor, table, field, {str(code): value for value, code in codes.items()})
+        schema_editor.alter_field(model, _plain(amount, models.BigIntegerField), wide)
+        schema_editor.execute(f'UPDATE {table} SET {column} = {column} / {scale}.0')
+        schema_editor.alter_field(model, wide, amount)
+
+    # SQLite rebuilds the table for each alter, which drops its triggers
+    restore_search_triggers(None, schema_editor)
+    return True
+
+
+class ConvertExpenseStorage(Operation):
+    """
+    Migration operation that changes the expense amount and category fields
+    to `fields` (MinorUnitAmountField and CategoryCodeFields) and converts
+    the stored rows when EXPENSES_COMPACT_STORAGE selects compact storage.
+    Unapplying it converts back to the standard columns.
+    """
+
+    reversible = True
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'fields': self.fields}
+
+    def state_forwards(self, app_label, state):
+        for name, field in self.fields:
+            state.alter_field(app_label, 'expense', name, field, preserve_default=True)
+
+    def _convert(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, 'expense')
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            convert_expense_storage(schema_editor, model, dict(self.fields)['category'].codes)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._convert(app_label, schema_editor, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._convert(app_label, schema_editor, to_state)
+
+    def describe(self):
+        return 'Convert expense amounts and categories to the configured storage'
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""Background job handlers for expenses (see jobs.registry)"""
+from jobs.registry import register
+from .importing import import_rows
+from .serializers import ExpenseSerializer
+
+
+@register('expenses.import')
+def import_expenses(job):
+    """A deferred import: the request's rows, validated again and created for the job's user"""
+    serializer = ExpenseSerializer(data=job.payload['expenses'], many=True)
+    # Rows were validated when queued; only a change such as a removed currency fails here
+    serializer.is_valid(raise_exception=True)
+    skip_duplicates = job.payload.get('skip_duplicates', True)
+    created, duplicates = import_rows(job.user, serializer.validated_data, skip_duplicates)
+    return {
+        'created': len(created),
+        'skipped': len(duplicates) if skip_duplicates else 0,
+        'duplicates': duplicates,
+        'expense_ids': [expense.id for expense in created],
+    }
\ No newline at end of file
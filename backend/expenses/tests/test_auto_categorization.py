@@ -0,0 +1,107 @@
+import io
+from contextlib import redirect_stdout
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from ai.services import rescoring
+from ai.services.user_memory import get_user_memory
+from jobs.models import Job
+from jobs.worker import Worker
+
+User = get_user_model()
+
+class AutoCategorizationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        get_user_memory().clear()
+
+    def _create(self, description, **data):
+        data = dict({'amount': '15.00', 'description': description, 'date': '2024-03-01'}, **data)
+        response = self.client.post(reverse('expense-list-create'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def _run_jobs(self):
+        Job.objects.update(run_after=timezone.now())
+        with redirect_stdout(io.StringIO()):
+            Worker(worker_id='test').run(burst=True)
+
+    def test_create_without_category_uses_rules_immediately(self):
+        data = self._create('Waakye at the chop bar')
+        self.assertEqual(data['category'], 'food')
+        self.assertEqual(data['ai_predicted_category'], 'food')
+        self.assertTrue(data['ai_predicted_read'])
+
+    def test_model_prediction_follows_in_a_job(self):
+        data = self._create('ECG prepaid top up')
+        job = Job.objects.get(kind='ai.categorize_expenses')
+        self.assertEqual(job.payload['expense_ids'], [data['id']])
+        # Batched jobs wait for more creates before they are ready
+        self.assertGreater(job.run_after, job.created_at)
+
+        self._run_jobs()
+        expense = Expense.objects.get(id=data['id'])
+        pipeline = rescoring.load_pipeline(settings.AI_ML_MODEL_PATH)
+        self.assertEqual(expense.ai_predicted_category, pipeline.predict(['ECG prepaid top up'])[0])
+        self.assertEqual(expense.category, data['category'])
+        self.assertEqual(Job.objects.get(id=job.id).status, Job.DONE)
+
+    def test_creates_share_one_pending_job(self):
+        first = self._create('Trotro to Madina')
+        second = self._create('Shoprite groceries')
+        job = Job.objects.get(kind='ai.categorize_expenses')
+        self.assertEqual(job.payload['expense_ids'], [first['id'], second['id']])
+
+    def test_claimed_job_is_not_extended(self):
+        self._create('Trotro to Madina')
+        Job.objects.update(status=Job.RUNNING)
+        self._create('Shoprite groceries')
+        self.assertEqual(Job.objects.filter(kind='ai.categorize_expenses').count(), 2)
+
+    def test_only_user_chosen_categories_feed_the_memory(self):
+        data = self._create('Waakye at the chop bar')
+        self.assertTrue(Expense.objects.get(id=data['id']).auto_categorized)
+        # The keyword guess is not recalled as the user's own history
+        self.assertIsNone(get_user_memory().lookup(self.user.pk, 'Waakye at the chop bar'))
+
+        response = self.client.patch(reverse('expense-detail', args=[data['id']]), {'category': 'other'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Expense.objects.get(id=data['id']).auto_categorized)
+        self.assertEqual(get_user_memory().lookup(self.user.pk, 'Waakye at the chop bar'), 'other')
+
+    def test_user_history_beats_keywords(self):
+        self._create('Waakye at the chop bar', category='other')
+        self.assertEqual(self._create('Waakye at the chop bar')['category'], 'other')
+
+    def test_client_category_skips_the_job(self):
+        data = self._create('Waakye at the chop bar', category='other')
+        self.assertEqual(data['category'], 'other')
+        self.assertIsNone(data['ai_predicted_category'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_import_queues_one_job_for_uncategorized_rows(self):
+        rows = [
+            {'amount': '12.00', 'description': 'Waakye', 'date': '2024-03-01'},
+            {'amount': '5.00', 'description': 'Bolt ride home', 'category': 'transport', 'date': '2024-03-01'},
+            {'amount': '80.00', 'description': 'Legon school fees', 'date': '2024-03-02'},
+        ]
+        response = self.client.post(reverse('expense-import'), {'expenses': rows}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = {item['description']: item for item in response.data['expenses']}
+        self.assertEqual(created['Waakye']['category'], 'food')
+        self.assertEqual(created['Legon school fees']['category'], 'education')
+
+        job = Job.objects.get(kind='ai.categorize_expenses')
+        self.assertEqual(job.payload['expense_ids'], [created['Waakye']['id'], created['Legon school fees']['id']])
\ No newline at end of file
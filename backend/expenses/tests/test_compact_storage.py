@@ -0,0 +1,125 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.db import connection
+from django.db.models import Sum
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.fields import CategoryCodeField
+from expenses.models import Expense
+from expenses.storage import convert_expense_storage
+from decimal import Decimal
+from datetime import date
+
+User = get_user_model()
+
+def _raw_row(expense_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT amount, category, ai_predicted_category FROM expenses_expense WHERE id = %s', [expense_id]
+        )
+        return cursor.fetchone()
+
+
+def _convert_storage():
+    with connection.schema_editor() as schema_editor:
+        return convert_expense_storage(schema_editor, Expense, Expense.CATEGORY_CODES)
+
+
+class StandardStorageTestCase(TestCase):
+    def test_stored_as_decimals_and_strings_by_default(self):
+        user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+        expense = Expense.objects.create(
+            user=user, amount=Decimal('25.50'), description='Chicken waakye',
+            category='transport', ai_predicted_category='food', date=date(2024, 1, 2)
+        )
+        amount, category, predicted = _raw_row(expense.id)
+        self.assertEqual(Decimal(str(amount)), Decimal('25.50'))
+        self.assertEqual((category, predicted), ('transport', 'food'))
+
+
+class CategoryCodeFieldTestCase(TestCase):
+    def test_codes_do_not_follow_choice_order(self):
+        field = CategoryCodeField(max_length=20, choices=[('b', 'B'), ('a', 'A')], codes={'a': 0, 'b': 5})
+        field.set_attributes_from_name('category')
+        with override_settings(EXPENSES_COMPACT_STORAGE=True):
+            self.assertEqual(field.get_prep_value('b'), 5)
+            from_code, = field.get_db_converters(connection)
+            self.assertEqual(from_code(0, None, connection), 'a')
+            with self.assertRaises(ValueError):
+                from_code(1, None, connection)
+        self.assertEqual(field.get_db_converters(connection), [])
+
+    def test_every_choice_needs_a_code(self):
+        with self.assertRaises(ValueError):
+            CategoryCodeField(max_length=20, choices=[('a', 'A'), ('b', 'B')], codes={'a': 0})
+
+
+@override_settings(EXPENSES_COMPACT_STORAGE=True)
+class CompactStorageTestCase(TransactionTestCase):
+    def setUp(self):
+        self.assertTrue(_convert_storage())
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        with self.settings(EXPENSES_COMPACT_STORAGE=False):
+            self.assertTrue(_convert_storage())
+
+    def test_stored_as_integers(self):
+        """Amounts are stored in pesewas and categories as their codes"""
+        expense = Expense.objects.create(
+            user=self.user, amount=Decimal('25.50'), description='Chicken waakye',
+            category='transport', ai_predicted_category='food', date=date(2024, 1, 2)
+        )
+        self.assertEqual(_raw_row(expense.id), (2550, 1, 0))
+
+        expense.refresh_from_db()
+        self.assertEqual(expense.amount, Decimal('25.50'))
+        self.assertEqual(expense.category, 'transport')
+        self.assertEqual(expense.ai_predicted_category, 'food')
+
+    def test_api_shape_unchanged(self):
+        response = self.client.post(reverse('expense-list-create'), {
+            'amount': '0.10',
+            'description': 'Pure water',
+            'category': 'food',
+            'date': '2024-01-02'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['amount'], '0.10')
+        self.assertEqual(response.data['category'], 'food')
+
+        response = self.client.get(reverse('expense-list-create'), {'category': 'food'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['amount'] for item in response.data], ['0.10'])
+
+    def test_queries_use_codes_and_minor_units(self):
+        for amount, category in [('12.25', 'food'), ('7.75', 'food'), ('40.00', 'bills')]:
+            Expense.objects.create(user=self.user, amount=Decimal(amount), description='x',
+                                   category=category, date=date(2024, 1, 2))
+
+        totals = dict(Expense.objects.values_list('category').annotate(total=Sum('amount')))
+        self.assertEqual(totals, {'food': Decimal('20.00'), 'bills': Decimal('40.00')})
+        self.assertEqual(Expense.objects.filter(amount__gt=Decimal('7.755')).count(), 2)
+        self.assertEqual(Expense.objects.filter(category__in=['bills']).count(), 1)
+
+    def test_unknown_category_rejected(self):
+        with self.assertRaises(ValueError):
+            Expense.objects.filter(category='groceries').count()
+
+    def test_existing_rows_converted_back_and_forth(self):
+        expense = Expense.objects.create(user=self.user, amount=Decimal('0.29'), description='Sachet water',
+                                         category='other', date=date(2024, 1, 2))
+        with self.settings(EXPENSES_COMPACT_STORAGE=False):
+            self.assertTrue(_convert_storage())
+            self.assertFalse(_convert_storage())
+            expense.refresh_from_db()
+            self.assertEqual((expense.amount, expense.category), (Decimal('0.29'), 'other'))
+        self.assertTrue(_convert_storage())
+        self.assertEqual(_raw_row(expense.id), (29, 8, None))
\ No newline at end of file
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from ai.columnar import get_columnar_cache
+from ai.services import category_overrides
+from expenses.models import Expense
+from datetime import date
+from decimal import Decimal
+
+User = get_user_model()
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='other@example.com',
+            username='otheruser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        get_columnar_cache().clear()
+        self.expense = Expense.objects.create(user=self.user, amount=Decimal('25.50'), description='Waakye',
+                                              category='food', date=date.today())
+
+    def _get(self, name, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse(name), params, **headers)
+
+    def test_not_modified_with_one_query(self):
+        for name in ('expense-list-create', 'get-insights'):
+            response = self._get(name)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('Last-Modified', response)
+            with self.assertNumQueries(1):
+                cached = self._get(name, response['ETag'])
+            self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(cached['ETag'], response['ETag'])
+            self.assertEqual(cached.content, b'')
+
+    def test_write_changes_etag(self):
+        etag = self._get('expense-list-create')['ETag']
+        insights_etag = self._get('get-insights')['ETag']
+
+        self.client.patch(reverse('expense-detail', args=[self.expense.id]), {'amount': '30.00'}, format='json')
+        response = self._get('expense-list-create', etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['amount'], '30.00')
+        self.assertEqual(self._get('get-insights', insights_etag).status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        category_overrides.override_category(self.user, self.expense.id, 'bills')
+        self.assertEqual(self._get('expense-list-create', etag).status_code, status.HTTP_200_OK)
+
+    def test_other_users_writes_ignored(self):
+        etag = self._get('expense-list-create')['ETag']
+        Expense.objects.create(user=self.other_user, amount=Decimal('5.00'), description='Kelewele',
+                               category='food', date=date.today())
+        self.assertEqual(self._get('expense-list-create', etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_per_representation(self):
+        etag = self._get('expense-list-create')['ETag']
+        self.assertNotEqual(self._get('expense-list-create', category='food')['ETag'], etag)
+        response = self._get('expense-list-create', etag, category='food')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_fx_rates_change_etag(self):
+        etag = self._get('get-insights')['ETag']
+        call_command('load_fx_rates', '/dev/null', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self._get('get-insights', etag).status_code, status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.fx import get_rate_cache
+from expenses.models import Expense, FxRate
+from expenses.dedup import DuplicateDetector
+
+User = get_user_model()
+
+class DuplicateDetectionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.original = Expense.objects.create(
+            user=self.user, amount=Decimal('45.00'), description='Shoprite groceries Accra Mall',
+            category='shopping', date=date(2024, 5, 10)
+        )
+
+    def test_detector_blocks_on_amount_and_date(self):
+        detector = DuplicateDetector()
+        detector.add(1, 'Shoprite groceries Accra Mall', Decimal('45.00'), date(2024, 5, 10))
+        self.assertEqual([m for m, _ in detector.matches('SHOPRITE groceries - Accra Mall', 45, date(2024, 5, 11))], [1])
+        self.assertEqual(detector.matches('Shoprite groceries Accra Mall', Decimal('46.00'), date(2024, 5, 10)), [])
+        self.assertEqual(detector.matches('Shoprite groceries Accra Mall', Decimal('45.00'), date(2024, 5, 20)), [])
+        self.assertEqual(detector.matches('ECG prepaid top up', Decimal('45.00'), date(2024, 5, 10)), [])
+        self.assertEqual(detector.matches('Shoprite groceries Accra Mall', Decimal('45.00'), date(2024, 5, 10), 'USD'), [])
+
+    def test_create_reports_possible_duplicates(self):
+        response = self.client.post(reverse('expense-list-create'), {
+            'amount': '45.00', 'description': 'Shoprite groceries, Accra Mall', 'category': 'shopping',
+            'date': '2024-05-11'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['id'] for item in response.data['possible_duplicates']], [self.original.id])
+
+        response = self.client.post(reverse('expense-list-create'), {
+            'amount': '12.00', 'description': 'Trotro', 'category': 'transport', 'date': '2024-05-11'
+        })
+        self.assertEqual(response.data['possible_duplicates'], [])
+
+    def test_import_skips_overlapping_rows(self):
+        response = self.client.post(reverse('expense-import'), {'expenses': [
+            {'amount': '45.00', 'description': 'SHOPRITE GROCERIES ACCRA MALL', 'category': 'shopping', 'date': '2024-05-10'},
+            {'amount': '30.00', 'description': 'Bolt ride to Osu', 'category': 'transport', 'date': '2024-05-12'},
+            {'amount': '30.00', 'description': 'Bolt ride to Osu', 'category': 'transport', 'date': '2024-05-12'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['skipped'], 2)
+        self.assertEqual(response.data['duplicates'][0]['duplicate_of'], self.original.id)
+        self.assertEqual(response.data['duplicates'][1]['duplicate_of_index'], 1)
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 2)
+
+    def test_same_amount_in_another_currency_is_not_a_duplicate(self):
+        FxRate.objects.create(currency='USD', date=date(2024, 1, 1), rate=Decimal('12.5'))
+        get_rate_cache().invalidate()
+        self.addCleanup(get_rate_cache().invalidate)
+        response = self.client.post(reverse('expense-list-create'), {
+            'amount': '45.00', 'currency': 'USD', 'description': 'Shoprite groceries, Accra Mall',
+            'category': 'shopping', 'date': '2024-05-10'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['possible_duplicates'], [])
+
+        response = self.client.post(reverse('expense-import'), {'expenses': [
+            {'amount': '20.00', 'currency': 'USD', 'description': 'Uber ride', 'category': 'transport', 'date': '2024-05-12'},
+            {'amount': '20.00', 'description': 'Uber ride', 'category': 'transport', 'date': '2024-05-12'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['skipped']), (2, 0))
+
+    def test_import_validates_rows(self):
+        response = self.client.post(reverse('expense-import'), {'expenses': [{'amount': 'abc'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_scan_finds_duplicates_across_history(self):
+        rows = [Expense(user=self.user, amount=Decimal(10 + i % 50), description=f'Expense number {i} at shop {i % 7}',
+                        category='other', date=date(2023, 1, 1) + timedelta(days=i)) for i in range(300)]
+        rows.append(Expense(user=self.user, amount=Decimal('45.00'), description='Shoprite groceries  Accra mall!',
+                            category='shopping', date=date(2024, 5, 12)))
+        Expense.objects.bulk_create(rows)
+
+        response = self.client.get(reverse('expense-duplicates'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['duplicates'][0]['duplicate_of']['id'], self.original.id)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import tempfile
+from django.test import TestCase
+from django.urls import reverse
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.fx import get_rate_cache
+from expenses.models import Expense, FxRate
+from ai.columnar import ColumnarInsightsGenerator, get_columnar_cache
+from ai.insights import InsightsGenerator
+from budgets.models import Budget
+from budgets.tracking import get_period_total
+from decimal import Decimal
+from datetime import date
+import numpy as np
+
+User = get_user_model()
+
+class MultiCurrencyTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        get_columnar_cache().clear()
+        self._load_rates([
+            ('2024-01-01', 'USD', '12.5'),
+            ('2024-01-10', 'USD', '13'),
+            ('2024-01-01', 'EUR', '13.333'),
+        ])
+
+    def _load_rates(self, rows):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as stream:
+            stream.write('date,currency,rate\n')
+            stream.writelines(f'{day},{currency},{rate}\n' for day, currency, rate in rows)
+        try:
+            call_command('load_fx_rates', stream.name, stdout=open(os.devnull, 'w'))
+        finally:
+            os.unlink(stream.name)
+
+    def _expense(self, amount, currency, day, category='travel'):
+        return Expense.objects.create(user=self.user, amount=Decimal(amount), currency=currency,
+                                      description='Trip', category=category, date=day)
+
+    def test_load_replaces_existing_rates(self):
+        self._load_rates([('2024-01-10', 'USD', '14')])
+        self.assertEqual(FxRate.objects.count(), 3)
+        self.assertEqual(FxRate.objects.get(currency='USD', date=date(2024, 1, 10)).rate, Decimal('14'))
+        self.assertEqual(get_rate_cache().rate('USD', date(2024, 1, 15)), 14.0)
+
+    def test_rate_lookup(self):
+        cache = get_rate_cache()
+        self.assertEqual(cache.rate('GHS', date(2024, 1, 5)), 1.0)
+        self.assertEqual(cache.rate('USD', date(2024, 1, 9)), 12.5)
+        self.assertEqual(cache.rate('USD', date(2024, 2, 1)), 13.0)
+        # Dates before the table use its earliest rate
+        self.assertEqual(cache.rate('USD', date(2023, 6, 1)), 12.5)
+        with self.assertRaises(KeyError):
+            cache.rate('JPY', date(2024, 1, 5))
+
+        days = [date(2024, 1, 9).toordinal(), date(2024, 1, 10).toordinal(), date(2024, 1, 5).toordinal()]
+        converted = cache.convert_minor([1000, 1000, 1000], ['USD', 'USD', 'GHS'], days)
+        np.testing.assert_array_equal(converted, [12500, 13000, 1000])
+        self.assertEqual(cache.convert(Decimal('0.15'), 'EUR', date(2024, 1, 5)), Decimal('2.00'))
+
+    def test_insights_report_in_reporting_currency(self):
+        self._expense('10.00', 'USD', date(2024, 1, 9))
+        self._expense('10.00', 'USD', date(2024, 1, 12))
+        self._expense('0.15', 'EUR', date(2024, 1, 12))
+        self._expense('20.00', 'GHS', date(2024, 1, 12), category='food')
+
+        orm = InsightsGenerator(self.user).get_monthly_summary(2024, 1)
+        self.assertEqual(orm['total_amount'], Decimal('277.00'))
+        self.assertEqual(
+            [(row['category'], row['total']) for row in orm['by_category']],
+            [('travel', Decimal('257.00')), ('food', Decimal('20.00'))]
+        )
+        columnar = ColumnarInsightsGenerator(self.user).get_monthly_summary(2024, 1)
+        self.assertEqual(columnar, orm)
+
+        comparison = InsightsGenerator(self.user).compare_range(date(2024, 1, 1), date(2024, 1, 31))
+        self.assertEqual(comparison['periods'][0]['total'], Decimal('277.00'))
+
+    def test_budget_totals_converted(self):
+        budget = Budget.objects.create(user=self.user, category='travel', period='monthly', limit=Decimal('500'))
+        self._expense('10.00', 'USD', date(2024, 1, 9))
+        self.assertEqual(get_period_total(budget, date(2024, 1, 9)).total, Decimal('125.00'))
+        self._expense('10.00', 'USD', date(2024, 1, 12))
+        self.assertEqual(get_period_total(budget, date(2024, 1, 9)).total, Decimal('255.00'))
+
+    def test_api_validates_currency(self):
+        url = reverse('expense-list-create')
+        data = {'amount': '12.00', 'description': 'Hotel', 'category': 'travel', 'date': '2024-01-12'}
+        response = self.client.post(url, dict(data, currency='usd'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['currency'], 'USD')
+
+        response = self.client.post(url, dict(data, currency='JPY'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('currency', response.data)
+
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.data['currency'], 'GHS')
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.fx import get_rate_cache
+from expenses.models import Expense, FxRate
+from expenses.serializers import ExpenseSerializer
+from datetime import date
+from decimal import Decimal
+
+User = get_user_model()
+
+class ExpenseListFastPathTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        FxRate.objects.create(currency='USD', date=date(2024, 1, 1), rate=Decimal('12.5'))
+        get_rate_cache().invalidate()
+        for amount, currency, description, category, predicted, day in [
+            ('25.50', 'GHS', 'Waakye at Auntie Muni', 'food', 'food', date(2024, 1, 3)),
+            ('0.10', 'GHS', 'Pure water', 'food', None, date(2024, 1, 3)),
+            ('1200.00', 'USD', 'Flight to Accra', 'travel', 'other', date(2024, 1, 5)),
+            ('7', 'GHS', 'Trotro to Madina', 'transport', None, date(2023, 12, 31)),
+        ]:
+            Expense.objects.create(user=self.user, amount=Decimal(amount), currency=currency, description=description,
+                                   category=category, ai_predicted_category=predicted, date=day)
+
+    def _assert_same_json(self, params):
+        response = self.client.get(reverse('expense-list-create'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        ids = [item['id'] for item in response.data]
+        expenses = sorted(Expense.objects.filter(id__in=ids), key=lambda expense: ids.index(expense.id))
+        expected = JSONRenderer().render(ExpenseSerializer(expenses, many=True).data)
+        self.assertEqual(response.content, expected)
+        return response.data
+
+    def test_identical_json(self):
+        data = self._assert_same_json({})
+        self.assertEqual(len(data), 4)
+        by_description = {item['description']: item for item in data}
+        self.assertTrue(by_description['Flight to Accra']['ai_predicted_read'])
+        self.assertFalse(by_description['Pure water']['ai_predicted_read'])
+        self.assertEqual(by_description['Trotro to Madina']['amount'], '7.00')
+
+    def test_identical_json_filtered_and_ordered(self):
+        self.assertEqual(len(self._assert_same_json({'category': 'food', 'ordering': 'amount'})), 2)
+        self.assertEqual(len(self._assert_same_json({'q': 'waakye'})), 1)
+
+    def test_single_list_query(self):
+        # The data version lookup for ETags, then the list itself
+        with self.assertNumQueries(2):
+            self.client.get(reverse('expense-list-create'))
\ No newline at end of file
@@ -0,0 +1,82 @@
+import unittest
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from config import renderers
+from expenses.models import Expense
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import numpy as np
+
+User = get_user_model()
+
+class RendererTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        Expense.objects.create(user=self.user, amount=Decimal('25.50'), description='Waakye',
+                               category='food', date=date(2024, 1, 3))
+
+    @unittest.skipIf(renderers.orjson is None, 'orjson not installed')
+    def test_orjson_matches_drf(self):
+        data = {
+            'total': Decimal('25.50'),
+            'day': date(2024, 1, 3),
+            'at': datetime(2024, 1, 3, 8, 30, 15, 123456, tzinfo=timezone.utc),
+            'naive': datetime(2024, 1, 3, 8, 30),
+            'label': gettext_lazy('Food & Dining'),
+            'scores': np.array([0.5, 0.25]),
+            'count': np.int64(3),
+            'by_month': {1: Decimal('1.10')},
+            'rows': (Decimal('1'), None, 'Kelewele — GH₵'),
+            'note': 'line\u2028paragraph\u2029end',
+        }
+        self.assertEqual(renderers.ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(renderers.ORJSONRenderer().render(None), b'')
+
+    @unittest.skipIf(renderers.orjson is None, 'orjson not installed')
+    def test_orjson_renders_non_finite_floats_as_null(self):
+        # The one documented difference from DRF, whose strict JSON refuses these
+        data = {'ratio': float('nan'), 'growth': float('inf'), 'scores': np.array([-np.inf])}
+        self.assertEqual(renderers.ORJSONRenderer().render(data), b'{"ratio":null,"growth":null,"scores":[null]}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_json_endpoint(self):
+        response = self.client.get(reverse('expense-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()[0]['amount'], '25.50')
+
+    def test_invalid_json_rejected(self):
+        response = self.client.post(reverse('expense-list-create'), '{"amount": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @unittest.skipIf(renderers.msgpack is None, 'msgpack not installed')
+    def test_msgpack_negotiated(self):
+        json_data = self.client.get(reverse('expense-list-create')).json()
+        response = self.client.get(reverse('expense-list-create'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(renderers.msgpack.unpackb(response.content), json_data)
+
+    @unittest.skipIf(renderers.msgpack is None, 'msgpack not installed')
+    def test_msgpack_request_body(self):
+        body = renderers.msgpack.packb({
+            'amount': '12.00', 'description': 'Trotro to Madina', 'category': 'transport', 'date': '2024-01-04'
+        })
+        response = self.client.post(reverse('expense-list-create'), body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['amount'], '12.00')
+
+        response = self.client.post(reverse('expense-list-create'), b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
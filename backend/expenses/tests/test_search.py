@@ -0,0 +1,62 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.models import Expense
+from datetime import date
+
+User = get_user_model()
+
+class ExpenseSearchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            email='other@example.com',
+            username='otheruser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        for description, day in [
+            ('Waakye at Auntie Muni', date(2024, 1, 3)),
+            ('Waakye and waakye extra shito', date(2024, 1, 2)),
+            ('Trotro to Madina', date(2024, 1, 4)),
+            ('Kelewele by the roadside', date(2024, 1, 5)),
+        ]:
+            Expense.objects.create(user=self.user, amount=10, description=description, category='food', date=day)
+        Expense.objects.create(user=self.other_user, amount=10, description='Waakye for lunch', category='food',
+                               date=date(2024, 1, 1))
+
+    def _search(self, **params):
+        response = self.client.get(reverse('expense-list-create'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [item['description'] for item in results]
+
+    def test_search_is_ranked_and_scoped_to_user(self):
+        self.assertEqual(self._search(q='waakye'), ['Waakye and waakye extra shito', 'Waakye at Auntie Muni'])
+
+    def test_prefix_and_multiple_terms(self):
+        self.assertEqual(self._search(q='kele'), ['Kelewele by the roadside'])
+        self.assertEqual(self._search(q='waakye muni'), ['Waakye at Auntie Muni'])
+        self.assertEqual(self._search(q='"'), [])
+
+    def test_explicit_ordering_wins(self):
+        self.assertEqual(self._search(q='waakye', ordering='date'),
+                         ['Waakye and waakye extra shito', 'Waakye at Auntie Muni'])
+        self.assertEqual(self._search(q='waakye', ordering='-date'),
+                         ['Waakye at Auntie Muni', 'Waakye and waakye extra shito'])
+
+    def test_index_follows_edits_and_deletes(self):
+        expense = Expense.objects.get(description='Trotro to Madina')
+        expense.description = 'Uber to Madina'
+        expense.save()
+        self.assertEqual(self._search(q='trotro'), [])
+        self.assertEqual(self._search(q='uber'), ['Uber to Madina'])
+        expense.delete()
+        self.assertEqual(self._search(q='madina'), [])
\ No newline at end of file
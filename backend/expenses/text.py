@@ -0,0 +1,17 @@
+import re
+
+_NON_WORD = re.compile(r'[^a-z\s]+')
+# Currency words that often trail a description ("Waakye - 35 GHS")
+_NOISE_WORDS = {'ghs', 'gh', 'cedis', 'cedi', 'ghc', 'pesewas'}
+
+
+def normalize_description(description):
+    """
+    Canonical form of an expense description for near-exact matching.
+
+    Lowercases, drops digits, punctuation and currency words, and collapses
+    whitespace, so "Waakye at chop bar - 35 GHS" and "waakye at chop bar"
+    normalize to the same string.
+    """
+    words = _NON_WORD.sub(' ', description.lower()).split()
+    return ' '.join(word for word in words if word not in _NOISE_WORDS)
\ No newline at end of file
@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.ExpenseListCreateView.as_view(), name='expense-list-create'),
     path('<int:pk>/', views.ExpenseDetailView.as_view(), name='expense-detail'),
+    path('import/', views.import_expenses, name='expense-import'),
+    path('duplicates/', views.find_duplicate_expenses, name='expense-duplicates'),
 ]
\ No newline at end of file
@@ -0,0 +1,69 @@
+import hashlib
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from .models import UserDataVersion
+
+
+def bump_data_versions(user_ids):
+    """Mark the expense data of user_ids as changed; one UPDATE per user"""
+    now = timezone.now()
+    for user_id in set(user_ids):
+        versions = UserDataVersion.objects.filter(user_id=user_id)
+        if versions.update(version=F('version') + 1, updated_at=now):
+            continue
+        _, created = UserDataVersion.objects.get_or_create(
+            user_id=user_id, defaults={'version': 1, 'updated_at': now}
+        )
+        if not created:
+            # Another writer created the row first; still count this write
+            versions.update(version=F('version') + 1, updated_at=now)
+
+
+def data_version(user_id):
+    """Current version of a user's expense data (0 before their first write)"""
+    return UserDataVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+
+
+def bump_all_data_versions():
+    """For changes that affect every user's derived data, such as new FX rates"""
+    UserDataVersion.objects.update(version=F('version') + 1, updated_at=timezone.now())
+
+
+class UserDataValidators:
+    """
+    Strong ETag and Last-Modified for a response built from one user's
+    expenses, from a single primary-key lookup of their data version.
+
+    The ETag also covers the request path, query string and negotiated
+    media type, so each representation validates separately. Responses
+    that depend on the current date pass fresh_from (e.g. the start of
+    today) so they are not considered current from yesterday's copy.
+    """
+
+    def __init__(self, request, user, scope, fresh_from=None):
+        self.request = request
+        row = UserDataVersion.objects.filter(user_id=user.pk).values_list('version', 'updated_at').first()
+        version, updated_at = row or (0, user.date_joined)
+        if fresh_from is not None and fresh_from > updated_at:
+            updated_at = fresh_from
+        key = '|'.join([
+            scope, str(user.pk), user.date_joined.isoformat(), str(version), updated_at.isoformat(),
+            request.get_full_path(), getattr(request, 'accepted_media_type', '') or '',
+        ])
+        self.etag = '"%s"' % hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+        self.last_modified = int(updated_at.timestamp())
+
+    def not_modified(self):
+        """A 304 response if the client's copy is current, else None"""
+        response = get_conditional_response(self.request, etag=self.etag, last_modified=self.last_modified)
+        return self.apply(response) if response is not None else None
+
+    def apply(self, response):
+        response['ETag'] = self.etag
+        response['Last-Modified'] = http_date(self.last_modified)
+        # Revalidate on every use; the data is per user
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept', 'Authorization', 'Cookie'])
+        return response
\ No newline at end of file
@@ -1,36 +1,45 @@
-from rest_framework import generics, filters
+from rest_framework import generics, filters, status
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
+from jobs.queue import enqueue
 from .models import Expense
-from .serializers import ExpenseSerializer
+from .serializers import ExpenseSerializer, expense_list_data
+from .search import DescriptionSearchFilter
+from .versioning import UserDataValidators
+from .importing import import_rows
+from . import dedup
 
 User = get_user_model()
 
 class ExpenseListCreateView(generics.ListCreateAPIView):
     serializer_class = ExpenseSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, DescriptionSearchFilter]
     filterset_fields = ['category', 'date']
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date']
 
-    def get_queryset(self):
+    def get_owner(self):
         if self.request.user.is_authenticated:
-            return Expense.objects.filter(user=self.request.user)
-        else:
-            # Create session-specific demo user
-            session_key = self.request.session.session_key or self.request.session.create()
-            demo_email = f'demo_{session_key}@example.com'
-            demo_user, created = User.objects.get_or_create(
-                email=demo_email,
-                defaults={
-                    'username': f'demo_{session_key}',
-                    'first_name': 'Demo', 
-                    'last_name': 'User'
-                }
-            )
-            return Expense.objects.filter(user=demo_user)
+            return self.request.user
+        # Create session-specific demo user
+        session_key = self.request.session.session_key or self.request.session.create()
+        demo_email = f'demo_{session_key}@example.com'
+        demo_user, created = User.objects.get_or_create(
+            email=demo_email,
+            defaults={
+                'username': f'demo_{session_key}',
+                'first_name': 'Demo', 
+                'last_name': 'User'
+            }
+        )
+        return demo_user
+
+    def get_queryset(self):
+        return Expense.objects.filter(user=self.get_owner())
     
     def perform_create(self, serializer):
         if self.request.user.is_authenticated:
@@ -48,6 +57,33 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
                 }
             )
             serializer.save(user=demo_user)
+        expense = serializer.instance
+        self.possible_duplicates = dedup.find_matches(
+            expense.user, expense.description, expense.amount, expense.date, expense.currency, exclude_id=expense.id
+        )
+
+    def list(self, request, *args, **kwargs):
+        owner = self.get_owner()
+        validators = UserDataValidators(request, owner, 'expenses')
+        not_modified = validators.not_modified()
+        if not_modified is not None:
+            return not_modified
+        if self.paginator is not None:
+            response = super().list(request, *args, **kwargs)
+        else:
+            # Same JSON as ExpenseSerializer, without per-row serializer work
+            queryset = self.filter_queryset(Expense.objects.filter(user=owner))
+            response = Response(expense_list_data(queryset))
+        return validators.apply(response)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # Saved regardless; the client decides whether to keep it
+        response.data['possible_duplicates'] = [
+            {'id': expense_id, 'similarity': round(similarity, 2)}
+            for expense_id, similarity in self.possible_duplicates
+        ]
+        return response
 
 class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ExpenseSerializer
@@ -68,4 +104,59 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
                     'last_name': 'User'
                 }
             )
-            return Expense.objects.filter(user=demo_user)
\ No newline at end of file
+            return Expense.objects.filter(user=demo_user)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_expenses(request):
+    """
+    Create many expenses at once, e.g. from a bank or MoMo statement.
+
+    Rows that duplicate an existing expense (or an earlier row of the same
+    import) are skipped unless skip_duplicates is false, in which case they
+    are created and reported. With defer true the rows are validated and
+    queued; the response carries the job to poll at /api/jobs/<id>/.
+    """
+    rows = request.data.get('expenses')
+    if not isinstance(rows, list) or not rows:
+        return Response({'error': 'expenses must be a non-empty list'}, 
+                       status=status.HTTP_400_BAD_REQUEST)
+    skip_duplicates = request.data.get('skip_duplicates', True) not in (False, 'false', '0', 0)
+    defer = request.data.get('defer', False) in (True, 'true', '1', 1)
+
+    serializer = ExpenseSerializer(data=rows, many=True)
+    if not serializer.is_valid():
+        return Response({'error': 'Invalid expenses', 'details': serializer.errors}, 
+                       status=status.HTTP_400_BAD_REQUEST)
+
+    if defer:
+        job = enqueue('expenses.import', {'expenses': rows, 'skip_duplicates': skip_duplicates}, user=request.user)
+        return Response({'job': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+
+    created, duplicates = import_rows(request.user, serializer.validated_data, skip_duplicates)
+    return Response({
+        'created': len(created),
+        'skipped': len(duplicates) if skip_duplicates else 0,
+        'duplicates': duplicates,
+        'expenses': ExpenseSerializer(created, many=True).data,
+    }, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def find_duplicate_expenses(request):
+    """
+    Scan the user's whole history for near-duplicates: same amount, dates
+    within a few days and similar descriptions.
+    """
+    matches = dedup.find_duplicates(request.user)
+    expenses = Expense.objects.in_bulk(
+        [match.expense_id for match in matches] + [match.duplicate_of for match in matches]
+    )
+    return Response({
+        'count': len(matches),
+        'duplicates': [{
+            'expense': ExpenseSerializer(expenses[match.expense_id]).data,
+            'duplicate_of': ExpenseSerializer(expenses[match.duplicate_of]).data,
+            'similarity': match.similarity,
+        } for match in matches],
+    })
\ No newline at end of file
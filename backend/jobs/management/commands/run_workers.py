@@ -0,0 +1,95 @@
+import multiprocessing
+import signal
+import threading
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from jobs.registry import registered_kinds
+from jobs.worker import Worker
+
+
+def run_worker_process(index, options):
+    """Process entry point: set up Django (spawn start method) and run one worker"""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    # Never reuse a connection inherited from the parent process
+    connections.close_all()
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        # Finish the current job, then exit
+        signal.signal(signum, lambda *args: stop.set())
+    _worker(options, stop, index).run(burst=options['burst'])
+
+
+def _worker(options, stop, index=0):
+    return Worker(
+        worker_id=options['worker_id'] and f"{options['worker_id']}-{index}",
+        batch_size=options['batch_size'],
+        poll_interval=options['poll_interval'],
+        kinds=options['kinds'],
+        stop_event=stop,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background job workers. Each of N processes claims ready jobs from "
+        "the database, runs them and retries failures with exponential backoff. "
+        "SIGINT/SIGTERM stop the workers after their current job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes; 1 runs in-process')
+        parser.add_argument('--batch-size', type=int, default=1,
+                            help='Jobs claimed at a time by each worker')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when no job is ready')
+        parser.add_argument('--kinds', type=lambda value: [kind for kind in value.split(',') if kind],
+                            default=None, help='Comma-separated job kinds to run (default: all)')
+        parser.add_argument('--worker-id', default=None,
+                            help='Prefix for worker ids (default: host:pid)')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no job is ready instead of polling')
+
+    def handle(self, **options):
+        unknown = set(options['kinds'] or []) - set(registered_kinds())
+        if unknown:
+            raise CommandError(f"Unknown job kinds: {', '.join(sorted(unknown))}")
+
+        workers = max(1, options['workers'])
+        self.stdout.write(f"Starting {workers} worker(s) for {', '.join(options['kinds'] or registered_kinds())}")
+        if workers == 1:
+            stop = threading.Event()
+            previous = {signum: signal.signal(signum, lambda *args: stop.set())
+                        for signum in (signal.SIGINT, signal.SIGTERM)}
+            try:
+                _worker(options, stop).run(burst=options['burst'])
+            finally:
+                for signum, handler in previous.items():
+                    signal.signal(signum, handler)
+            self.stdout.write(self.style.SUCCESS("Worker stopped"))
+            return
+
+        # Children must open their own connections
+        connections.close_all()
+        worker_options = {key: options[key] for key in ('worker_id', 'batch_size', 'poll_interval', 'kinds', 'burst')}
+        processes = [
+            multiprocessing.Process(target=run_worker_process, args=(index, worker_options))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        # Ctrl-C reaches the children through the process group; SIGTERM is passed on
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, forward)
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS(f"{workers} workers stopped"))
\ No newline at end of file
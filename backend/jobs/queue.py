@@ -0,0 +1,201 @@
+"""
+The job queue is the Job table: enqueueing is an INSERT, so a job created
+inside a transaction only becomes visible to workers when it commits and
+disappears with it on rollback.
+
+Workers claim ready jobs with SELECT ... FOR UPDATE SKIP LOCKED where the
+database supports it (PostgreSQL), so concurrent workers never wait on or
+double-claim a row. SQLite has no row locks; there each candidate is
+claimed with an UPDATE guarded on status='pending', which only one
+worker's write can satisfy.
+"""
+import random
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+from .registry import get_handler
+
+
+def enqueue(kind, payload=None, *, user=None, dedup_key=None, delay=0, max_attempts=None):
+    """
+    Add a job and return it.
+
+    With dedup_key, a pending job with the same key is returned instead of
+    adding another; a job that is already running does not count, as it
+    may have read its input before the change that prompted this call.
+    """
+    return _enqueue(kind, payload, user=user, dedup_key=dedup_key, delay=delay, max_attempts=max_attempts)[0]
+
+
+def _enqueue(kind, payload=None, *, user=None, dedup_key=None, delay=0, max_attempts=None):
+    # enqueue(), also returning whether the job was added (False: the pending duplicate)
+    get_handler(kind)
+    fields = {
+        'kind': kind,
+        'payload': payload or {},
+        'user': user,
+        'dedup_key': dedup_key,
+        'run_after': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    }
+    while True:
+        try:
+            with transaction.atomic():
+                return Job.objects.create(**fields), True
+        except IntegrityError:
+            if dedup_key is None:
+                raise
+        existing = Job.objects.filter(dedup_key=dedup_key, status=Job.PENDING).first()
+        # None means it was claimed in between; try the insert again
+        if existing is not None:
+            return existing, False
+
+
+def enqueue_batch(kind, dedup_key, field, values, *, delay=0, max_size=1000, **fields):
+    """
+    Append values to payload[field] of the pending job with dedup_key, or
+    enqueue a new one holding them, so work arriving within `delay` seconds
+    of the first item runs as one job; return the jobs the values went to.
+
+    A job takes values until it is due or holds max_size of them; then it
+    gives up the key and later values start a new job, so a queue without
+    workers never grows one payload without bound. Appends are optimistic:
+    guarded on the job still being pending and unchanged since it was read.
+    """
+    values = list(values)
+    jobs = []
+    while values:
+        existing = Job.objects.filter(dedup_key=dedup_key, status=Job.PENDING).first()
+        if existing is None:
+            job, added = _enqueue(kind, {field: values[:max_size]}, dedup_key=dedup_key, delay=delay, **fields)
+            if added:
+                jobs.append(job)
+                values = values[max_size:]
+            # Otherwise another writer inserted first; append to its job
+            continue
+        now = timezone.now()
+        current = existing.payload.get(field, [])
+        room = max_size - len(current)
+        unchanged = Job.objects.filter(id=existing.id, status=Job.PENDING, updated_at=existing.updated_at)
+        if room <= 0 or existing.run_after <= now:
+            # The job still runs, it just stops taking more
+            unchanged.update(dedup_key=None, updated_at=now)
+            continue
+        payload = dict(existing.payload, **{field: current + values[:room]})
+        if unchanged.update(payload=payload, updated_at=now):
+            existing.payload = payload
+            jobs.append(existing)
+            values = values[room:]
+    return jobs
+
+
+def claim(worker_id, limit=1, kinds=None):
+    """Mark up to `limit` ready jobs as running under worker_id and return them"""
+    now = timezone.now()
+    ready = Job.objects.filter(status=Job.PENDING, run_after__lte=now).order_by('run_after', 'id')
+    if kinds:
+        ready = ready.filter(kind__in=kinds)
+    claim_fields = {
+        'status': Job.RUNNING,
+        'locked_by': worker_id,
+        'locked_at': now,
+        'attempts': F('attempts') + 1,
+        'updated_at': now,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            jobs = list(ready.select_for_update(skip_locked=True)[:limit])
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(**claim_fields)
+    else:
+        jobs = [
+            job for job in ready[:limit]
+            if Job.objects.filter(id=job.id, status=Job.PENDING).update(**claim_fields)
+        ]
+
+    for job in jobs:
+        job.status, job.locked_by, job.locked_at = Job.RUNNING, worker_id, now
+        job.attempts += 1
+    return jobs
+
+
+def backoff_seconds(attempts):
+    """Delay before retry number `attempts`: exponential, capped, with 10% jitter"""
+    delay = min(settings.JOBS_BACKOFF_MAX, settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.9, 1.1)
+
+
+def _owned(job):
+    # A worker only finishes jobs it still holds; a stale job may have been reclaimed
+    return Job.objects.filter(id=job.id, status=Job.RUNNING, locked_by=job.locked_by)
+
+
+def complete(job, result=None):
+    now = timezone.now()
+    _owned(job).update(
+        status=Job.DONE, result=result, last_error='', locked_by='', locked_at=None,
+        finished_at=now, updated_at=now,
+    )
+    job.status, job.result = Job.DONE, result
+
+
+def fail(job, error):
+    """Schedule a retry after backoff, or give up once max_attempts is reached"""
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        _owned(job).update(
+            status=Job.FAILED, last_error=error, locked_by='', locked_at=None, finished_at=now, updated_at=now,
+        )
+        job.status = Job.FAILED
+        return
+    run_after = now + timedelta(seconds=backoff_seconds(job.attempts))
+    try:
+        with transaction.atomic():
+            _owned(job).update(
+                status=Job.PENDING, last_error=error, locked_by='', locked_at=None, run_after=run_after,
+                updated_at=now,
+            )
+        job.status = Job.PENDING
+    except IntegrityError:
+        pending = Job.objects.filter(dedup_key=job.dedup_key, status=Job.PENDING).values('id', 'payload').first()
+        if pending is not None and pending['payload'] == job.payload:
+            # The same work was enqueued again meanwhile; that job retries it
+            complete(job, {'superseded_by': pending['id']})
+            return
+        # The pending job holds other work (a batch's later items): retry on its own
+        _owned(job).update(
+            status=Job.PENDING, dedup_key=None, last_error=error, locked_by='', locked_at=None,
+            run_after=run_after, updated_at=now,
+        )
+        job.status, job.dedup_key = Job.PENDING, None
+
+
+def requeue_stale(timeout):
+    """Return jobs whose worker has held them for over `timeout` seconds (it likely died)"""
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = list(Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff))
+    for job in stale:
+        fail(job, f'Worker {job.locked_by} did not finish within {timeout}s')
+    return len(stale)
+
+
+def purge_finished(older_than):
+    """Delete done and failed jobs finished more than `older_than` seconds ago"""
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    deleted, _ = Job.objects.filter(status__in=[Job.DONE, Job.FAILED], finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def run_job(job):
+    """Run a claimed job's handler and record the outcome; True on success"""
+    try:
+        result = get_handler(job.kind)(job)
+    except Exception:
+        fail(job, traceback.format_exc(limit=5))
+        return False
+    complete(job, result)
+    return True
\ No newline at end of file
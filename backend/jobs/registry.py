@@ -0,0 +1,25 @@
+from typing import Callable, Dict
+
+# kind -> handler(job); filled by @register in each app's tasks module
+_handlers: Dict[str, Callable] = {}
+
+
+def register(kind: str):
+    """Decorator registering `handler(job)` as the runner of jobs of `kind`"""
+    def decorator(handler):
+        if kind in _handlers and _handlers[kind] is not handler:
+            raise ValueError(f'A handler for {kind!r} is already registered')
+        _handlers[kind] = handler
+        return handler
+    return decorator
+
+
+def get_handler(kind: str) -> Callable:
+    try:
+        return _handlers[kind]
+    except KeyError:
+        raise KeyError(f'No job handler registered for {kind!r}')
+
+
+def registered_kinds():
+    return sorted(_handlers)
\ No newline at end of file
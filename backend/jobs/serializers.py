@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from .models import Job
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'status', 'attempts', 'max_attempts', 'run_after', 'last_error', 'result',
+                  'created_at', 'finished_at']
+        read_only_fields = fields
\ No newline at end of file
@@ -0,0 +1,254 @@
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from expenses.fx import get_rate_cache
+from expenses.models import Expense, FxRate
+from budgets.models import Budget, BudgetPeriodTotal
+from budgets.tracking import get_period_total
+from ai.services import rescoring
+from jobs import queue
+from jobs.models import Job
+from jobs.registry import register
+from jobs.worker import Worker
+
+User = get_user_model()
+
+calls = []
+
+
+@register('tests.record')
+def record(job):
+    calls.append(job.payload)
+    return {'seen': job.payload.get('n')}
+
+
+@register('tests.broken')
+def broken(job):
+    raise RuntimeError('handler exploded')
+
+
+def run_burst(**kwargs):
+    with redirect_stdout(io.StringIO()):
+        Worker(worker_id='test', **kwargs).run(burst=True)
+
+
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_deduplicates_pending_jobs(self):
+        first = queue.enqueue('tests.record', {'n': 1}, dedup_key='same')
+        second = queue.enqueue('tests.record', {'n': 2}, dedup_key='same')
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Job.objects.count(), 1)
+        # Jobs without a key never collapse
+        queue.enqueue('tests.record')
+        queue.enqueue('tests.record')
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_running_job_does_not_absorb_new_work(self):
+        job = queue.enqueue('tests.record', dedup_key='same')
+        queue.claim('w1')
+        again = queue.enqueue('tests.record', dedup_key='same')
+        self.assertNotEqual(job.id, again.id)
+        self.assertEqual(Job.objects.get(id=again.id).status, Job.PENDING)
+
+    def test_enqueue_rejects_unknown_kind(self):
+        with self.assertRaises(KeyError):
+            queue.enqueue('tests.missing')
+
+    def test_claim_takes_ready_jobs_once(self):
+        ready = queue.enqueue('tests.record', {'n': 1})
+        queue.enqueue('tests.record', {'n': 2}, delay=60)
+
+        claimed = queue.claim('w1', limit=5)
+        self.assertEqual([job.id for job in claimed], [ready.id])
+        self.assertEqual(claimed[0].attempts, 1)
+        stored = Job.objects.get(id=ready.id)
+        self.assertEqual((stored.status, stored.locked_by, stored.attempts), (Job.RUNNING, 'w1', 1))
+        # Neither the claimed job nor the delayed one is ready
+        self.assertEqual(queue.claim('w2', limit=5), [])
+
+    def test_claim_filters_by_kind(self):
+        queue.enqueue('tests.broken')
+        job = queue.enqueue('tests.record')
+        self.assertEqual([claimed.id for claimed in queue.claim('w1', limit=5, kinds=['tests.record'])], [job.id])
+
+    def test_worker_runs_jobs_and_stores_results(self):
+        job = queue.enqueue('tests.record', {'n': 7})
+        run_burst()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.result, {'seen': 7})
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(calls, [{'n': 7}])
+
+    def test_failures_retry_with_backoff_then_give_up(self):
+        job = queue.enqueue('tests.broken', max_attempts=2)
+        run_burst()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertIn('handler exploded', job.last_error)
+        delay = (job.run_after - timezone.now()).total_seconds()
+        self.assertGreater(delay, settings.JOBS_BACKOFF_BASE * 0.8)
+
+        # Not ready until the backoff has passed
+        run_burst()
+        self.assertEqual(Job.objects.get(id=job.id).attempts, 1)
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        run_burst()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_backoff_grows_exponentially_up_to_the_cap(self):
+        base = settings.JOBS_BACKOFF_BASE
+        self.assertAlmostEqual(queue.backoff_seconds(1), base, delta=base * 0.1)
+        self.assertAlmostEqual(queue.backoff_seconds(3), base * 4, delta=base * 0.4)
+        self.assertLessEqual(queue.backoff_seconds(50), settings.JOBS_BACKOFF_MAX * 1.1)
+
+    def test_retry_defers_to_a_newer_duplicate(self):
+        job = queue.enqueue('tests.broken', dedup_key='same')
+        claimed, = queue.claim('w1')
+        newer = queue.enqueue('tests.broken', dedup_key='same')
+        queue.run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.result, {'superseded_by': newer.id})
+
+    def test_batch_jobs_stop_growing_when_full_or_due(self):
+        first, second = queue.enqueue_batch('tests.record', 'batch', 'ids', [1, 2, 3, 4, 5], delay=60, max_size=3)
+        self.assertEqual((first.payload['ids'], second.payload['ids']), ([1, 2, 3], [4, 5]))
+        self.assertIsNone(Job.objects.get(id=first.id).dedup_key)
+
+        self.assertEqual(queue.enqueue_batch('tests.record', 'batch', 'ids', [6], delay=60, max_size=3), [second])
+        Job.objects.filter(id=second.id).update(run_after=timezone.now())
+        third, = queue.enqueue_batch('tests.record', 'batch', 'ids', [7], delay=60, max_size=3)
+        self.assertNotEqual(third.id, second.id)
+        self.assertEqual(Job.objects.get(id=second.id).payload['ids'], [4, 5, 6])
+
+    def test_failed_batch_retries_its_own_items(self):
+        queue.enqueue_batch('tests.broken', 'batch', 'ids', [1])
+        claimed, = queue.claim('w1')
+        newer, = queue.enqueue_batch('tests.broken', 'batch', 'ids', [2], delay=60)
+        queue.run_job(claimed)
+        job = Job.objects.get(id=claimed.id)
+        self.assertEqual((job.status, job.payload['ids'], job.dedup_key), (Job.PENDING, [1], None))
+        self.assertEqual(Job.objects.get(id=newer.id).payload['ids'], [2])
+
+    def test_stale_jobs_are_requeued(self):
+        job = queue.enqueue('tests.record')
+        queue.claim('dead-worker')
+        self.assertEqual(queue.requeue_stale(60), 0)
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(seconds=120))
+        self.assertEqual(queue.requeue_stale(60), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.PENDING, ''))
+        self.assertIn('dead-worker', job.last_error)
+
+    def test_late_finish_does_not_overwrite_a_reclaimed_job(self):
+        queue.enqueue('tests.record')
+        claimed, = queue.claim('slow')
+        Job.objects.filter(id=claimed.id).update(status=Job.PENDING, run_after=timezone.now())
+        queue.claim('fast')
+        queue.complete(claimed, {'from': 'slow'})
+        stored = Job.objects.get(id=claimed.id)
+        self.assertEqual((stored.status, stored.locked_by), (Job.RUNNING, 'fast'))
+
+    def test_purge_removes_old_finished_jobs(self):
+        job = queue.enqueue('tests.record')
+        run_burst()
+        self.assertEqual(queue.purge_finished(3600), 0)
+        Job.objects.filter(id=job.id).update(finished_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(queue.purge_finished(3600), 1)
+
+    def test_run_workers_command_in_burst_mode(self):
+        queue.enqueue('tests.record', {'n': 1})
+        queue.enqueue('tests.record', {'n': 2})
+        out = io.StringIO()
+        with redirect_stdout(io.StringIO()):
+            call_command('run_workers', burst=True, batch_size=5, stdout=out)
+        self.assertEqual(sorted(call['n'] for call in calls), [1, 2])
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+
+class DeferredWorkTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_deferred_import_runs_in_a_worker(self):
+        rows = [
+            {'amount': '12.00', 'description': 'Waakye', 'category': 'food', 'date': '2024-03-01'},
+            {'amount': '5.00', 'description': 'Trotro fare', 'category': 'transport', 'date': '2024-03-01'},
+        ]
+        response = self.client.post(reverse('expense-import'), {'expenses': rows, 'defer': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(Expense.objects.exists())
+
+        run_burst()
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 2)
+        job = self.client.get(reverse('job-detail', args=[response.data['job']]))
+        self.assertEqual(job.data['status'], Job.DONE)
+        self.assertEqual(job.data['result']['created'], 2)
+
+    def test_deferred_import_still_validates_up_front(self):
+        rows = [{'amount': 'lots', 'description': 'Waakye', 'category': 'food', 'date': '2024-03-01'}]
+        response = self.client.post(reverse('expense-import'), {'expenses': rows, 'defer': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Job.objects.exists())
+
+    def test_jobs_are_private_to_their_user(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        job = queue.enqueue('tests.record', user=other)
+        response = self.client.get(reverse('job-detail', args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_categorize_job_sets_model_predictions(self):
+        expenses = [
+            Expense.objects.create(user=self.user, amount=10, description=description, category='other',
+                                   date=date(2024, 3, 1))
+            for description in ('Waakye at chop bar', 'ECG bill payment')
+        ]
+        queue.enqueue('ai.categorize_expenses', {'expense_ids': [expense.id for expense in expenses]})
+        run_burst()
+        pipeline = rescoring.load_pipeline(settings.AI_ML_MODEL_PATH)
+        for expense in expenses:
+            expense.refresh_from_db()
+            self.assertEqual(expense.ai_predicted_category, pipeline.predict([expense.description])[0])
+            self.assertEqual(expense.category, 'other')
+
+    def test_fx_load_queues_budget_rebuild(self):
+        get_rate_cache().invalidate()
+        FxRate.objects.create(currency='USD', date=date(2024, 1, 1), rate=Decimal('10'))
+        budget = Budget.objects.create(user=self.user, category='travel', limit=Decimal('1000'))
+        Expense.objects.create(user=self.user, amount=Decimal('10'), currency='USD', description='Flight',
+                               category='travel', date=date(2024, 3, 5))
+        self.assertEqual(get_period_total(budget, date(2024, 3, 5)).total, Decimal('100.00'))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as stream:
+            stream.write('date,currency,rate\n2024-01-01,USD,12\n')
+        try:
+            call_command('load_fx_rates', stream.name, stdout=io.StringIO())
+        finally:
+            os.unlink(stream.name)
+        self.assertTrue(Job.objects.filter(kind='budgets.rebuild_totals', status=Job.PENDING).exists())
+        run_burst()
+        self.assertEqual(BudgetPeriodTotal.objects.get(budget=budget).total, Decimal('120.00'))
\ No newline at end of file
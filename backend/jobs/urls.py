@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+]
\ No newline at end of file
@@ -0,0 +1,12 @@
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from .models import Job
+from .serializers import JobSerializer
+
+class JobDetailView(generics.RetrieveAPIView):
+    """Status and result of a job the user started, e.g. a deferred import"""
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import os
+import socket
+import threading
+import time
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+from . import queue
+
+
+class Worker:
+    """
+    Claims and runs jobs until stopped.
+
+    Handlers must be safe to run more than once: a job is retried after an
+    exception, and requeued if its worker dies while holding it.
+    """
+
+    def __init__(self, worker_id=None, batch_size=1, poll_interval=1.0, kinds=None, stop_event=None):
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.kinds = kinds
+        self.stop_event = stop_event or threading.Event()
+        self._last_maintenance = 0.0
+
+    def _maintain(self):
+        if time.monotonic() - self._last_maintenance < settings.JOBS_MAINTENANCE_INTERVAL:
+            return
+        self._last_maintenance = time.monotonic()
+        requeued = queue.requeue_stale(settings.JOBS_STALE_TIMEOUT)
+        if requeued:
+            print(f"[{self.worker_id}] requeued {requeued} stale job(s)")
+        queue.purge_finished(settings.JOBS_RETENTION)
+
+    def run_once(self):
+        """Claim one batch and run it; returns the number of jobs run"""
+        close_old_connections()
+        try:
+            self._maintain()
+            jobs = queue.claim(self.worker_id, self.batch_size, self.kinds)
+        except OperationalError as e:
+            # SQLite reports lock contention between worker processes this way
+            print(f"[{self.worker_id}] could not claim jobs: {e}")
+            return 0
+        for job in jobs:
+            started = time.perf_counter()
+            ok = queue.run_job(job)
+            elapsed = time.perf_counter() - started
+            print(f"[{self.worker_id}] {job.kind} #{job.id} attempt {job.attempts}: "
+                  f"{'done' if ok else job.status} in {elapsed:.2f}s")
+        return len(jobs)
+
+    def run(self, burst=False):
+        """Run until stop_event is set, or with burst until no job is ready"""
+        while not self.stop_event.is_set():
+            if self.run_once():
+                continue
+            if burst:
+                break
+            self.stop_event.wait(self.poll_interval)
\ No newline at end of file
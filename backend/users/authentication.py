@@ -0,0 +1,129 @@
+"""
+JWT authentication without a user query on most requests.
+
+Tokens carry the user's token_version (TOKEN_VERSION_CLAIM). Users are kept
+in a per-process LRU for AUTH_USER_CACHE_TIMEOUT seconds, keyed by id and
+token version. Read-only requests whose token matches a cached entry are
+authenticated from the signed claims and the cache alone; writes, misses
+and version mismatches load the user, so a revoked token never writes.
+
+Password changes, deactivation and staff changes bump token_version (see
+User.save) and evict the user here at once. Other processes stop
+accepting the old tokens on reads within AUTH_USER_CACHE_TIMEOUT seconds.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CLAIM = 'ver'
+
+
+class VersionedRefreshToken(RefreshToken):
+    """Refresh token (and derived access tokens) stamped with the user's token_version"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+def token_version(token):
+    # Tokens issued before versioning count as version 0
+    return token.get(TOKEN_VERSION_CLAIM, 0)
+
+
+class UserCache:
+    """Recently authenticated users by id, each with the token_version it was loaded at"""
+
+    def __init__(self, timeout: float = 60.0, max_users: int = 10000, clock=time.monotonic):
+        self.timeout = timeout
+        self.max_users = max_users
+        self._clock = clock
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            user, loaded_at = entry
+            if self._clock() - loaded_at >= self.timeout:
+                del self._users[user_id]
+                return None
+            if user.token_version != version:
+                return None
+            self._users.move_to_end(user_id)
+        # Views may set attributes on request.user; they must not leak into other requests
+        return copy.copy(user)
+
+    def put(self, user):
+        with self._lock:
+            self._users[user.pk] = (copy.copy(user), self._clock())
+            self._users.move_to_end(user.pk)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> UserCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UserCache(
+                    timeout=settings.AUTH_USER_CACHE_TIMEOUT,
+                    max_users=settings.AUTH_USER_CACHE_MAX_USERS,
+                )
+    return _cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_cached_user(validated_token, request.method in SAFE_METHODS), validated_token
+
+    def get_cached_user(self, validated_token, read_only):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        version = token_version(validated_token)
+        cache = get_user_cache()
+        if read_only:
+            user = cache.get(user_id, version)
+            if user is not None:
+                return user
+
+        # Checks the user exists and is active
+        user = self.get_user(validated_token)
+        cache.put(user)
+        if user.token_version != version:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return user
\ No newline at end of file
@@ -1,8 +1,37 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+# Changing any of these revokes the user's issued tokens
+CREDENTIAL_FIELDS = ('is_active', 'is_staff', 'is_superuser')
+
+
 class User(AbstractUser):
     email = models.EmailField(unique=True)
+    # Copied into issued JWTs; bumped on password change, deactivation or
+    # a change of staff rights so that older tokens stop authenticating
+    token_version = models.PositiveIntegerField(default=0)
     
     USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['username']
\ No newline at end of file
+    REQUIRED_FIELDS = ['username']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_credentials = instance._credentials()
+        return instance
+
+    def _credentials(self):
+        # None when deferred (only()), as a change could not be told apart
+        if any(name not in self.__dict__ for name in CREDENTIAL_FIELDS):
+            return None
+        return tuple(self.__dict__[name] for name in CREDENTIAL_FIELDS)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_credentials', None)
+        # set_password() leaves the new password in _password until saved
+        if not self._state.adding and (self._password is not None or loaded not in (None, self._credentials())):
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_credentials = self._credentials()
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import get_user_cache
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _evict_cached_user(sender, instance, **kwargs):
+    # Saves also cover token_version bumps; the next request reloads the user
+    get_user_cache().invalidate(instance.pk)
\ No newline at end of file
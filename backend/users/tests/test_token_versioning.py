@@ -0,0 +1,123 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from django.contrib.auth import get_user_model
+from users.authentication import (
+    CachedJWTAuthentication, TOKEN_VERSION_CLAIM, UserCache, VersionedRefreshToken, get_user_cache,
+)
+
+User = get_user_model()
+
+class TokenVersioningTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        get_user_cache().clear()
+
+    def _access(self, user=None):
+        return str(VersionedRefreshToken.for_user(user or self.user).access_token)
+
+    def _authenticate(self, token, method='get'):
+        request = getattr(self.factory, method)('/api/ai/categories/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return CachedJWTAuthentication().authenticate(request)
+
+    def _get(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return self.client.get(reverse('supported-categories'))
+
+    def test_login_tokens_carry_the_version(self):
+        response = self.client.post(reverse('login'), {'email': 'test@example.com', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        token = CachedJWTAuthentication().get_validated_token(response.data['access'].encode())
+        self.assertEqual(token[TOKEN_VERSION_CLAIM], self.user.token_version)
+
+    def test_reads_after_the_first_skip_the_user_query(self):
+        token = self._access()
+        with self.assertNumQueries(1):
+            user, _ = self._authenticate(token)
+        with self.assertNumQueries(0):
+            cached, _ = self._authenticate(token)
+        self.assertEqual(cached.pk, self.user.pk)
+        self.assertEqual(cached.email, 'test@example.com')
+        # Each request gets its own instance
+        self.assertIsNot(cached, user)
+
+    def test_writes_always_load_the_user(self):
+        token = self._access()
+        self._authenticate(token)
+        with self.assertNumQueries(1):
+            self._authenticate(token, method='post')
+
+    def test_password_change_revokes_tokens(self):
+        token = self._access()
+        self.assertEqual(self._get(token).status_code, status.HTTP_200_OK)
+        self.user.set_password('newpass456')
+        self.user.save()
+        self.assertEqual(self.user.token_version, 1)
+        self.assertEqual(self._get(token).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._get(self._access()).status_code, status.HTTP_200_OK)
+
+    def test_deactivation_revokes_tokens(self):
+        token = self._access()
+        self._authenticate(token)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        self.assertEqual(User.objects.get(pk=self.user.pk).token_version, 1)
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(token)
+
+    def test_unrelated_saves_keep_tokens_valid(self):
+        token = self._access()
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Ama'
+        user.save()
+        self.assertEqual(user.token_version, 0)
+        self.assertEqual(self._get(token).status_code, status.HTTP_200_OK)
+
+    def test_refresh_is_refused_after_a_bump(self):
+        refresh = str(VersionedRefreshToken.for_user(self.user))
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.set_password('newpass456')
+        self.user.save()
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UserCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = UserCache(timeout=60, clock=lambda: now[0])
+        cache.put(self.user)
+        self.assertIsNotNone(cache.get(self.user.pk, 0))
+        now[0] = 61
+        self.assertIsNone(cache.get(self.user.pk, 0))
+
+    def test_other_versions_miss(self):
+        cache = UserCache()
+        cache.put(self.user)
+        self.assertIsNone(cache.get(self.user.pk, 1))
+
+    def test_least_recently_used_users_are_evicted(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        cache = UserCache(max_users=1)
+        cache.put(self.user)
+        cache.put(other)
+        self.assertIsNone(cache.get(self.user.pk, 0))
+        self.assertIsNotNone(cache.get(other.pk, 0))
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Encode-time benchmark for the API renderers.
+
+Renders a 10k-expense list payload (the shape of GET /api/expenses/) and an
+insights-style payload of raw Decimals and dates with DRF's JSONRenderer,
+the orjson renderer and the MessagePack renderer.
+
+Usage: python benchmark_renderers.py [--rows 10000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import django
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(backend_dir))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from config import renderers  # noqa: E402
+
+CATEGORIES = ['food', 'transport', 'shopping', 'entertainment', 'bills', 'healthcare', 'education', 'travel', 'other']
+
+
+def expense_list(rows):
+    start = datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc)
+    return [
+        {
+            'id': i,
+            'amount': f'{(i * 37) % 50000 / 100:.2f}',
+            'currency': 'GHS',
+            'description': f'Waakye and kelewele near Madina market #{i}',
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'ai_predicted_category': CATEGORIES[i % len(CATEGORIES)] if i % 3 else None,
+            'date': (date(2024, 1, 1) + timedelta(days=i % 365)).isoformat(),
+            'created_at': (start + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+            'updated_at': (start + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+            'ai_predicted_read': bool(i % 3),
+        }
+        for i in range(rows)
+    ]
+
+
+def insights_rows(rows):
+    # Raw values as the insights and export views return them
+    return [
+        {
+            'id': i,
+            'description': f'Expense {i}',
+            'amount': Decimal((i * 37) % 50000).scaleb(-2),
+            'date': date(2024, 1, 1) + timedelta(days=i % 365),
+            'created_at': datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+        }
+        for i in range(rows)
+    ]
+
+
+def timed(render, data, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = render(data)
+        best = min(best, time.perf_counter() - started)
+    return best, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    candidates = [('DRF JSONRenderer', JSONRenderer().render)]
+    if renderers.orjson is not None:
+        candidates.append(('orjson', renderers.ORJSONRenderer().render))
+    else:
+        print('orjson not installed; skipping')
+    if renderers.msgpack is not None:
+        candidates.append(('MessagePack', renderers.MessagePackRenderer().render))
+    else:
+        print('msgpack not installed; skipping')
+
+    for label, payload in [('expense list', expense_list(args.rows)), ('insights rows', insights_rows(args.rows))]:
+        print(f"\n{label}: {args.rows} rows, best of {args.repeat}")
+        baseline = None
+        for name, render in candidates:
+            seconds, size = timed(render, payload, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {name:<18} {seconds * 1000:8.2f} ms  {size / 1024:8.1f} KiB  {baseline / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,28 +1,26 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
 import joblib
 import pandas as pd
 from smol_vlm_categorizer import SmolVLMCategorizer
+from fast_predictor import FastLinearPredictor
+from model_evaluation import build_pipeline
 
 class EnhancedExpenseCategorizer:
     """Enhanced categorizer with multiple fallback methods"""
     
     def __init__(self):
         self.pipeline = None
+        self._fast = None
+        self._fast_source = None
         self.smol_vlm = SmolVLMCategorizer()
         self.categories = ['food', 'transport', 'shopping', 'entertainment', 'bills', 'healthcare', 'education', 'travel', 'other']
     
-    def train(self, csv_file):
-        """Train the primary ML model"""
+    def train(self, csv_file, params=None):
+        """Train the primary ML model (params override model_evaluation.DEFAULT_PARAMS)"""
         df = pd.read_csv(csv_file)
         X = df['description']
         y = df['category']
         
-        self.pipeline = Pipeline([
-            ('tfidf', TfidfVectorizer(max_features=5000, ngram_range=(1, 2))),
-            ('classifier', LogisticRegression(random_state=42, max_iter=1000))
-        ])
+        self.pipeline = build_pipeline(params)
         
         self.pipeline.fit(X, y)
         print("Primary ML model trained")
@@ -32,14 +30,39 @@ class EnhancedExpenseCategorizer:
             'model': self.pipeline
         }
     
+    def fast_predictor(self):
+        """Direct-scoring view of the current pipeline, rebuilt when it changes"""
+        if self.pipeline is not self._fast_source:
+            self._fast_source = self.pipeline
+            supported = self.pipeline is not None and FastLinearPredictor.supports(self.pipeline)
+            self._fast = FastLinearPredictor(self.pipeline) if supported else None
+        return self._fast
+    
+    def _predict_primary(self, description):
+        """(category, confidence) from the primary ML model"""
+        fast = self.fast_predictor()
+        if fast:
+            prediction, confidence, _ = fast.predict_one(description)
+            return prediction, confidence
+        prediction = self.pipeline.predict([description])[0]
+        proba = self.pipeline.predict_proba([description])[0]
+        return prediction, max(proba)
+    
+    def predict_batch(self, descriptions):
+        """Primary-model (category, confidence) pairs for many descriptions"""
+        fast = self.fast_predictor()
+        if fast:
+            return fast.predict_batch(descriptions)
+        proba = self.pipeline.predict_proba(descriptions)
+        classes = self.pipeline.classes_
+        return [(classes[row.argmax()], row.max()) for row in proba]
+    
     def predict(self, description):
         """Predict with fallback chain"""
         # Try primary ML model first
         if self.pipeline:
             try:
-                prediction = self.pipeline.predict([description])[0]
-                proba = self.pipeline.predict_proba([description])[0]
-                confidence = max(proba)
+                prediction, confidence = self._predict_primary(description)
                 
                 if confidence > 0.6:  # High confidence threshold
                     return {
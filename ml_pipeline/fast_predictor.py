@@ -0,0 +1,132 @@
+import numpy as np
+from scipy import sparse
+
+
+class FastLinearPredictor:
+    """Direct TF-IDF + LogisticRegression scoring for a fitted Pipeline
+
+    Pipeline.predict and predict_proba each re-run the vectorizer and
+    sklearn's input validation. This class extracts the fitted vocabulary,
+    idf weights and coefficients once, then scores a description with a
+    single vocabulary pass and one sparse dot product. The label and the
+    probabilities come from the same score vector.
+    """
+
+    def __init__(self, pipeline):
+        vectorizer = pipeline.named_steps['tfidf']
+        classifier = pipeline.named_steps['classifier']
+
+        self.analyzer = vectorizer.build_analyzer()
+        self.vocabulary = vectorizer.vocabulary_
+        self.idf = vectorizer.idf_ if vectorizer.use_idf else None
+        self.norm = vectorizer.norm
+        self.sublinear_tf = vectorizer.sublinear_tf
+        self.binary = vectorizer.binary
+
+        self.classes = classifier.classes_
+        # (n_features, n_classes) so the rows for a document's terms are contiguous
+        self.coef_t = np.ascontiguousarray(classifier.coef_.T)
+        self.intercept = classifier.intercept_
+        self.multinomial = self._is_multinomial(classifier)
+
+    @staticmethod
+    def supports(pipeline):
+        """True if the pipeline is a TfidfVectorizer -> LogisticRegression pair"""
+        steps = getattr(pipeline, 'named_steps', {})
+        vectorizer, classifier = steps.get('tfidf'), steps.get('classifier')
+        return (
+            type(vectorizer).__name__ == 'TfidfVectorizer'
+            and type(classifier).__name__ == 'LogisticRegression'
+            and hasattr(classifier, 'coef_')
+        )
+
+    @staticmethod
+    def _is_multinomial(classifier):
+        # Mirrors sklearn's resolution of multi_class='auto'
+        multi_class = getattr(classifier, 'multi_class', 'auto')
+        if multi_class == 'auto':
+            return classifier.solver != 'liblinear' and len(classifier.classes_) > 2
+        return multi_class == 'multinomial'
+
+    def _weights(self, description):
+        """Column indices and tf-idf weights for one description"""
+        counts = {}
+        vocabulary = self.vocabulary
+        for term in self.analyzer(description):
+            index = vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values *= self.idf[indices]
+        if self.norm == 'l2':
+            norm = np.sqrt(np.dot(values, values))
+        elif self.norm == 'l1':
+            norm = np.abs(values).sum()
+        else:
+            norm = 0.0
+        if norm > 0:
+            values /= norm
+        return indices, values
+
+    def _probabilities(self, scores):
+        """Convert decision scores (n_samples, n_outputs) to class probabilities"""
+        if scores.shape[1] == 1:
+            # Binary problem: one score per sample for the positive class
+            if self.multinomial:
+                scores = np.hstack([-scores, scores])
+            else:
+                positive = 1.0 / (1.0 + np.exp(-scores))
+                return np.hstack([1.0 - positive, positive])
+        if self.multinomial:
+            shifted = scores - scores.max(axis=1, keepdims=True)
+            exp = np.exp(shifted)
+            return exp / exp.sum(axis=1, keepdims=True)
+        proba = 1.0 / (1.0 + np.exp(-scores))
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def decision_function(self, descriptions):
+        """Raw class scores for a batch, shape (n_samples, n_outputs)"""
+        indptr = [0]
+        all_indices = []
+        all_values = []
+        for description in descriptions:
+            indices, values = self._weights(description)
+            all_indices.append(indices)
+            all_values.append(values)
+            indptr.append(indptr[-1] + len(indices))
+
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate(all_values) if all_values else np.empty(0),
+                np.concatenate(all_indices) if all_indices else np.empty(0, dtype=np.intp),
+                np.asarray(indptr),
+            ),
+            shape=(len(descriptions), self.coef_t.shape[0]),
+        )
+        return np.asarray(matrix @ self.coef_t) + self.intercept
+
+    def predict_one(self, description):
+        """Return (category, confidence, probabilities) for a single description"""
+        indices, values = self._weights(description)
+        scores = values @ self.coef_t[indices] + self.intercept
+        proba = self._probabilities(scores[np.newaxis, :])[0]
+        best = int(np.argmax(proba))
+        return self.classes[best], float(proba[best]), proba
+
+    def predict_proba(self, descriptions):
+        return self._probabilities(self.decision_function(descriptions))
+
+    def predict_batch(self, descriptions):
+        """Return a list of (category, confidence) pairs"""
+        if not descriptions:
+            return []
+        proba = self.predict_proba(descriptions)
+        best = proba.argmax(axis=1)
+        return [(self.classes[i], float(proba[row, i])) for row, i in enumerate(best)]
@@ -0,0 +1,213 @@
+"""
+Evaluation and hyperparameter search for the TF-IDF + LogisticRegression model.
+
+Scores come from stratified k-fold cross-validation, never from the
+training rows; with a search it is nested, each fold searching on its own
+training rows, so the scores are not biased by the selection. Folds and candidate settings are fitted in parallel with
+joblib (n_jobs, -1 = all cores); the fold split and the classifier share
+one seed so reruns give the same numbers. Alongside accuracy the report
+has per-category precision and recall, the pickled model size and
+predict latency per row, so a smaller or faster setting can be chosen
+when it is about as accurate.
+"""
+import io
+import json
+import os
+import time
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.model_selection import cross_validate as fit_folds
+from sklearn.pipeline import Pipeline
+from fast_predictor import FastLinearPredictor
+
+DEFAULT_PARAMS = {
+    'tfidf__max_features': 5000,
+    'tfidf__ngram_range': (1, 2),
+    'classifier__C': 1.0,
+}
+
+# Searched around the defaults. Values go from small to large: on tied
+# scores the search keeps the first setting, i.e. the smaller, faster model
+PARAM_GRID = {
+    'tfidf__max_features': [1000, 2000, 5000, None],
+    'tfidf__ngram_range': [(1, 1), (1, 2)],
+    'tfidf__sublinear_tf': [False, True],
+    'classifier__C': [0.5, 1.0, 5.0, 20.0],
+}
+
+
+def build_pipeline(params=None, seed=42):
+    """The categorizer pipeline with DEFAULT_PARAMS overridden by params"""
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer()),
+        ('classifier', LogisticRegression(random_state=seed, max_iter=1000)),
+    ])
+    pipeline.set_params(**dict(DEFAULT_PARAMS, **(params or {})))
+    return pipeline
+
+
+def _folds(folds, seed):
+    return StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+
+
+def _jsonable(params):
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()}
+
+
+def cross_validate(estimator, X, y, folds=5, seed=42, n_jobs=-1):
+    """
+    Out-of-fold accuracy (overall and per fold) and per-category
+    precision/recall. Given a grid_search() the cross-validation is nested:
+    each fold runs the search on its training rows only, and fold_params
+    lists the parameters each fold chose.
+    """
+    X, y = np.asarray(X), np.asarray(y)
+    fitted = fit_folds(estimator, X, y, cv=_folds(folds, seed), n_jobs=n_jobs,
+                       return_estimator=True, return_indices=True)
+    predicted = np.empty_like(y)
+    fold_accuracy = []
+    for model, test in zip(fitted['estimator'], fitted['indices']['test']):
+        predicted[test] = model.predict(X[test])
+        fold_accuracy.append(accuracy_score(y[test], predicted[test]))
+    report = classification_report(y, predicted, output_dict=True, zero_division=0)
+    per_category = {
+        category: {
+            'precision': round(scores['precision'], 4),
+            'recall': round(scores['recall'], 4),
+            'f1': round(scores['f1-score'], 4),
+            'support': int(scores['support']),
+        }
+        for category, scores in report.items() if category in set(y)
+    }
+    result = {
+        'folds': folds,
+        'accuracy': round(report['accuracy'], 4),
+        'accuracy_std': round(float(np.std(fold_accuracy)), 4),
+        'fold_accuracy': [round(score, 4) for score in fold_accuracy],
+        'macro_f1': round(report['macro avg']['f1-score'], 4),
+        'per_category': per_category,
+    }
+    if isinstance(estimator, GridSearchCV):
+        result['fold_params'] = [_jsonable(model.best_params_) for model in fitted['estimator']]
+    return result
+
+
+def grid_search(param_grid=None, folds=5, seed=42, n_jobs=-1):
+    """An unfitted grid search on macro F1 over param_grid (PARAM_GRID)"""
+    return GridSearchCV(
+        build_pipeline(seed=seed), param_grid or PARAM_GRID, scoring='f1_macro',
+        cv=_folds(folds, seed), n_jobs=n_jobs, refit=True,
+    )
+
+
+def search_hyperparameters(X, y, param_grid=None, folds=5, seed=42, n_jobs=-1, top=5):
+    """Grid search on macro F1; returns the refitted best pipeline and a summary"""
+    search = grid_search(param_grid, folds, seed, n_jobs)
+    search.fit(X, y)
+    results = search.cv_results_
+    ranked = np.argsort(results['rank_test_score'], kind='stable')[:top]
+    return search.best_estimator_, {
+        'scoring': 'f1_macro',
+        'candidates': len(results['params']),
+        'best_params': _jsonable(search.best_params_),
+        'best_score': round(search.best_score_, 4),
+        'top': [
+            {
+                'params': _jsonable(results['params'][i]),
+                'mean_score': round(results['mean_test_score'][i], 4),
+                'std_score': round(results['std_test_score'][i], 4),
+                'mean_fit_seconds': round(results['mean_fit_time'][i], 4),
+            }
+            for i in ranked
+        ],
+    }
+
+
+def model_size(pipeline):
+    """Pickled size in bytes, vocabulary size and number of coefficients"""
+    buffer = io.BytesIO()
+    joblib.dump(pipeline, buffer)
+    classifier = pipeline.named_steps['classifier']
+    return {
+        'bytes': buffer.tell(),
+        'vocabulary': len(pipeline.named_steps['tfidf'].vocabulary_),
+        'coefficients': int(classifier.coef_.size),
+    }
+
+
+def _per_row_ms(predict, descriptions, repeats):
+    timings = []
+    for _ in range(repeats):
+        for description in descriptions:
+            started = time.perf_counter()
+            predict(description)
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'p50_ms': round(float(np.percentile(timings, 50)), 4),
+        'p95_ms': round(float(np.percentile(timings, 95)), 4),
+    }
+
+
+def predict_latency(pipeline, descriptions, repeats=3):
+    """
+    Per-row latency of single predictions through the sklearn pipeline and
+    the FastLinearPredictor path the API uses, plus batch cost per row.
+    """
+    descriptions = list(descriptions)
+    latency = {
+        'rows': len(descriptions),
+        'pipeline': _per_row_ms(lambda description: pipeline.predict([description]), descriptions, repeats),
+    }
+    if FastLinearPredictor.supports(pipeline):
+        fast = FastLinearPredictor(pipeline)
+        latency['fast_predictor'] = _per_row_ms(fast.predict_one, descriptions, repeats)
+    started = time.perf_counter()
+    pipeline.predict(descriptions)
+    latency['batch_ms_per_row'] = round((time.perf_counter() - started) * 1000 / max(len(descriptions), 1), 4)
+    return latency
+
+
+def evaluate(X, y, search=True, param_grid=None, folds=5, seed=42, n_jobs=-1, latency_rows=200):
+    """
+    Choose parameters (grid search, or DEFAULT_PARAMS without search),
+    cross-validate that choice and measure the model fitted on all rows.
+    Returns (fitted pipeline, report).
+
+    With search, cross-validation repeats the search inside every fold, so
+    its scores come from rows the chosen parameters were not tuned on;
+    search.best_score is the tuning score and reads higher.
+    """
+    report = {'rows': len(y), 'seed': seed}
+    if search:
+        pipeline, report['search'] = search_hyperparameters(X, y, param_grid, folds, seed, n_jobs)
+        # Folds run one at a time; each fold's search fits its candidates in parallel
+        validated, fold_jobs = grid_search(param_grid, folds, seed, n_jobs), 1
+    else:
+        pipeline = build_pipeline(seed=seed)
+        validated, fold_jobs = pipeline, n_jobs
+    params = pipeline.get_params()
+    report['params'] = _jsonable({name: params[name] for name in {**DEFAULT_PARAMS, **(param_grid or PARAM_GRID)}})
+    report['cross_validation'] = cross_validate(validated, X, y, folds, seed, fold_jobs)
+
+    if not search:
+        pipeline.fit(X, y)
+    report['size'] = model_size(pipeline)
+    sample = np.random.RandomState(seed).choice(np.asarray(X), size=min(latency_rows, len(X)), replace=False)
+    report['latency'] = predict_latency(pipeline, sample)
+    return pipeline, report
+
+
+def report_path(model_path):
+    """models/name.pkl -> models/name.eval.json"""
+    return os.path.splitext(model_path)[0] + '.eval.json'
+
+
+def save_report(report, model_path):
+    path = report_path(model_path)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
\ No newline at end of file
@@ -1,42 +1,86 @@
 #!/usr/bin/env python
 """
 Ghana-specific ML training pipeline with SmolVLM fallback
+
+Parameters are chosen by a grid search scored with stratified k-fold
+cross-validation; the evaluation is written next to the model as
+models/ghana_expense_categorizer.eval.json.
 """
 
+import argparse
 import os
+import random
 import sys
 sys.path.append(os.path.dirname(__file__))
 
+import pandas as pd
 from data_generation.ghana_data_generator import GhanaExpenseDataGenerator
 from enhanced_categorizer import EnhancedExpenseCategorizer
+from model_evaluation import evaluate, save_report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=3000, help='Training rows to generate')
+    parser.add_argument('--folds', type=int, default=5, help='Stratified cross-validation folds')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel fits (-1 = all cores)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for data generation, folds and the model')
+    parser.add_argument('--no-search', action='store_true', help='Evaluate the default parameters only')
+    return parser.parse_args()
+
+def print_report(report):
+    cv = report['cross_validation']
+    print(f"Parameters: {report['params']}")
+    if 'search' in report:
+        search = report['search']
+        print(f"Searched {search['candidates']} settings, best macro F1 {search['best_score']:.4f} (on the tuning folds)")
+    nested = ', search repeated per fold' if 'fold_params' in cv else ''
+    print(f"Cross-validated accuracy: {cv['accuracy']:.4f} (+/- {cv['accuracy_std']:.4f}, {cv['folds']} folds{nested}), "
+          f"macro F1: {cv['macro_f1']:.4f}")
+    print(f"  {'category':<14}{'precision':>10}{'recall':>10}{'support':>10}")
+    for category, scores in cv['per_category'].items():
+        print(f"  {category:<14}{scores['precision']:>10.3f}{scores['recall']:>10.3f}{scores['support']:>10}")
+    size, latency = report['size'], report['latency']
+    print(f"Model size: {size['bytes'] / 1024:.1f} KiB ({size['vocabulary']} terms, {size['coefficients']} coefficients)")
+    print(f"Predict latency per row: pipeline p50 {latency['pipeline']['p50_ms']:.3f} ms, "
+          f"batch {latency['batch_ms_per_row']:.4f} ms", end='')
+    if 'fast_predictor' in latency:
+        print(f", fast path p50 {latency['fast_predictor']['p50_ms']:.3f} ms")
+    else:
+        print()
 
 def main():
+    args = parse_args()
     print("Ghana AI Expense Categorizer Training Pipeline")
     print("=" * 60)
     
+    # Create data directory
+    os.makedirs('data', exist_ok=True)
+    os.makedirs('models', exist_ok=True)
+    
     # Step 1: Generate Ghana-specific training data
     print("\nStep 1: Generating Ghana training data...")
+    random.seed(args.seed)
     generator = GhanaExpenseDataGenerator()
     training_file = generator.generate_training_data(
-        num_samples=3000, 
+        num_samples=args.samples, 
         output_file='data/ghana_expenses.csv'
     )
     
-    # Step 2: Train enhanced categorizer
-    print("\nStep 2: Training enhanced categorizer...")
+    # Step 2: Choose parameters by cross-validation and train on all rows
+    print("\nStep 2: Evaluating and training enhanced categorizer...")
+    df = pd.read_csv(training_file)
+    pipeline, report = evaluate(
+        df['description'], df['category'], search=not args.no_search,
+        folds=args.folds, seed=args.seed, n_jobs=args.n_jobs,
+    )
+    print_report(report)
     categorizer = EnhancedExpenseCategorizer()
+    categorizer.pipeline = pipeline
     
-    # Create data directory
-    os.makedirs('data', exist_ok=True)
-    os.makedirs('models', exist_ok=True)
-    
-    # Train primary model
-    results = categorizer.train(training_file)
-    print(f"Training accuracy: {results['accuracy']:.4f}")
-    
-    # Save model
+    # Save model and its evaluation
     model_path = 'models/ghana_expense_categorizer.pkl'
     categorizer.save_model(model_path)
+    print(f"Evaluation saved to {save_report(report, model_path)}")
     
     # Step 3: Test with Ghana examples
     print("\nStep 3: Testing with Ghana examples...")
@@ -72,7 +116,7 @@ def main():
     print("GHANA ML PIPELINE COMPLETED!")
     print("=" * 60)
     print(f"Model saved: {model_path}")
-    print(f"Accuracy: {results['accuracy']:.4f}")
+    print(f"Cross-validated accuracy: {report['cross_validation']['accuracy']:.4f}")
     print("SmolVLM fallback ready")
     print("Ghana-specific categories supported")
 